@@ -3,7 +3,7 @@ import logging
 from copy import copy
 from re import search
 from string import Formatter
-from typing import List, Literal
+from typing import List, Literal, Optional
 
 import discord
 from redbot.core import Config, commands
@@ -132,28 +132,23 @@ class Alias(commands.Cog):
     def is_valid_alias_name(alias_name: str) -> bool:
         return not bool(search(r"\s", alias_name)) and alias_name.isprintable()
 
-    async def get_prefix(self, message: discord.Message) -> str:
-        """
-        Tries to determine what prefix is used in a message object.
-            Looks to identify from longest prefix to smallest.
-
-            Will raise ValueError if no prefix is found.
-        :param message: Message object
-        :return:
-        """
-        content = message.content
-        prefix_list = await self.bot.command_prefix(self.bot, message)
-        prefixes = sorted(prefix_list, key=lambda pfx: len(pfx), reverse=True)
-        for p in prefixes:
-            if content.startswith(p):
-                return p
-        raise ValueError("No prefix found.")
-
-    async def call_alias(self, message: discord.Message, prefix: str, alias: AliasEntry):
-        new_message = self.translate_alias_message(message, prefix, alias)
+    async def call_alias(
+        self,
+        message: discord.Message,
+        prefix: str,
+        alias: AliasEntry,
+        name_end: Optional[int] = None,
+    ):
+        new_message = self.translate_alias_message(message, prefix, alias, name_end)
         await self.bot.process_commands(new_message)
 
-    def translate_alias_message(self, message: discord.Message, prefix: str, alias: AliasEntry):
+    def translate_alias_message(
+        self,
+        message: discord.Message,
+        prefix: str,
+        alias: AliasEntry,
+        name_end: Optional[int] = None,
+    ):
         """
         Translates a discord message using an alias
         for a command to a discord message using the
@@ -161,7 +156,7 @@ class Alias(commands.Cog):
         """
         new_message = copy(message)
         try:
-            args = alias.get_extra_args_from_alias(message, prefix)
+            args = alias.get_extra_args_from_alias(message, prefix, name_end)
         except commands.BadArgument:
             return
 
@@ -473,17 +468,15 @@ class Alias(commands.Cog):
             if await self.bot.cog_disabled_in_guild(self, message.guild):
                 return
 
-        try:
-            prefix = await self.get_prefix(message)
-        except ValueError:
-            return
-
-        try:
-            potential_alias = message.content[len(prefix) :].split(" ")[0]
-        except IndexError:
+        # the prefix has already been matched by the core when processing
+        # this message, so this doesn't resolve the prefixes again
+        ctx = await self.bot.get_context(message)
+        if ctx.prefix is None or not ctx.invoked_with:
             return
 
-        alias = await self._aliases.get_alias(message.guild, potential_alias)
+        alias = await self._aliases.get_alias(message.guild, ctx.invoked_with)
 
         if alias:
-            await self.call_alias(message, prefix, alias)
+            # with strip_after_prefix, there can be whitespace between the prefix
+            # and the alias name, so the arguments start where the view stopped
+            await self.call_alias(message, ctx.prefix, alias, ctx.view.index)
@@ -42,18 +42,22 @@ class AliasEntry:
         self.uses += 1
         return self.uses
 
-    def get_extra_args_from_alias(self, message: discord.Message, prefix: str) -> str:
+    def get_extra_args_from_alias(
+        self, message: discord.Message, prefix: str, name_end: Optional[int] = None
+    ) -> str:
         """
         When an alias is executed by a user in chat this function tries
             to get any extra arguments passed in with the call.
             Whitespace will be trimmed from both ends.
         :param message:
         :param prefix:
-        :param alias:
+        :param name_end: the index in the message's content right after the
+            invoked alias name, when there's whitespace before the name
         :return:
         """
-        known_content_length = len(prefix) + len(self.name)
-        extra = message.content[known_content_length:]
+        if name_end is None:
+            name_end = len(prefix) + len(self.name)
+        extra = message.content[name_end:]
         view = StringView(extra)
         view.skip_ws()
         extra = []
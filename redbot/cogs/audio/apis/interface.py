@@ -20,7 +20,7 @@ from redbot.core.bot import Red
 from redbot.core.commands import Cog, Context
 from redbot.core.i18n import Translator
 from redbot.core.utils import AsyncIter
-from redbot.core.utils.dbtools import APSWConnectionWrapper
+from redbot.core.utils.dbtools import ThreadedAPSWConnection
 
 from ..audio_dataclasses import Query
 from ..errors import DatabaseError, SpotifyFetchError, TrackEnqueueError, YouTubeApiError
@@ -54,7 +54,7 @@ class AudioAPIInterface:
         bot: Red,
         config: Config,
         session: aiohttp.ClientSession,
-        conn: APSWConnectionWrapper,
+        conn: ThreadedAPSWConnection,
         cog: Union["Audio", Cog],
     ):
         self.bot = bot
@@ -74,10 +74,12 @@ class AudioAPIInterface:
         """Initialises the Local Cache connection."""
         await self.local_cache_api.lavalink.init()
         await self.persistent_queue_api.init()
+        self.local_cache_api.start_flushing()
 
-    def close(self) -> None:
+    async def close(self) -> None:
         """Closes the Local Cache connection."""
-        self.local_cache_api.lavalink.close()
+        self.local_cache_api.stop_flushing()
+        await self.local_cache_api.lavalink.aclose()
 
     async def get_random_track_from_db(self, tries=0) -> Optional[MutableMapping]:
         """Get a random track from the local database and return it."""
@@ -119,20 +121,10 @@ class AudioAPIInterface:
             return
         if action_type == "insert" and isinstance(data, list):
             for table, d in data:
-                if table == "lavalink":
-                    await self.local_cache_api.lavalink.insert(d)
-                elif table == "youtube":
-                    await self.local_cache_api.youtube.insert(d)
-                elif table == "spotify":
-                    await self.local_cache_api.spotify.insert(d)
-        elif action_type == "update" and isinstance(data, dict):
+                self.local_cache_api.queue_insert(table, d)
+        elif action_type == "update" and isinstance(data, list):
             for table, d in data:
-                if table == "lavalink":
-                    await self.local_cache_api.lavalink.update(data)
-                elif table == "youtube":
-                    await self.local_cache_api.youtube.update(data)
-                elif table == "spotify":
-                    await self.local_cache_api.spotify.update(data)
+                self.local_cache_api.queue_update(table, d)
         elif action_type == "global" and isinstance(data, list):
             await asyncio.gather(*[self.global_cache_api.update_global(**d) for d in data])
 
@@ -173,6 +165,7 @@ class AudioAPIInterface:
                 coro_tasks = [self.route_tasks(a, tasks[a]) for a in tasks]
 
                 await asyncio.gather(*coro_tasks, return_exceptions=False)
+                await self.local_cache_api.flush()
 
             except Exception as exc:
                 log.verbose("Failed database writes", exc_info=exc)
@@ -180,7 +173,17 @@ class AudioAPIInterface:
                 log.trace("Completed pending writes to database have finished")
 
     def append_task(self, ctx: commands.Context, event: str, task: Tuple, _id: int = None) -> None:
-        """Add a task to the cache to be run later."""
+        """Add a task to the cache to be run later.
+
+        Local cache writes are queued straight away and written in batches in the background,
+        other tasks are run once the command that added them has finished.
+        """
+        if event == "insert":
+            self.local_cache_api.queue_insert(*task)
+            return
+        if event == "update":
+            self.local_cache_api.queue_update(*task)
+            return
         lock_id = _id or ctx.message.id
         if lock_id not in self._tasks:
             self._tasks[lock_id] = {"update": [], "insert": [], "global": []}
@@ -1,11 +1,21 @@
-import concurrent
+import asyncio
 import contextlib
 import datetime
 import random
 import time
 from pathlib import Path
 from types import SimpleNamespace
-from typing import TYPE_CHECKING, Callable, List, MutableMapping, Optional, Tuple, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    MutableMapping,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from red_commons.logging import getLogger
 
@@ -14,7 +24,7 @@ from redbot.core.bot import Red
 from redbot.core.commands import Cog
 from redbot.core.i18n import Translator
 from redbot.core.utils import AsyncIter
-from redbot.core.utils.dbtools import APSWConnectionWrapper
+from redbot.core.utils.dbtools import ThreadedAPSWConnection
 
 from ..sql_statements import (
     LAVALINK_CREATE_INDEX,
@@ -62,11 +72,15 @@ if TYPE_CHECKING:
 log = getLogger("red.cogs.Audio.api.LocalDB")
 _ = Translator("Audio", Path(__file__))
 _SCHEMA_VERSION = 3
+# Pending cache writes are flushed every _FLUSH_INTERVAL seconds,
+# or sooner once _FLUSH_SIZE rows are waiting.
+_FLUSH_INTERVAL = 30
+_FLUSH_SIZE = 500
 
 
 class BaseWrapper:
     def __init__(
-        self, bot: Red, config: Config, conn: APSWConnectionWrapper, cog: Union["Audio", Cog]
+        self, bot: Red, config: Config, conn: ThreadedAPSWConnection, cog: Union["Audio", Cog]
     ):
         self.bot = bot
         self.config = config
@@ -78,67 +92,62 @@ class BaseWrapper:
         self.statement.set_user_version = PRAGMA_SET_user_version
         self.statement.get_user_version = PRAGMA_FETCH_user_version
         self.fetch_result: Optional[Callable] = None
+        # the parameters of the upsert's conflict target
+        self.insert_keys: Tuple[str, ...] = ()
+        self.update_key: Optional[str] = None
         self.cog = cog
 
     async def init(self) -> None:
         """Initialize the local cache"""
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            executor.submit(self.database.cursor().execute, self.statement.pragma_temp_store)
-            executor.submit(self.database.cursor().execute, self.statement.pragma_journal_mode)
-            executor.submit(self.database.cursor().execute, self.statement.pragma_read_uncommitted)
-            executor.submit(self.maybe_migrate)
-            executor.submit(self.database.cursor().execute, LAVALINK_CREATE_TABLE)
-            executor.submit(self.database.cursor().execute, LAVALINK_CREATE_INDEX)
-            executor.submit(self.database.cursor().execute, YOUTUBE_CREATE_TABLE)
-            executor.submit(self.database.cursor().execute, YOUTUBE_CREATE_INDEX)
-            executor.submit(self.database.cursor().execute, SPOTIFY_CREATE_TABLE)
-            executor.submit(self.database.cursor().execute, SPOTIFY_CREATE_INDEX)
-            await self.clean_up_old_entries()
+        await self.database.execute(self.statement.pragma_temp_store)
+        await self.database.execute(self.statement.pragma_journal_mode)
+        await self.database.execute(self.statement.pragma_read_uncommitted)
+        await self.maybe_migrate()
+        await self.database.execute(LAVALINK_CREATE_TABLE)
+        await self.database.execute(LAVALINK_CREATE_INDEX)
+        await self.database.execute(YOUTUBE_CREATE_TABLE)
+        await self.database.execute(YOUTUBE_CREATE_INDEX)
+        await self.database.execute(SPOTIFY_CREATE_TABLE)
+        await self.database.execute(SPOTIFY_CREATE_INDEX)
+        await self.clean_up_old_entries()
 
     def close(self) -> None:
         """Close the connection with the local cache"""
         with contextlib.suppress(Exception):
             self.database.close()
 
+    async def aclose(self) -> None:
+        """Close the connection with the local cache without blocking the event loop"""
+        with contextlib.suppress(Exception):
+            await self.database.aclose()
+
     async def clean_up_old_entries(self) -> None:
         """Delete entries older than x in the local cache tables"""
         max_age = await self.config.cache_age()
         maxage = datetime.datetime.now(tz=datetime.timezone.utc) - datetime.timedelta(days=max_age)
         maxage_int = int(time.mktime(maxage.timetuple()))
         values = {"maxage": maxage_int}
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            executor.submit(self.database.cursor().execute, LAVALINK_DELETE_OLD_ENTRIES, values)
-            executor.submit(self.database.cursor().execute, YOUTUBE_DELETE_OLD_ENTRIES, values)
-            executor.submit(self.database.cursor().execute, SPOTIFY_DELETE_OLD_ENTRIES, values)
+        await self.database.execute(LAVALINK_DELETE_OLD_ENTRIES, values)
+        await self.database.execute(YOUTUBE_DELETE_OLD_ENTRIES, values)
+        await self.database.execute(SPOTIFY_DELETE_OLD_ENTRIES, values)
 
-    def maybe_migrate(self) -> None:
+    async def maybe_migrate(self) -> None:
         """Maybe migrate Database schema for the local cache"""
         current_version = 0
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            for future in concurrent.futures.as_completed(
-                [executor.submit(self.database.cursor().execute, self.statement.get_user_version)]
-            ):
-                try:
-                    row_result = future.result()
-                    current_version = row_result.fetchone()
-                    break
-                except Exception as exc:
-                    log.verbose("Failed to completed fetch from database", exc_info=exc)
-            if isinstance(current_version, tuple):
-                current_version = current_version[0]
-            if current_version == _SCHEMA_VERSION:
-                return
-            executor.submit(
-                self.database.cursor().execute,
-                self.statement.set_user_version,
-                {"version": _SCHEMA_VERSION},
-            )
+        try:
+            current_version = await self.database.fetchone(self.statement.get_user_version)
+        except Exception as exc:
+            log.verbose("Failed to completed fetch from database", exc_info=exc)
+        if isinstance(current_version, tuple):
+            current_version = current_version[0]
+        if current_version == _SCHEMA_VERSION:
+            return
+        await self.database.execute(self.statement.set_user_version, {"version": _SCHEMA_VERSION})
 
     async def insert(self, values: List[MutableMapping]) -> None:
         """Insert an entry into the local cache"""
         try:
-            with self.database.transaction() as transaction:
-                transaction.executemany(self.statement.upsert, values)
+            await self.database.executemany(self.statement.upsert, values)
         except Exception as exc:
             log.trace("Error during table insert", exc_info=exc)
 
@@ -148,8 +157,14 @@ class BaseWrapper:
         try:
             time_now = int(datetime.datetime.now(datetime.timezone.utc).timestamp())
             values["last_fetched"] = time_now
-            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-                executor.submit(self.database.cursor().execute, self.statement.update, values)
+            await self.database.execute(self.statement.update, values)
+        except Exception as exc:
+            log.verbose("Error during table update", exc_info=exc)
+
+    async def update_many(self, values: List[MutableMapping]) -> None:
+        """Update many entries of the local cache in a single transaction"""
+        try:
+            await self.database.executemany(self.statement.update, values)
         except Exception as exc:
             log.verbose("Error during table update", exc_info=exc)
 
@@ -164,15 +179,10 @@ class BaseWrapper:
         maxage_int = int(time.mktime(maxage.timetuple()))
         values.update({"maxage": maxage_int})
         row = None
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            for future in concurrent.futures.as_completed(
-                [executor.submit(self.database.cursor().execute, self.statement.get_one, values)]
-            ):
-                try:
-                    row_result = future.result()
-                    row = row_result.fetchone()
-                except Exception as exc:
-                    log.verbose("Failed to completed fetch from database", exc_info=exc)
+        try:
+            row = await self.database.fetchone(self.statement.get_one, values)
+        except Exception as exc:
+            log.verbose("Failed to completed fetch from database", exc_info=exc)
         if not row:
             return None
         if self.fetch_result is None:
@@ -187,14 +197,10 @@ class BaseWrapper:
         row_result = []
         if self.fetch_result is None:
             return []
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            for future in concurrent.futures.as_completed(
-                [executor.submit(self.database.cursor().execute, self.statement.get_all, values)]
-            ):
-                try:
-                    row_result = future.result()
-                except Exception as exc:
-                    log.verbose("Failed to completed fetch from database", exc_info=exc)
+        try:
+            row_result = await self.database.fetchall(self.statement.get_all, values)
+        except Exception as exc:
+            log.verbose("Failed to completed fetch from database", exc_info=exc)
         async for row in AsyncIter(row_result):
             output.append(self.fetch_result(*row))
         return output
@@ -204,25 +210,18 @@ class BaseWrapper:
     ) -> Optional[
         Union[LavalinkCacheFetchResult, SpotifyCacheFetchResult, YouTubeCacheFetchResult]
     ]:
-        """Get a random entry from the local cache"""
+        """Get a random entry from the local cache
+
+        This seeks to a random rowid and reads the first matching row from there,
+        wrapping around to the start of the table, so only a single row is ever read.
+        """
         row = None
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            for future in concurrent.futures.as_completed(
-                [
-                    executor.submit(
-                        self.database.cursor().execute, self.statement.get_random, values
-                    )
-                ]
-            ):
-                try:
-                    row_result = future.result()
-                    rows = row_result.fetchall()
-                    if rows:
-                        row = random.choice(rows)
-                    else:
-                        row = None
-                except Exception as exc:
-                    log.verbose("Failed to completed random fetch from database", exc_info=exc)
+        try:
+            row = await self.database.fetchone(
+                self.statement.get_random, {**values, "fraction": random.random()}
+            )
+        except Exception as exc:
+            log.verbose("Failed to completed random fetch from database", exc_info=exc)
         if not row:
             return None
         if self.fetch_result is None:
@@ -232,7 +231,7 @@ class BaseWrapper:
 
 class YouTubeTableWrapper(BaseWrapper):
     def __init__(
-        self, bot: Red, config: Config, conn: APSWConnectionWrapper, cog: Union["Audio", Cog]
+        self, bot: Red, config: Config, conn: ThreadedAPSWConnection, cog: Union["Audio", Cog]
     ):
         super().__init__(bot, config, conn, cog)
         self.statement.upsert = YOUTUBE_UPSERT
@@ -240,6 +239,8 @@ class YouTubeTableWrapper(BaseWrapper):
         self.statement.get_one = YOUTUBE_QUERY
         self.statement.get_all = YOUTUBE_QUERY_ALL
         self.statement.get_random = YOUTUBE_QUERY_LAST_FETCHED_RANDOM
+        self.insert_keys = ("track_info", "track_url")
+        self.update_key = "track"
         self.fetch_result = YouTubeCacheFetchResult
 
     async def fetch_one(
@@ -268,7 +269,7 @@ class YouTubeTableWrapper(BaseWrapper):
 
 class SpotifyTableWrapper(BaseWrapper):
     def __init__(
-        self, bot: Red, config: Config, conn: APSWConnectionWrapper, cog: Union["Audio", Cog]
+        self, bot: Red, config: Config, conn: ThreadedAPSWConnection, cog: Union["Audio", Cog]
     ):
         super().__init__(bot, config, conn, cog)
         self.statement.upsert = SPOTIFY_UPSERT
@@ -276,6 +277,8 @@ class SpotifyTableWrapper(BaseWrapper):
         self.statement.get_one = SPOTIFY_QUERY
         self.statement.get_all = SPOTIFY_QUERY_ALL
         self.statement.get_random = SPOTIFY_QUERY_LAST_FETCHED_RANDOM
+        self.insert_keys = ("id", "type", "uri")
+        self.update_key = "uri"
         self.fetch_result = SpotifyCacheFetchResult
 
     async def fetch_one(
@@ -304,7 +307,7 @@ class SpotifyTableWrapper(BaseWrapper):
 
 class LavalinkTableWrapper(BaseWrapper):
     def __init__(
-        self, bot: Red, config: Config, conn: APSWConnectionWrapper, cog: Union["Audio", Cog]
+        self, bot: Red, config: Config, conn: ThreadedAPSWConnection, cog: Union["Audio", Cog]
     ):
         super().__init__(bot, config, conn, cog)
         self.statement.upsert = LAVALINK_UPSERT
@@ -313,6 +316,8 @@ class LavalinkTableWrapper(BaseWrapper):
         self.statement.get_all = LAVALINK_QUERY_ALL
         self.statement.get_random = LAVALINK_QUERY_LAST_FETCHED_RANDOM
         self.statement.get_all_global = LAVALINK_FETCH_ALL_ENTRIES_GLOBAL
+        self.insert_keys = ("query",)
+        self.update_key = "query"
         self.fetch_result = LavalinkCacheFetchResult
         self.fetch_for_global: Optional[Callable] = LavalinkCacheFetchForGlobalResult
 
@@ -345,24 +350,25 @@ class LavalinkTableWrapper(BaseWrapper):
         row_result = []
         if self.fetch_for_global is None:
             return []
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            for future in concurrent.futures.as_completed(
-                [executor.submit(self.database.cursor().execute, self.statement.get_all_global)]
-            ):
-                try:
-                    row_result = future.result()
-                except Exception as exc:
-                    log.verbose("Failed to completed fetch from database", exc_info=exc)
+        try:
+            row_result = await self.database.fetchall(self.statement.get_all_global)
+        except Exception as exc:
+            log.verbose("Failed to completed fetch from database", exc_info=exc)
         async for row in AsyncIter(row_result):
             output.append(self.fetch_for_global(*row))
         return output
 
 
 class LocalCacheWrapper:
-    """Wraps all table apis into 1 object representing the local cache"""
+    """Wraps all table apis into 1 object representing the local cache
+
+    Writes queued with `queue_insert` and `queue_update` are held in memory and
+    written by a background task, one ``executemany`` per table and kind of write.
+    Repeated writes for the same entry are coalesced into the most recent one.
+    """
 
     def __init__(
-        self, bot: Red, config: Config, conn: APSWConnectionWrapper, cog: Union["Audio", Cog]
+        self, bot: Red, config: Config, conn: ThreadedAPSWConnection, cog: Union["Audio", Cog]
     ):
         self.bot = bot
         self.config = config
@@ -371,3 +377,63 @@ class LocalCacheWrapper:
         self.lavalink: LavalinkTableWrapper = LavalinkTableWrapper(bot, config, conn, self.cog)
         self.spotify: SpotifyTableWrapper = SpotifyTableWrapper(bot, config, conn, self.cog)
         self.youtube: YouTubeTableWrapper = YouTubeTableWrapper(bot, config, conn, self.cog)
+        self._pending_inserts: Dict[str, Dict[Tuple[Any, ...], MutableMapping]] = {}
+        self._pending_updates: Dict[str, Dict[str, MutableMapping]] = {}
+        self._pending_count = 0
+        self._flush_needed = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+
+    def _table(self, table: str) -> BaseWrapper:
+        return {"lavalink": self.lavalink, "spotify": self.spotify, "youtube": self.youtube}[table]
+
+    def queue_insert(self, table: str, values: List[MutableMapping]) -> None:
+        """Queue entries to be inserted into a table of the local cache"""
+        keys = self._table(table).insert_keys
+        pending = self._pending_inserts.setdefault(table, {})
+        for entry in values:
+            pending[tuple(entry[key] for key in keys)] = entry
+        self._pending_count += len(values)
+        if self._pending_count >= _FLUSH_SIZE:
+            self._flush_needed.set()
+
+    def queue_update(self, table: str, values: MutableMapping) -> None:
+        """Queue an update of the last fetched time of an entry of the local cache"""
+        key = self._table(table).update_key
+        values["last_fetched"] = int(datetime.datetime.now(datetime.timezone.utc).timestamp())
+        self._pending_updates.setdefault(table, {})[values[key]] = values
+        self._pending_count += 1
+        if self._pending_count >= _FLUSH_SIZE:
+            self._flush_needed.set()
+
+    async def flush(self) -> None:
+        """Write all queued entries to the local cache"""
+        async with self._flush_lock:
+            inserts, self._pending_inserts = self._pending_inserts, {}
+            updates, self._pending_updates = self._pending_updates, {}
+            self._pending_count = 0
+            for table, entries in inserts.items():
+                await self._table(table).insert(list(entries.values()))
+            for table, entries in updates.items():
+                await self._table(table).update_many(list(entries.values()))
+
+    async def _flush_loop(self) -> None:
+        while True:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._flush_needed.wait(), timeout=_FLUSH_INTERVAL)
+            self._flush_needed.clear()
+            try:
+                await self.flush()
+            except Exception as exc:
+                log.verbose("Failed to flush pending writes to the local cache", exc_info=exc)
+
+    def start_flushing(self) -> None:
+        """Start writing queued entries to the local cache in the background"""
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    def stop_flushing(self) -> None:
+        """Stop the background writer, without writing the entries still queued"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
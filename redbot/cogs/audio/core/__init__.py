@@ -15,6 +15,7 @@ from redbot.core.commands import Cog
 from redbot.core.data_manager import cog_data_path
 from redbot.core.i18n import Translator, cog_i18n
 from redbot.core.utils.antispam import AntiSpam
+from redbot.core.utils._scheduler import Scheduler
 
 from ..utils import (
     CacheLevel,
@@ -62,13 +63,16 @@ class Audio(
         self._persist_queue_cache = {}
         self._dj_status_cache = {}
         self._dj_role_cache = {}
+        self._empty_channel_timers_cache = {}
+        # guild ID -> when the bot was left alone in the guild's voice channel
+        self._empty_channel_since = {}
+        self._empty_channel_scheduler = Scheduler("Audio empty channel scheduler")
         self.skip_votes = {}
         self.play_lock = {}
         self.antispam: Dict[int, Dict[str, AntiSpam]] = defaultdict(lambda: defaultdict(AntiSpam))
 
         self.lavalink_connect_task = None
         self._restore_task = None
-        self.player_automated_timer_task = None
         self.cog_cleaned_up = False
         self.lavalink_connection_aborted = False
         self.permission_cache = discord.Permissions(
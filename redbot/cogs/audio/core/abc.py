@@ -27,7 +27,8 @@ from redbot.core import Config, commands
 from redbot.core.bot import Red
 from redbot.core.commands import Context
 from redbot.core.utils.antispam import AntiSpam
-from redbot.core.utils.dbtools import APSWConnectionWrapper
+from redbot.core.utils._scheduler import Scheduler
+from redbot.core.utils.dbtools import ThreadedAPSWConnection
 
 if TYPE_CHECKING:
     from ..apis.interface import AudioAPIInterface
@@ -50,7 +51,7 @@ class MixinMeta(ABC):
     managed_node_controller: Optional["ServerManager"]
     playlist_api: Optional["PlaylistWrapper"]
     local_folder_current_path: Optional[Path]
-    db_conn: Optional[APSWConnectionWrapper]
+    db_conn: Optional[ThreadedAPSWConnection]
     session: aiohttp.ClientSession
     antispam: Dict[int, Dict[str, AntiSpam]]
     llset_captcha_intervals: List[Tuple[datetime.timedelta, int]]
@@ -62,6 +63,9 @@ class MixinMeta(ABC):
     _persist_queue_cache: MutableMapping[int, bool]
     _dj_status_cache: MutableMapping[int, Optional[bool]]
     _dj_role_cache: MutableMapping[int, Optional[int]]
+    _empty_channel_timers_cache: MutableMapping[int, Tuple[Optional[int], Optional[int]]]
+    _empty_channel_since: MutableMapping[int, float]
+    _empty_channel_scheduler: Scheduler
     _error_timer: MutableMapping[int, float]
     _disconnected_players: MutableMapping[int, bool]
     global_api_user: MutableMapping[str, Any]
@@ -73,7 +77,6 @@ class MixinMeta(ABC):
 
     lavalink_connect_task: Optional[asyncio.Task]
     _restore_task: Optional[asyncio.Task]
-    player_automated_timer_task: Optional[asyncio.Task]
     cog_init_task: Optional[asyncio.Task]
     cog_ready_event: asyncio.Event
     _ws_resume: defaultdict[Any, asyncio.Event]
@@ -138,7 +141,13 @@ class MixinMeta(ABC):
         raise NotImplementedError()
 
     @abstractmethod
-    async def player_automated_timer(self) -> None:
+    async def get_empty_channel_timers(
+        self, guild: discord.Guild
+    ) -> Tuple[Optional[int], Optional[int]]:
+        raise NotImplementedError()
+
+    @abstractmethod
+    async def update_empty_channel_timers(self, guild: discord.Guild) -> None:
         raise NotImplementedError()
 
     @abstractmethod
@@ -707,6 +707,8 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
 
         await self.config.guild(ctx.guild).emptydc_timer.set(seconds)
         await self.config.guild(ctx.guild).emptydc_enabled.set(enabled)
+        self._empty_channel_timers_cache.pop(ctx.guild.id, None)
+        await self.update_empty_channel_timers(ctx.guild)
 
     @command_audioset.command(name="emptypause")
     @commands.guild_only()
@@ -735,6 +737,8 @@ class AudioSetCommands(MixinMeta, metaclass=CompositeMetaClass):
             )
         await self.config.guild(ctx.guild).emptypause_timer.set(seconds)
         await self.config.guild(ctx.guild).emptypause_enabled.set(enabled)
+        self._empty_channel_timers_cache.pop(ctx.guild.id, None)
+        await self.update_empty_channel_timers(ctx.guild)
 
     @command_audioset.command(name="lyrics")
     @commands.guild_only()
@@ -424,8 +424,7 @@ class DpyEvents(MixinMeta, metaclass=CompositeMetaClass):
         if not self.cog_cleaned_up:
             self.bot.dispatch("red_audio_unload", self)
             await self.session.close()
-            if self.player_automated_timer_task:
-                self.player_automated_timer_task.cancel()
+            self._empty_channel_scheduler.stop()
 
             if self.lavalink_connect_task:
                 self.lavalink_connect_task.cancel()
@@ -473,6 +472,8 @@ class DpyEvents(MixinMeta, metaclass=CompositeMetaClass):
                 if player.channel.id == channel.id:
                     await self.self_deafen(player)
 
+        await self.update_empty_channel_timers(member.guild)
+
     @commands.Cog.listener()
     async def on_shard_disconnect(self, shard_id):
         self._disconnected_shard.add(shard_id)
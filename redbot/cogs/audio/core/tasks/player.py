@@ -1,14 +1,14 @@
-import asyncio
 import time
 from pathlib import Path
 
-from typing import Dict
+from typing import Optional, Tuple
 
+import discord
 import lavalink
+from lavalink import NodeNotFound, PlayerNotFound
 from red_commons.logging import getLogger
 
 from redbot.core.i18n import Translator
-from redbot.core.utils import AsyncIter
 
 from ..abc import MixinMeta
 from ..cog_utils import CompositeMetaClass
@@ -18,79 +18,77 @@ _ = Translator("Audio", Path(__file__))
 
 
 class PlayerTasks(MixinMeta, metaclass=CompositeMetaClass):
-    async def player_automated_timer(self) -> None:
-        stop_times: Dict = {}
-        pause_times: Dict = {}
-        while True:
-            async for p in AsyncIter(lavalink.all_players()):
-                server = p.guild
-                if await self.bot.cog_disabled_in_guild(self, server):
-                    continue
+    async def get_empty_channel_timers(
+        self, guild: discord.Guild
+    ) -> Tuple[Optional[int], Optional[int]]:
+        """Get after how many seconds alone in a voice channel the bot disconnects and pauses.
 
-                if p.channel.members and all(m.bot for m in p.channel.members):
-                    stop_times.setdefault(server.id, time.time())
-                    pause_times.setdefault(server.id, time.time())
-                else:
-                    stop_times.pop(server.id, None)
-                    if p.paused and server.id in pause_times:
-                        try:
-                            await p.pause(False)
-                        except Exception as exc:
-                            log.debug("Exception raised in Audio's unpausing %r.", p, exc_info=exc)
-                    pause_times.pop(server.id, None)
-            servers = stop_times.copy()
-            servers.update(pause_times)
-            async for sid in AsyncIter(servers, steps=5):
-                server_obj = self.bot.get_guild(sid)
-                if not server_obj:
-                    stop_times.pop(sid, None)
-                    pause_times.pop(sid, None)
-                    try:
-                        player = lavalink.get_player(sid)
-                        await self.api_interface.persistent_queue_api.drop(sid)
-                        player.store("autoplay_notified", False)
-                        await player.stop()
-                        await player.disconnect()
-                        await self.config.guild_from_id(
-                            guild_id=sid
-                        ).currently_auto_playing_in.set([])
-                    except Exception as exc:
-                        log.debug(
-                            "Exception raised in Audio's emptydc_timer for %s.", sid, exc_info=exc
-                        )
+        Either is ``None`` when that is disabled in the guild.
+        """
+        timers = self._empty_channel_timers_cache.get(guild.id)
+        if timers is None:
+            guild_config = self.config.guild(guild)
+            disconnect_after = pause_after = None
+            if await guild_config.emptydc_enabled():
+                disconnect_after = await guild_config.emptydc_timer()
+            if await guild_config.emptypause_enabled():
+                pause_after = await guild_config.emptypause_timer()
+            timers = self._empty_channel_timers_cache[guild.id] = (disconnect_after, pause_after)
+        return timers
 
-                elif sid in stop_times and await self.config.guild(server_obj).emptydc_enabled():
-                    emptydc_timer = await self.config.guild(server_obj).emptydc_timer()
-                    if (time.time() - stop_times[sid]) >= emptydc_timer:
-                        stop_times.pop(sid)
-                        try:
-                            player = lavalink.get_player(sid)
-                            await self.api_interface.persistent_queue_api.drop(sid)
-                            player.store("autoplay_notified", False)
-                            await player.stop()
-                            await player.disconnect()
-                            await self.config.guild_from_id(
-                                guild_id=sid
-                            ).currently_auto_playing_in.set([])
-                        except Exception as exc:
-                            if "No such player for that guild" in str(exc):
-                                stop_times.pop(sid, None)
-                            log.debug(
-                                "Exception raised in Audio's emptydc_timer for %s.",
-                                sid,
-                                exc_info=exc,
-                            )
-                elif (
-                    sid in pause_times and await self.config.guild(server_obj).emptypause_enabled()
-                ):
-                    emptypause_timer = await self.config.guild(server_obj).emptypause_timer()
-                    if (time.time() - pause_times.get(sid, 0)) >= emptypause_timer:
-                        try:
-                            await lavalink.get_player(sid).pause()
-                        except Exception as exc:
-                            if "No such player for that guild" in str(exc):
-                                pause_times.pop(sid, None)
-                            log.debug(
-                                "Exception raised in Audio's pausing for %s.", sid, exc_info=exc
-                            )
-            await asyncio.sleep(5)
+    async def update_empty_channel_timers(self, guild: discord.Guild) -> None:
+        """Start or stop the empty channel timers for the guild's player.
+
+        This is called whenever the voice states in the guild change,
+        so nothing has to be polled while they don't.
+        """
+        try:
+            player = lavalink.get_player(guild.id)
+        except (NodeNotFound, PlayerNotFound):
+            player = None
+        channel = guild.me.voice.channel if player is not None and guild.me.voice else None
+
+        if channel is not None and channel.members and all(m.bot for m in channel.members):
+            empty_since = self._empty_channel_since.setdefault(guild.id, time.time())
+            disconnect_after, pause_after = await self.get_empty_channel_timers(guild)
+            # disconnecting takes precedence over pausing
+            if disconnect_after:
+                self._empty_channel_scheduler.schedule(
+                    guild.id,
+                    empty_since + disconnect_after,
+                    self._disconnect_from_empty_channel,
+                    guild.id,
+                )
+            elif pause_after:
+                self._empty_channel_scheduler.schedule(
+                    guild.id, empty_since + pause_after, self._pause_in_empty_channel, guild.id
+                )
+            else:
+                self._empty_channel_scheduler.cancel(guild.id)
+            return
+
+        self._empty_channel_scheduler.cancel(guild.id)
+        was_empty = self._empty_channel_since.pop(guild.id, None) is not None
+        if was_empty and channel is not None and player.paused:
+            try:
+                await player.pause(False)
+            except Exception as exc:
+                log.debug("Exception raised in Audio's unpausing %r.", player, exc_info=exc)
+
+    async def _disconnect_from_empty_channel(self, guild_id: int) -> None:
+        self._empty_channel_since.pop(guild_id, None)
+        try:
+            player = lavalink.get_player(guild_id)
+            await self.api_interface.persistent_queue_api.drop(guild_id)
+            player.store("autoplay_notified", False)
+            await player.stop()
+            await player.disconnect()
+            await self.config.guild_from_id(guild_id=guild_id).currently_auto_playing_in.set([])
+        except Exception as exc:
+            log.debug("Exception raised in Audio's emptydc_timer for %s.", guild_id, exc_info=exc)
+
+    async def _pause_in_empty_channel(self, guild_id: int) -> None:
+        try:
+            await lavalink.get_player(guild_id).pause()
+        except Exception as exc:
+            log.debug("Exception raised in Audio's pausing for %s.", guild_id, exc_info=exc)
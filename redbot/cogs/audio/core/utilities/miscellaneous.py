@@ -115,7 +115,7 @@ class MiscellaneousUtilities(MixinMeta, metaclass=CompositeMetaClass):
     async def _close_database(self) -> None:
         if self.api_interface is not None:
             await self.api_interface.run_all_pending_tasks()
-            self.api_interface.close()
+            await self.api_interface.close()
 
     async def _check_api_tokens(self) -> MutableMapping:
         spotify = await self.bot.get_shared_api_tokens("spotify")
@@ -362,11 +362,35 @@ YOUTUBE_QUERY_LAST_FETCHED_RANDOM: Final[
     str
 ] = """
 SELECT youtube_url, last_updated
-FROM youtube
-WHERE
-    last_fetched > :day
-    AND last_updated > :maxage
-LIMIT 100
+FROM (
+    SELECT youtube_url, last_updated
+    FROM youtube
+    WHERE
+        rowid >= (SELECT min(rowid) FROM youtube) + CAST(
+            :fraction * ((SELECT max(rowid) FROM youtube) - (SELECT min(rowid) FROM youtube) + 1)
+            AS INTEGER
+        )
+        AND last_fetched > :day
+        AND last_updated > :maxage
+    ORDER BY rowid
+    LIMIT 1
+)
+UNION ALL
+SELECT youtube_url, last_updated
+FROM (
+    SELECT youtube_url, last_updated
+    FROM youtube
+    WHERE
+        rowid < (SELECT min(rowid) FROM youtube) + CAST(
+            :fraction * ((SELECT max(rowid) FROM youtube) - (SELECT min(rowid) FROM youtube) + 1)
+            AS INTEGER
+        )
+        AND last_fetched > :day
+        AND last_updated > :maxage
+    ORDER BY rowid
+    LIMIT 1
+)
+LIMIT 1
 ;
 """
 
@@ -459,11 +483,35 @@ SPOTIFY_QUERY_LAST_FETCHED_RANDOM: Final[
     str
 ] = """
 SELECT track_info, last_updated
-FROM spotify
-WHERE
-    last_fetched > :day
-    AND last_updated > :maxage
-LIMIT 100
+FROM (
+    SELECT track_info, last_updated
+    FROM spotify
+    WHERE
+        rowid >= (SELECT min(rowid) FROM spotify) + CAST(
+            :fraction * ((SELECT max(rowid) FROM spotify) - (SELECT min(rowid) FROM spotify) + 1)
+            AS INTEGER
+        )
+        AND last_fetched > :day
+        AND last_updated > :maxage
+    ORDER BY rowid
+    LIMIT 1
+)
+UNION ALL
+SELECT track_info, last_updated
+FROM (
+    SELECT track_info, last_updated
+    FROM spotify
+    WHERE
+        rowid < (SELECT min(rowid) FROM spotify) + CAST(
+            :fraction * ((SELECT max(rowid) FROM spotify) - (SELECT min(rowid) FROM spotify) + 1)
+            AS INTEGER
+        )
+        AND last_fetched > :day
+        AND last_updated > :maxage
+    ORDER BY rowid
+    LIMIT 1
+)
+LIMIT 1
 ;
 """
 
@@ -543,11 +591,35 @@ LAVALINK_QUERY_LAST_FETCHED_RANDOM: Final[
     str
 ] = """
 SELECT data, last_updated
-FROM lavalink
-WHERE
-    last_fetched > :day
-    AND last_updated > :maxage
-LIMIT 100
+FROM (
+    SELECT data, last_updated
+    FROM lavalink
+    WHERE
+        rowid >= (SELECT min(rowid) FROM lavalink) + CAST(
+            :fraction * ((SELECT max(rowid) FROM lavalink) - (SELECT min(rowid) FROM lavalink) + 1)
+            AS INTEGER
+        )
+        AND last_fetched > :day
+        AND last_updated > :maxage
+    ORDER BY rowid
+    LIMIT 1
+)
+UNION ALL
+SELECT data, last_updated
+FROM (
+    SELECT data, last_updated
+    FROM lavalink
+    WHERE
+        rowid < (SELECT min(rowid) FROM lavalink) + CAST(
+            :fraction * ((SELECT max(rowid) FROM lavalink) - (SELECT min(rowid) FROM lavalink) + 1)
+            AS INTEGER
+        )
+        AND last_fetched > :day
+        AND last_updated > :maxage
+    ORDER BY rowid
+    LIMIT 1
+)
+LIMIT 1
 ;
 """
 LAVALINK_DELETE_OLD_ENTRIES: Final[
@@ -13,7 +13,6 @@ from redbot.core import Config, bank, commands, errors
 from redbot.core.commands.converter import TimedeltaConverter, positive_int
 from redbot.core.bot import Red
 from redbot.core.i18n import Translator, cog_i18n
-from redbot.core.utils import AsyncIter
 from redbot.core.utils.chat_formatting import box, humanize_number
 from redbot.core.utils.menus import menu
 
@@ -168,10 +167,8 @@ class Economy(commands.Cog):
 
         await self.config.user_from_id(user_id).clear()
 
-        all_members = await self.config.all_members()
-
-        async for guild_id, guild_data in AsyncIter(all_members.items(), steps=100):
-            if user_id in guild_data:
+        async for guild_id, member_id, _ in self.config.iter_members(fields=()):
+            if member_id == user_id:
                 await self.config.member_from_ids(guild_id, user_id).clear()
 
     @guild_only_check()
@@ -305,7 +302,9 @@ class Economy(commands.Cog):
             )
             if cur_time >= next_payday:
                 try:
-                    await bank.deposit_credits(author, await self.config.PAYDAY_CREDITS())
+                    new_balance = await bank.deposit_credits(
+                        author, await self.config.PAYDAY_CREDITS()
+                    )
                 except errors.BalanceTooHigh as exc:
                     await bank.set_balance(author, exc.max_balance)
                     await ctx.send(
@@ -332,7 +331,7 @@ class Economy(commands.Cog):
                         author=author,
                         currency=credits_name,
                         amount=humanize_number(await self.config.PAYDAY_CREDITS()),
-                        new_balance=humanize_number(await bank.get_balance(author)),
+                        new_balance=humanize_number(new_balance),
                         pos=humanize_number(pos) if pos else pos,
                     )
                 )
@@ -361,7 +360,7 @@ class Economy(commands.Cog):
                     if role_credits > credit_amount:
                         credit_amount = role_credits
                 try:
-                    await bank.deposit_credits(author, credit_amount)
+                    new_balance = await bank.deposit_credits(author, credit_amount)
                 except errors.BalanceTooHigh as exc:
                     await bank.set_balance(author, exc.max_balance)
                     await ctx.send(
@@ -390,7 +389,7 @@ class Economy(commands.Cog):
                         author=author,
                         currency=credits_name,
                         amount=humanize_number(credit_amount),
-                        new_balance=humanize_number(await bank.get_balance(author)),
+                        new_balance=humanize_number(new_balance),
                         pos=humanize_number(pos) if pos else pos,
                     )
                 )
@@ -614,12 +613,14 @@ class Economy(commands.Cog):
 
         pay = 0
         if payout:
-            then = await bank.get_balance(author)
             pay = payout["payout"](bid)
-            now = then - bid + pay
             try:
-                await bank.set_balance(author, now)
+                if pay >= bid:
+                    now = await bank.deposit_credits(author, pay - bid)
+                else:
+                    now = await bank.withdraw_credits(author, bid - pay)
             except errors.BalanceTooHigh as exc:
+                then = await bank.get_balance(author)
                 await bank.set_balance(author, exc.max_balance)
                 await channel.send(
                     _(
@@ -632,11 +633,11 @@ class Economy(commands.Cog):
                     )
                 )
                 return
+            then = now + bid - pay
             phrase = T_(payout["phrase"])
         else:
-            then = await bank.get_balance(author)
-            await bank.withdraw_credits(author, bid)
-            now = then - bid
+            now = await bank.withdraw_credits(author, bid)
+            then = now + bid
             phrase = _("Nothing!")
         await channel.send(
             (
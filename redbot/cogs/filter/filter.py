@@ -1,17 +1,23 @@
 import asyncio
+import logging
+import time
 import discord
-import re
 from datetime import timezone
-from typing import Union, Set, Literal, Optional
+from typing import Any, Dict, List, Mapping, Union, Set, Literal, Optional, Tuple
 
 from redbot.core import Config, modlog, commands
 from redbot.core.bot import Red
 from redbot.core.i18n import Translator, cog_i18n, set_contextual_locales_from_guild
 from redbot.core.utils.predicates import MessagePredicate
-from redbot.core.utils import AsyncIter
 from redbot.core.utils.chat_formatting import pagify, humanize_list
 
+from .matcher import WordMatcher
+
 _ = Translator("Filter", __file__)
+log = logging.getLogger("red.filter")
+
+# How often, in seconds, the in-memory filter hit counters are saved to Config.
+MEMBER_COUNTERS_SAVE_INTERVAL = 60
 
 
 @cog_i18n(_)
@@ -40,6 +46,15 @@ class Filter(commands.Cog):
         self.config.register_member(**default_member_settings)
         self.config.register_channel(**default_channel_settings)
         self.pattern_cache = {}
+        # guild ID -> read-only snapshot of the guild's settings
+        self._guild_settings: Dict[int, Mapping[str, Any]] = {}
+        # (guild ID, member ID) -> [filter_count, next_reset_time]
+        # Changes are saved to Config by `_save_member_counters()`.
+        self._member_counters: Dict[Tuple[int, int], List[float]] = {}
+        self._unsaved_member_counters: Set[Tuple[int, int]] = set()
+        # Counters being loaded from Config, so concurrent hits share one load.
+        self._member_counter_loads: Dict[Tuple[int, int], asyncio.Task] = {}
+        self._save_task: Optional[asyncio.Task] = None
 
     async def red_delete_data_for_user(
         self,
@@ -50,14 +65,22 @@ class Filter(commands.Cog):
         if requester != "discord_deleted_user":
             return
 
-        all_members = await self.config.all_members()
+        for key in [key for key in self._member_counters if key[1] == user_id]:
+            del self._member_counters[key]
+            self._unsaved_member_counters.discard(key)
 
-        async for guild_id, guild_data in AsyncIter(all_members.items(), steps=100):
-            if user_id in guild_data:
+        async for guild_id, member_id, _ in self.config.iter_members(fields=()):
+            if member_id == user_id:
                 await self.config.member_from_ids(guild_id, user_id).clear()
 
     async def cog_load(self) -> None:
         await self.register_casetypes()
+        self._save_task = asyncio.create_task(self._save_member_counters_loop())
+
+    async def cog_unload(self) -> None:
+        if self._save_task is not None:
+            self._save_task.cancel()
+        await self._save_member_counters()
 
     @staticmethod
     async def register_casetypes() -> None:
@@ -103,6 +126,7 @@ class Filter(commands.Cog):
         """
         guild = ctx.guild
         await self.config.guild(guild).filter_default_name.set(name)
+        self._guild_settings.pop(guild.id, None)
         await ctx.send(_("The name to use on filtered names has been set."))
 
     @filterset.command(name="ban")
@@ -135,11 +159,13 @@ class Filter(commands.Cog):
             async with self.config.guild(ctx.guild).all() as guild_data:
                 guild_data["filterban_count"] = 0
                 guild_data["filterban_time"] = 0
+            self._guild_settings.pop(ctx.guild.id, None)
             await ctx.send(_("Autoban disabled."))
         else:
             async with self.config.guild(ctx.guild).all() as guild_data:
                 guild_data["filterban_count"] = count
                 guild_data["filterban_time"] = timeframe
+            self._guild_settings.pop(ctx.guild.id, None)
             await ctx.send(_("Count and time have been set."))
 
     @commands.group(name="filter")
@@ -363,6 +389,7 @@ class Filter(commands.Cog):
         async with self.config.guild(guild).all() as guild_data:
             current_setting = guild_data["filter_names"]
             guild_data["filter_names"] = not current_setting
+        self._guild_settings.pop(guild.id, None)
         if current_setting:
             await ctx.send(_("Names and nicknames will no longer be filtered."))
         else:
@@ -380,12 +407,10 @@ class Filter(commands.Cog):
             ]
         ] = None,
     ) -> None:
-        """Invalidate a cached pattern"""
+        """Invalidate a cached word matcher"""
         self.pattern_cache.pop((guild.id, channel and channel.id), None)
         if channel is None:
-            for keyset in list(self.pattern_cache.keys()):  # cast needed, no remove
-                if guild.id == keyset[0]:
-                    self.pattern_cache.pop(keyset, None)
+            self._guild_settings.pop(guild.id, None)
 
     async def add_to_filter(
         self,
@@ -466,47 +491,113 @@ class Filter(commands.Cog):
 
         hits: Set[str] = set()
 
+        # The guild's matcher is shared by all of its channels,
+        # which only compile their own word lists.
+        for channel_or_none in (None, channel) if channel else (None,):
+            matcher = await self._get_matcher(guild, channel_or_none)
+            if matcher:
+                for text in texts:
+                    hits |= matcher.find_all(text)
+        return hits
+
+    async def _get_matcher(
+        self,
+        guild: discord.Guild,
+        channel: Optional[
+            Union[
+                discord.TextChannel,
+                discord.VoiceChannel,
+                discord.StageChannel,
+            ]
+        ] = None,
+    ) -> Optional[WordMatcher]:
         try:
-            pattern = self.pattern_cache[(guild.id, channel and channel.id)]
+            return self.pattern_cache[(guild.id, channel and channel.id)]
         except KeyError:
-            word_list = set(await self.config.guild(guild).filter())
-            if channel:
-                word_list |= set(await self.config.channel(channel).filter())
-
-            if word_list:
-                pattern = re.compile(
-                    "|".join(rf"\b{re.escape(w)}\b" for w in word_list), flags=re.I
-                )
-            else:
-                pattern = None
+            pass
 
-            self.pattern_cache[(guild.id, channel and channel.id)] = pattern
+        if channel:
+            word_list = await self.config.channel(channel).filter()
+        else:
+            word_list = await self.config.guild(guild).filter()
+        matcher = WordMatcher(word_list) if word_list else None
+        self.pattern_cache[(guild.id, channel and channel.id)] = matcher
+        return matcher
 
-        if pattern:
-            for text in texts:
-                hits |= set(pattern.findall(text))
-        return hits
+    async def _get_guild_settings(self, guild: discord.Guild) -> Mapping[str, Any]:
+        try:
+            return self._guild_settings[guild.id]
+        except KeyError:
+            pass
+        guild_data = await self.config.guild(guild).all(read_only=True)
+        self._guild_settings[guild.id] = guild_data
+        return guild_data
+
+    async def _count_filter_hit(
+        self, member: discord.Member, timestamp: float, timeframe: int
+    ) -> int:
+        """Count a filtered message of the member, and get their count in the current timeframe."""
+        key = (member.guild.id, member.id)
+        counter = self._member_counters.get(key)
+        if counter is None:
+            load = self._member_counter_loads.get(key)
+            if load is None:
+                load = asyncio.create_task(self._load_member_counter(member))
+                self._member_counter_loads[key] = load
+                load.add_done_callback(lambda _: self._member_counter_loads.pop(key, None))
+            counter = await asyncio.shield(load)
+        if timestamp >= counter[1]:
+            # the timeframe starts at the first filtered message after the last one ended
+            counter[0] = 0
+            counter[1] = timestamp + timeframe
+        counter[0] += 1
+        self._unsaved_member_counters.add(key)
+        return counter[0]
+
+    async def _load_member_counter(self, member: discord.Member) -> List[float]:
+        member_data = await self.config.member(member).all()
+        counter = [member_data["filter_count"], member_data["next_reset_time"]]
+        self._member_counters[(member.guild.id, member.id)] = counter
+        return counter
+
+    async def _save_member_counters(self) -> None:
+        unsaved, self._unsaved_member_counters = self._unsaved_member_counters, set()
+        if unsaved:
+            try:
+                async with self.config.batch():
+                    for guild_id, member_id in unsaved:
+                        counter = self._member_counters.get((guild_id, member_id))
+                        if counter is None:
+                            continue
+                        await self.config.member_from_ids(guild_id, member_id).set(
+                            {"filter_count": counter[0], "next_reset_time": counter[1]}
+                        )
+            except BaseException:
+                # retry them on the next save
+                self._unsaved_member_counters |= unsaved
+                raise
+        # Counters whose timeframe is over will be reset by the next hit anyway.
+        now = time.time()
+        for key in [key for key, counter in self._member_counters.items() if counter[1] <= now]:
+            if key not in self._unsaved_member_counters:
+                del self._member_counters[key]
+
+    async def _save_member_counters_loop(self) -> None:
+        while True:
+            await asyncio.sleep(MEMBER_COUNTERS_SAVE_INTERVAL)
+            try:
+                await self._save_member_counters()
+            except Exception:
+                log.exception("Failed to save filter hit counters.")
 
     async def check_filter(self, message: discord.Message):
         guild = message.guild
         author = message.author
-        guild_data = await self.config.guild(guild).all()
-        member_data = await self.config.member(author).all()
+        guild_data = await self._get_guild_settings(guild)
         filter_count = guild_data["filterban_count"]
         filter_time = guild_data["filterban_time"]
-        user_count = member_data["filter_count"]
-        next_reset_time = member_data["next_reset_time"]
         created_at = message.created_at
 
-        if filter_count > 0 and filter_time > 0:
-            if created_at.timestamp() >= next_reset_time:
-                next_reset_time = created_at.timestamp() + filter_time
-                async with self.config.member(author).all() as member_data:
-                    member_data["next_reset_time"] = next_reset_time
-                    if user_count > 0:
-                        user_count = 0
-                        member_data["filter_count"] = user_count
-
         texts = [message.content]
         poll = message.poll
         if poll is not None:
@@ -545,9 +636,10 @@ class Filter(commands.Cog):
             else:
                 self.bot.dispatch("filter_message_delete", message, hits)
                 if filter_count > 0 and filter_time > 0:
-                    user_count += 1
-                    await self.config.member(author).filter_count.set(user_count)
-                    if user_count >= filter_count and created_at.timestamp() < next_reset_time:
+                    user_count = await self._count_filter_hit(
+                        author, created_at.timestamp(), filter_time
+                    )
+                    if user_count >= filter_count:
                         reason = _("Autoban (too many filtered messages.)")
                         try:
                             await guild.ban(author, reason=reason)
@@ -590,6 +682,12 @@ class Filter(commands.Cog):
         # if this changes, we should compare before passing it.
         await self.on_message(message)
 
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild):
+        self._guild_settings.pop(guild.id, None)
+        for key in [key for key in self.pattern_cache if key[0] == guild.id]:
+            del self.pattern_cache[key]
+
     @commands.Cog.listener()
     async def on_member_update(self, before: discord.Member, after: discord.Member):
         if before.display_name != after.display_name:
@@ -610,7 +708,7 @@ class Filter(commands.Cog):
             return  # Discord Hierarchy applies to nicks
         if await self.bot.is_automod_immune(member):
             return
-        guild_data = await self.config.guild(member.guild).all()
+        guild_data = await self._get_guild_settings(member.guild)
         if not guild_data["filter_names"]:
             return
 
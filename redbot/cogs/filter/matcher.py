@@ -0,0 +1,94 @@
+import re
+from typing import Any, Dict, Iterable, Optional, Pattern, Set
+
+__all__ = ("WordMatcher",)
+
+_BOUNDARY_RE = re.compile(r"\b")
+# Up to this many words, a regex is faster than walking the trie in Python.
+_REGEX_MAX_WORDS = 32
+
+
+def _fold(text: str) -> str:
+    """Lowercase ``text`` without changing its length, so that indices stay the same."""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # a few characters, such as "İ", lowercase to more than one character
+    return "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+
+class WordMatcher:
+    """
+    Finds which of a set of words are used in a text.
+
+    Words are matched case-insensitively and only as whole words,
+    the same way a ``\\bword\\b`` alternation regex with `re.IGNORECASE` would.
+    The text is scanned left to right, a match is only tried where the regex
+    could start one, and the longest word found there is taken.
+
+    Large word lists are compiled into a trie once, so the cost of a scan
+    depends on the length of the text rather than on the number of words.
+    """
+
+    __slots__ = ("_root", "_pattern")
+
+    def __init__(self, words: Iterable[str]):
+        words = {word for word in words if word}
+        self._pattern: Optional[Pattern[str]] = None
+        # Each node maps a character to the next node,
+        # and None to True if a word ends at this node.
+        self._root: Dict[Optional[str], Any] = {}
+        if len(words) <= _REGEX_MAX_WORDS:
+            if words:
+                # trying the longest words first makes the regex take
+                # the longest word at each position, like the trie does
+                self._pattern = re.compile(
+                    "|".join(rf"\b{re.escape(w)}\b" for w in sorted(words, key=len, reverse=True)),
+                    flags=re.I,
+                )
+            return
+
+        for word in words:
+            node = self._root
+            for char in _fold(word):
+                node = node.setdefault(char, {})
+            node[None] = True
+
+    def __bool__(self) -> bool:
+        return self._pattern is not None or bool(self._root)
+
+    def find_all(self, text: str) -> Set[str]:
+        """Get the parts of ``text`` which matched any of the words."""
+        if self._pattern is not None:
+            return set(self._pattern.findall(text))
+        hits: Set[str] = set()
+        root = self._root
+        if not root:
+            return hits
+
+        folded = _fold(text)
+        length = len(text)
+        boundaries = [match.start() for match in _BOUNDARY_RE.finditer(text)]
+        # only built once a word is found, which most texts never get to
+        is_boundary: Optional[Set[int]] = None
+        resume_at = 0
+        for start in boundaries:
+            if start < resume_at:
+                continue
+            node = root
+            end = None
+            index = start
+            while index < length:
+                node = node.get(folded[index])
+                if node is None:
+                    break
+                index += 1
+                if None in node:
+                    if is_boundary is None:
+                        is_boundary = set(boundaries)
+                    if index in is_boundary:
+                        end = index
+            if end is not None:
+                hits.add(text[start:end])
+                resume_at = end
+        return hits
@@ -4,6 +4,7 @@ from typing import Optional
 import discord
 from redbot.core import Config, commands
 from redbot.core.bot import Red
+from redbot.core.utils._scheduler import Scheduler
 
 
 class MixinMeta(ABC):
@@ -17,6 +18,8 @@ class MixinMeta(ABC):
         self.config: Config
         self.bot: Red
         self.cache: dict
+        self.mention_spam_cache: dict
+        self._tempban_scheduler: Scheduler
 
     @staticmethod
     @abstractmethod
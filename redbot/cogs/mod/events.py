@@ -1,12 +1,12 @@
 import logging
 from datetime import timezone
-from collections import defaultdict, deque
-from typing import List, Optional
+from typing import Any, List, Mapping, Optional
 
 import discord
 from redbot.core import i18n, modlog, commands
 from redbot.core.utils.mod import is_mod_or_superior
 from .abc import MixinMeta
+from .utils import RepeatTracker
 
 _ = i18n.Translator("Mod", __file__)
 log = logging.getLogger("red.mod")
@@ -22,19 +22,19 @@ class Events(MixinMeta):
         guild = message.guild
         author = message.author
 
-        guild_cache = self.cache.get(guild.id, None)
-        if guild_cache is None:
+        try:
+            tracker = self.cache[guild.id]
+        except KeyError:
             repeats = await self.config.guild(guild).delete_repeats()
-            if repeats == -1:
-                return False
-            guild_cache = self.cache[guild.id] = defaultdict(lambda: deque(maxlen=repeats))
+            # None marks the feature as disabled, so that isn't looked up again
+            tracker = self.cache[guild.id] = RepeatTracker(repeats) if repeats != -1 else None
+        if tracker is None:
+            return False
 
         if not message.content:
             return False
 
-        guild_cache[author].append(message.content)
-        msgs = guild_cache[author]
-        if len(msgs) == msgs.maxlen and len(set(msgs)) == 1:
+        if tracker.add(author.id, message.content):
             try:
                 await message.delete()
                 return True
@@ -42,9 +42,18 @@ class Events(MixinMeta):
                 pass
         return False
 
+    async def _get_mention_spam_settings(self, guild: discord.Guild) -> Mapping[str, Any]:
+        try:
+            return self.mention_spam_cache[guild.id]
+        except KeyError:
+            pass
+        mention_spam = await self.config.guild(guild).mention_spam.all(read_only=True)
+        self.mention_spam_cache[guild.id] = mention_spam
+        return mention_spam
+
     async def check_mention_spam(self, message):
         guild, author = message.guild, message.author
-        mention_spam = await self.config.guild(guild).mention_spam.all()
+        mention_spam = await self._get_mention_spam_settings(guild)
 
         if mention_spam["strict"]:  # if strict is enabled
             mentions = len(message.raw_mentions) + len(message.raw_role_mentions)
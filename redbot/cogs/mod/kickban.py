@@ -1,4 +1,3 @@
-import asyncio
 import contextlib
 import logging
 from datetime import datetime, timedelta, timezone
@@ -7,7 +6,6 @@ from typing import Dict, List, Optional, Tuple, Union
 import discord
 from redbot.core import commands, i18n, modlog
 from redbot.core.commands import RawUserIdConverter
-from redbot.core.utils import AsyncIter
 from redbot.core.utils.chat_formatting import (
     pagify,
     humanize_number,
@@ -22,6 +20,9 @@ from .utils import is_allowed_by_hierarchy
 log = logging.getLogger("red.mod")
 _ = i18n.Translator("Mod", __file__)
 
+# how long to wait before trying to end a tempban again when it couldn't be done
+TEMPBAN_RETRY_DELAY = 60
+
 
 class KickBanMixin(MixinMeta):
     """
@@ -164,6 +165,7 @@ class KickBanMixin(MixinMeta):
                 if user.id in tempbans:
                     async with self.config.guild(guild).current_tempbans() as tempbans:
                         tempbans.remove(user.id)
+                    self._tempban_scheduler.cancel((guild.id, user.id))
                     removed_temp = True
                 else:
                     return (
@@ -226,62 +228,61 @@ class KickBanMixin(MixinMeta):
 
         return True, success_message
 
-    async def tempban_expirations_task(self) -> None:
-        while True:
-            try:
-                await self._check_tempban_expirations()
-            except Exception:
-                log.exception("Something went wrong in check_tempban_expirations:")
-
-            await asyncio.sleep(60)
+    async def _schedule_tempban_expirations(self) -> None:
+        """Schedule the unbans for all of the tempbans saved in Config."""
+        async for guild_id, guild_data in self.config.iter_guilds(
+            fields=("current_tempbans",), read_only=True
+        ):
+            for uid in guild_data["current_tempbans"]:
+                banned_until = await self.config.member_from_ids(guild_id, uid).banned_until()
+                self._schedule_tempban_expiration(guild_id, uid, banned_until or 0)
 
-    async def _check_tempban_expirations(self) -> None:
-        guilds_data = await self.config.all_guilds()
-        async for guild_id, guild_data in AsyncIter(guilds_data.items(), steps=100):
-            if not (guild := self.bot.get_guild(guild_id)):
-                continue
-            if guild.unavailable or not guild.me.guild_permissions.ban_members:
-                continue
-            if await self.bot.cog_disabled_in_guild(self, guild):
-                continue
+    def _schedule_tempban_expiration(self, guild_id: int, user_id: int, when: float) -> None:
+        self._tempban_scheduler.schedule(
+            (guild_id, user_id), when, self._handle_tempban_expiration, guild_id, user_id
+        )
 
-            guild_tempbans = guild_data["current_tempbans"]
-            if not guild_tempbans:
-                continue
-            async with self.config.guild(guild).current_tempbans.get_lock():
-                if await self._check_guild_tempban_expirations(guild, guild_tempbans):
-                    await self.config.guild(guild).current_tempbans.set(guild_tempbans)
+    async def _handle_tempban_expiration(self, guild_id: int, user_id: int) -> None:
+        await self.bot.wait_until_red_ready()
+        retry_at = datetime.now(timezone.utc).timestamp() + TEMPBAN_RETRY_DELAY
+        guild = self.bot.get_guild(guild_id)
+        if (
+            guild is None
+            or guild.unavailable
+            or not guild.me.guild_permissions.ban_members
+            or await self.bot.cog_disabled_in_guild(self, guild)
+        ):
+            self._schedule_tempban_expiration(guild_id, user_id, retry_at)
+            return
 
-    async def _check_guild_tempban_expirations(
-        self, guild: discord.Guild, guild_tempbans: List[int]
-    ) -> bool:
-        changed = False
-        for uid in guild_tempbans.copy():
-            unban_time = datetime.fromtimestamp(
-                await self.config.member_from_ids(guild.id, uid).banned_until(),
-                timezone.utc,
-            )
-            if datetime.now(timezone.utc) > unban_time:
-                try:
-                    await guild.unban(discord.Object(id=uid), reason=_("Tempban finished"))
-                except discord.NotFound:
-                    # user is not banned anymore
-                    guild_tempbans.remove(uid)
-                    changed = True
-                except discord.HTTPException as e:
-                    # 50013: Missing permissions error code or 403: Forbidden status
-                    if e.code == 50013 or e.status == 403:
-                        log.info(
-                            f"Failed to unban ({uid}) user from "
-                            f"{guild.name}({guild.id}) guild due to permissions."
-                        )
-                        break  # skip the rest of this guild
-                    log.info(f"Failed to unban member: error code: {e.code}")
+        async with self.config.guild(guild).current_tempbans.get_lock():
+            guild_tempbans = await self.config.guild(guild).current_tempbans()
+            if user_id not in guild_tempbans:
+                # the tempban was upgraded to a permaban, or the user's data was deleted
+                return
+            banned_until = await self.config.member_from_ids(guild.id, user_id).banned_until()
+            if banned_until and banned_until > datetime.now(timezone.utc).timestamp():
+                # the user was tempbanned again after this was scheduled
+                self._schedule_tempban_expiration(guild_id, user_id, banned_until)
+                return
+            try:
+                await guild.unban(discord.Object(id=user_id), reason=_("Tempban finished"))
+            except discord.NotFound:
+                # user is not banned anymore
+                pass
+            except discord.HTTPException as e:
+                # 50013: Missing permissions error code or 403: Forbidden status
+                if e.code == 50013 or e.status == 403:
+                    log.info(
+                        f"Failed to unban ({user_id}) user from "
+                        f"{guild.name}({guild.id}) guild due to permissions."
+                    )
                 else:
-                    # user unbanned successfully
-                    guild_tempbans.remove(uid)
-                    changed = True
-        return changed
+                    log.info(f"Failed to unban member: error code: {e.code}")
+                self._schedule_tempban_expiration(guild_id, user_id, retry_at)
+                return
+            guild_tempbans.remove(user_id)
+            await self.config.guild(guild).current_tempbans.set(guild_tempbans)
 
     @commands.command()
     @commands.guild_only()
@@ -536,6 +537,7 @@ class KickBanMixin(MixinMeta):
             async with self.config.guild(guild).current_tempbans() as tempbans:
                 if user_id in tempbans:
                     tempbans.remove(user_id)
+                    self._tempban_scheduler.cancel((guild.id, user_id))
                     upgrades.append(str(user_id))
                     log.info(
                         "%s (%s) upgraded the tempban for %s to a permaban.",
@@ -640,6 +642,7 @@ class KickBanMixin(MixinMeta):
         await self.config.member(member).banned_until.set(unban_time.timestamp())
         async with self.config.guild(guild).current_tempbans() as current_tempbans:
             current_tempbans.append(member.id)
+        self._schedule_tempban_expiration(guild.id, member.id, unban_time.timestamp())
 
         with contextlib.suppress(discord.HTTPException):
             # We don't want blocked DMs preventing us from banning
@@ -3,19 +3,21 @@ import logging
 import re
 from abc import ABC
 from collections import defaultdict
-from typing import Literal
+from typing import Any, Dict, Literal, Mapping, Optional
 
 from redbot.core import Config, commands
 from redbot.core.bot import Red
 from redbot.core.i18n import Translator, cog_i18n
 from redbot.core.utils import AsyncIter
 from redbot.core.utils._internal_utils import send_to_owners_with_prefix_replaced
+from redbot.core.utils._scheduler import Scheduler
 from redbot.core.utils.chat_formatting import inline
 from .events import Events
 from .kickban import KickBanMixin
 from .names import ModInfo
 from .slowmode import Slowmode
 from .settings import ModSettings
+from .utils import RepeatTracker
 
 _ = T_ = Translator("Mod", __file__)
 
@@ -78,8 +80,12 @@ class Mod(
         self.config.register_channel(**self.default_channel_settings)
         self.config.register_member(**self.default_member_settings)
         self.config.register_user(**self.default_user_settings)
-        self.cache: dict = {}
-        self.tban_expiry_task = asyncio.create_task(self.tempban_expirations_task())
+        # guild ID -> repeated messages tracker, or None if that is disabled in the guild
+        self.cache: Dict[int, Optional[RepeatTracker]] = {}
+        # guild ID -> read-only snapshot of the guild's mention spam settings
+        self.mention_spam_cache: Dict[int, Mapping[str, Any]] = {}
+        # (guild ID, user ID) -> scheduled unban of a tempbanned user
+        self._tempban_scheduler = Scheduler("Mod tempban scheduler")
         self.last_case: dict = defaultdict(dict)
 
     async def red_delete_data_for_user(
@@ -91,17 +97,15 @@ class Mod(
         if requester != "discord_deleted_user":
             return
 
-        all_members = await self.config.all_members()
-
-        async for guild_id, guild_data in AsyncIter(all_members.items(), steps=100):
-            if user_id in guild_data:
+        async for guild_id, member_id, _ in self.config.iter_members(fields=()):
+            if member_id == user_id:
                 await self.config.member_from_ids(guild_id, user_id).clear()
 
         await self.config.user_from_id(user_id).clear()
 
-        guild_data = await self.config.all_guilds()
-
-        async for guild_id, guild_data in AsyncIter(guild_data.items(), steps=100):
+        async for guild_id, guild_data in self.config.iter_guilds(
+            fields=("current_tempbans",), read_only=True
+        ):
             if user_id in guild_data["current_tempbans"]:
                 async with self.config.guild_from_id(guild_id).current_tempbans() as tbs:
                     try:
@@ -109,12 +113,15 @@ class Mod(
                     except ValueError:
                         pass
                     # possible with a context switch between here and getting all guilds
+                self._tempban_scheduler.cancel((guild_id, user_id))
 
     async def cog_load(self) -> None:
         await self._maybe_update_config()
+        await self._schedule_tempban_expirations()
+        self._tempban_scheduler.start()
 
     def cog_unload(self):
-        self.tban_expiry_task.cancel()
+        self._tempban_scheduler.stop()
 
     async def _maybe_update_config(self):
         """Maybe update `delete_delay` value set by Config prior to Mod 1.0.0."""
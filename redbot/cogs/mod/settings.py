@@ -1,5 +1,4 @@
 import asyncio
-from collections import defaultdict, deque
 from datetime import timedelta
 
 from redbot.core import commands, i18n
@@ -7,6 +6,7 @@ from redbot.core.utils import AsyncIter
 from redbot.core.utils.chat_formatting import box, humanize_timedelta, inline
 
 from .abc import MixinMeta
+from .utils import RepeatTracker
 
 _ = i18n.Translator("Mod", __file__)
 
@@ -159,6 +159,7 @@ class ModSettings(MixinMeta):
         else:
             msg = _("Mention spam will only account for mentions of different users.")
         await self.config.guild(guild).mention_spam.strict.set(enabled)
+        self.mention_spam_cache.pop(guild.id, None)
         await ctx.send(msg)
 
     @mentionspam.command(name="warn")
@@ -177,6 +178,7 @@ class ModSettings(MixinMeta):
             if not mention_spam["warn"]:
                 return await ctx.send(_("Autowarn for mention spam is already disabled."))
             await self.config.guild(ctx.guild).mention_spam.warn.set(False)
+            self.mention_spam_cache.pop(ctx.guild.id, None)
             return await ctx.send(_("Autowarn for mention spam disabled."))
 
         if max_mentions < 1:
@@ -193,6 +195,7 @@ class ModSettings(MixinMeta):
                 mismatch_message += _("\nAutowarn is equal to or higher than autoban.")
 
         await self.config.guild(ctx.guild).mention_spam.warn.set(max_mentions)
+        self.mention_spam_cache.pop(ctx.guild.id, None)
         await ctx.send(
             _(
                 "Autowarn for mention spam enabled. "
@@ -217,6 +220,7 @@ class ModSettings(MixinMeta):
             if not mention_spam["kick"]:
                 return await ctx.send(_("Autokick for mention spam is already disabled."))
             await self.config.guild(ctx.guild).mention_spam.kick.set(False)
+            self.mention_spam_cache.pop(ctx.guild.id, None)
             return await ctx.send(_("Autokick for mention spam disabled."))
 
         if max_mentions < 1:
@@ -233,6 +237,7 @@ class ModSettings(MixinMeta):
                 mismatch_message += _("\nAutokick is equal to or higher than autoban.")
 
         await self.config.guild(ctx.guild).mention_spam.kick.set(max_mentions)
+        self.mention_spam_cache.pop(ctx.guild.id, None)
         await ctx.send(
             _(
                 "Autokick for mention spam enabled. "
@@ -256,6 +261,7 @@ class ModSettings(MixinMeta):
             if not mention_spam["ban"]:
                 return await ctx.send(_("Autoban for mention spam is already disabled."))
             await self.config.guild(ctx.guild).mention_spam.ban.set(False)
+            self.mention_spam_cache.pop(ctx.guild.id, None)
             return await ctx.send(_("Autoban for mention spam disabled."))
 
         if max_mentions < 1:
@@ -272,6 +278,7 @@ class ModSettings(MixinMeta):
                 mismatch_message += _("\nAutoban is equal to or lower than autokick.")
 
         await self.config.guild(ctx.guild).mention_spam.ban.set(max_mentions)
+        self.mention_spam_cache.pop(ctx.guild.id, None)
         await ctx.send(
             _(
                 "Autoban for mention spam enabled. "
@@ -293,12 +300,12 @@ class ModSettings(MixinMeta):
         if repeats is not None:
             if repeats == -1:
                 await self.config.guild(guild).delete_repeats.set(repeats)
-                self.cache.pop(guild.id, None)  # remove cache with old repeat limits
+                self.cache[guild.id] = None  # stop tracking messages
                 await ctx.send(_("Repeated messages will be ignored."))
             elif 2 <= repeats <= 20:
                 await self.config.guild(guild).delete_repeats.set(repeats)
                 # purge and update cache to new repeat limits
-                self.cache[guild.id] = defaultdict(lambda: deque(maxlen=repeats))
+                self.cache[guild.id] = RepeatTracker(repeats)
                 await ctx.send(
                     _("Messages repeated up to {num} times will be deleted.").format(num=repeats)
                 )
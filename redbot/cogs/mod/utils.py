@@ -1,8 +1,17 @@
+import time
+from collections import OrderedDict
+from typing import List, Optional
+
 import discord
 
 from redbot.core.bot import Red
 from redbot.core.config import Config
 
+#: The most authors whose messages are tracked for repeats in a single guild.
+MAX_TRACKED_AUTHORS = 10_000
+#: How long, in seconds, an author's last message counts towards repeats.
+REPEAT_TRACKING_TTL = 60 * 60
+
 
 async def is_allowed_by_hierarchy(
     bot: Red, config: Config, guild: discord.Guild, mod: discord.Member, user: discord.Member
@@ -11,3 +20,62 @@ async def is_allowed_by_hierarchy(
         return True
     is_special = mod == guild.owner or await bot.is_owner(mod)
     return mod.top_role > user.top_role or is_special
+
+
+class RepeatTracker:
+    """
+    Tracks how many times in a row the recent authors of a guild sent the same message.
+
+    Rather than the messages themselves, only a hash of each author's last message
+    is kept, along with how many times in a row they sent it. At most ``max_authors``
+    authors are tracked, the least recently active ones being dropped first, and
+    authors who haven't sent anything for ``ttl`` seconds are forgotten.
+    """
+
+    __slots__ = ("repeats", "max_authors", "ttl", "_authors")
+
+    def __init__(
+        self,
+        repeats: int,
+        *,
+        max_authors: int = MAX_TRACKED_AUTHORS,
+        ttl: float = REPEAT_TRACKING_TTL,
+    ):
+        self.repeats = repeats
+        self.max_authors = max_authors
+        self.ttl = ttl
+        # author ID -> [last seen, hash of the last message, times in a row]
+        self._authors: "OrderedDict[int, List]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._authors)
+
+    def add(self, author_id: int, content: str, now: Optional[float] = None) -> bool:
+        """Track a message, and get whether it was sent at least `repeats` times in a row."""
+        if now is None:
+            now = time.monotonic()
+        authors = self._authors
+        # Entries are kept in the order their authors were last seen,
+        # so expired ones can only be at the front.
+        expiry = now - self.ttl
+        while authors:
+            oldest = next(iter(authors.values()))
+            if oldest[0] > expiry:
+                break
+            authors.popitem(last=False)
+
+        content_hash = hash(content)
+        entry = authors.get(author_id)
+        if entry is None:
+            entry = authors[author_id] = [now, content_hash, 1]
+            if len(authors) > self.max_authors:
+                authors.popitem(last=False)
+        else:
+            authors.move_to_end(author_id)
+            entry[0] = now
+            if entry[1] == content_hash:
+                entry[2] += 1
+            else:
+                entry[1] = content_hash
+                entry[2] = 1
+        return entry[2] >= self.repeats
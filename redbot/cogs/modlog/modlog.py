@@ -1,6 +1,6 @@
 from datetime import datetime, timezone
 
-from typing import Optional, Union
+from typing import AsyncGenerator, Optional, Union
 
 import discord
 
@@ -8,12 +8,83 @@ from redbot.core import commands, modlog
 from redbot.core.bot import Red
 from redbot.core.i18n import Translator, cog_i18n
 from redbot.core.utils.chat_formatting import bold, box, pagify
-from redbot.core.utils.menus import menu
+from redbot.core.utils import menus
 from redbot.core.utils.predicates import MessagePredicate
 
 _ = Translator("ModLog", __file__)
 
 
+async def _lazy_menu(
+    ctx: commands.Context, pages: AsyncGenerator[Union[str, discord.Embed], None]
+) -> bool:
+    """Show a menu which only renders each page once it's first reached.
+
+    The first two pages are loaded up front, so that a single page is shown
+    without navigation controls. Going back from the first page loads
+    the remaining pages first, so that it still wraps around to the last one.
+    With buttons enabled, all of the pages are loaded up front so that
+    the standard buttons, which need the page count, can be used.
+
+    Returns ``False`` without sending anything if there are no pages.
+    """
+    loaded = []
+    exhausted = False
+
+    async def load_page() -> None:
+        nonlocal exhausted
+        try:
+            loaded.append(await pages.__anext__())
+        except StopAsyncIteration:
+            exhausted = True
+
+    async def next_page(ctx, _pages, controls, message, page, timeout, emoji, *, user=None):
+        if page >= len(loaded) - 1 and not exhausted:
+            await load_page()
+        return await menus.next_page(
+            ctx, loaded.copy(), controls, message, page, timeout, emoji, user=user
+        )
+
+    async def prev_page(ctx, _pages, controls, message, page, timeout, emoji, *, user=None):
+        if page <= 0 and not exhausted:
+            async with ctx.typing():
+                while not exhausted:
+                    await load_page()
+        return await menus.prev_page(
+            ctx, loaded.copy(), controls, message, page, timeout, emoji, user=user
+        )
+
+    try:
+        if await ctx.bot.use_buttons():
+            async with ctx.typing():
+                while not exhausted:
+                    await load_page()
+            if not loaded:
+                return False
+            await menus.menu(ctx, loaded)
+            return True
+
+        async with ctx.typing():
+            # The second page is loaded too, to know whether any navigation is needed.
+            await load_page()
+            if loaded:
+                await load_page()
+        if not loaded:
+            return False
+        if exhausted and len(loaded) == 1:
+            await menus.menu(ctx, loaded)
+            return True
+
+        # same emojis in the same order as the default controls
+        controls = {
+            emoji: {menus.prev_page: prev_page, menus.next_page: next_page}.get(func, func)
+            for emoji, func in menus.DEFAULT_CONTROLS.items()
+        }
+        await menus.menu(ctx, loaded.copy(), controls)
+        return True
+    finally:
+        await pages.aclose()
+
+
 @cog_i18n(_)
 class ModLog(commands.Cog):
     """Browse and manage modlog cases. To manage modlog settings, use `[p]modlogset`."""
@@ -50,75 +121,50 @@ class ModLog(commands.Cog):
     @commands.guild_only()
     async def casesfor(self, ctx: commands.Context, *, member: Union[discord.Member, int]):
         """Display cases for the specified member."""
-        async with ctx.typing():
-            try:
-                if isinstance(member, int):
-                    cases = await modlog.get_cases_for_member(
-                        bot=ctx.bot, guild=ctx.guild, member_id=member
-                    )
-                else:
-                    cases = await modlog.get_cases_for_member(
-                        bot=ctx.bot, guild=ctx.guild, member=member
-                    )
-            except discord.NotFound:
-                return await ctx.send(_("That user does not exist."))
-            except discord.HTTPException:
-                return await ctx.send(
-                    _("Something unexpected went wrong while fetching that user by ID.")
-                )
+        member_id = member if isinstance(member, int) else member.id
+        embed_requested = await ctx.embed_requested()
 
-            if not cases:
-                return await ctx.send(_("That user does not have any cases."))
-
-            embed_requested = await ctx.embed_requested()
-            if embed_requested:
-                rendered_cases = [await case.message_content(embed=True) for case in cases]
-            else:
-                rendered_cases = []
-                for case in cases:
+        async def render_pages() -> AsyncGenerator[Union[str, discord.Embed], None]:
+            async for case in modlog.iter_cases(ctx.guild, member_id=member_id, page_size=5):
+                if embed_requested:
+                    yield await case.message_content(embed=True)
+                else:
                     created_at = datetime.fromtimestamp(case.created_at, tz=timezone.utc)
-                    message = (
+                    yield (
                         f"{await case.message_content(embed=False)}\n"
                         f"{bold(_('Timestamp:'))} {discord.utils.format_dt(created_at)}"
                     )
-                    rendered_cases.append(message)
 
-        await menu(ctx, rendered_cases)
+        if not await _lazy_menu(ctx, render_pages()):
+            await ctx.send(_("That user does not have any cases."))
 
     @commands.command()
     @commands.guild_only()
     async def listcases(self, ctx: commands.Context, *, member: Union[discord.Member, int]):
         """List cases for the specified member."""
-        async with ctx.typing():
-            try:
-                if isinstance(member, int):
-                    cases = await modlog.get_cases_for_member(
-                        bot=ctx.bot, guild=ctx.guild, member_id=member
-                    )
-                else:
-                    cases = await modlog.get_cases_for_member(
-                        bot=ctx.bot, guild=ctx.guild, member=member
-                    )
-            except discord.NotFound:
-                return await ctx.send(_("That user does not exist."))
-            except discord.HTTPException:
-                return await ctx.send(
-                    _("Something unexpected went wrong while fetching that user by ID.")
-                )
-            if not cases:
-                return await ctx.send(_("That user does not have any cases."))
+        member_id = member if isinstance(member, int) else member.id
 
-            rendered_cases = []
+        async def render_pages() -> AsyncGenerator[str, None]:
             message = ""
-            for case in cases:
+            count = 0
+            async for case in modlog.iter_cases(ctx.guild, member_id=member_id, page_size=5):
                 created_at = datetime.fromtimestamp(case.created_at, tz=timezone.utc)
                 message += (
                     f"{await case.message_content(embed=False)}\n"
                     f"{bold(_('Timestamp:'))} {discord.utils.format_dt(created_at)}\n\n"
                 )
-            for page in pagify(message, ["\n\n", "\n"], priority=True):
-                rendered_cases.append(page)
-        await menu(ctx, rendered_cases)
+                count += 1
+                if count == 5:
+                    for page in pagify(message, ["\n\n", "\n"], priority=True):
+                        yield page
+                    message = ""
+                    count = 0
+            if message:
+                for page in pagify(message, ["\n\n", "\n"], priority=True):
+                    yield page
+
+        if not await _lazy_menu(ctx, render_pages()):
+            await ctx.send(_("That user does not have any cases."))
 
     @commands.command()
     @commands.guild_only()
@@ -3,7 +3,7 @@ import contextlib
 import logging
 from abc import ABC
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Literal, Optional, Tuple, Union, cast
+from typing import Dict, List, Literal, Optional, Set, Tuple, Union, cast
 
 import discord
 
@@ -21,6 +21,7 @@ from redbot.core.utils.mod import get_audit_reason
 from redbot.core.utils.menus import start_adding_reactions
 from redbot.core.utils.views import SimpleMenu
 from redbot.core.utils.predicates import MessagePredicate, ReactionPredicate
+from redbot.core.utils._scheduler import Scheduler
 
 from .converters import MuteTime
 from .models import ChannelMuteResponse, MuteResponse
@@ -73,6 +74,10 @@ log = logging.getLogger("red.cogs.mutes")
 
 __version__ = "1.0.0"
 
+# how long to wait before trying an automatic unmute again
+# when the guild is unavailable or the cog is disabled in it
+UNMUTE_RETRY_DELAY = 60
+
 
 class CompositeMetaClass(type(commands.Cog), type(ABC)):
     """
@@ -106,8 +111,9 @@ class Mutes(VoiceMutes, commands.Cog, metaclass=CompositeMetaClass):
         self.config.register_channel(muted_users={})
         self._server_mutes: Dict[int, Dict[int, dict]] = {}
         self._channel_mutes: Dict[int, Dict[int, dict]] = {}
-        self._unmute_tasks: Dict[str, asyncio.Task] = {}
-        self._unmute_task: Optional[asyncio.Task] = None
+        self._unmute_scheduler = Scheduler("Mutes unmute scheduler")
+        # (guild ID, user ID) -> IDs of the channels the user has timed mutes in
+        self._channel_unmute_index: Dict[Tuple[int, int], Set[int]] = {}
         self.mute_role_cache: Dict[int, int] = {}
         # this is a dict of guild ID's and asyncio.Events
         # to wait for a guild to finish channel unmutes before
@@ -155,9 +161,8 @@ class Mutes(VoiceMutes, commands.Cog, metaclass=CompositeMetaClass):
             raise RuntimeError(
                 "Mutes cog is in a bad state, can't proceed with data deletion request."
             )
-        all_members = await self.config.all_members()
-        for g_id, data in all_members.items():
-            for m_id, mutes in data.items():
+        async with self.config.batch():
+            async for g_id, m_id, _ in self.config.iter_members(fields=()):
                 if m_id == user_id:
                     await self.config.member_from_ids(g_id, m_id).clear()
 
@@ -177,16 +182,23 @@ class Mutes(VoiceMutes, commands.Cog, metaclass=CompositeMetaClass):
             self._channel_mutes[c_id] = {}
             for user_id, mute in mutes["muted_users"].items():
                 self._channel_mutes[c_id][int(user_id)] = mute
-        self._unmute_task = asyncio.create_task(self._handle_automatic_unmute())
+        for g_id, mutes in self._server_mutes.items():
+            for user_id in mutes:
+                self._schedule_server_unmute(g_id, user_id)
+        for c_id, mutes in self._channel_mutes.items():
+            for user_id, mute in mutes.items():
+                self._schedule_channel_unmutes(mute["guild"], user_id, c_id)
+        self._unmute_scheduler.start()
         self._ready.set()
 
     async def _maybe_update_config(self):
         schema_version = await self.config.schema_version()
 
         if schema_version == 0:
-            await self._schema_0_to_1()
-            schema_version += 1
-            await self.config.schema_version.set(schema_version)
+            async with self.config.batch():
+                await self._schema_0_to_1()
+                schema_version += 1
+                await self.config.schema_version.set(schema_version)
 
     async def _schema_0_to_1(self):
         """This contains conversion that adds guild ID to channel mutes data."""
@@ -227,10 +239,7 @@ class Mutes(VoiceMutes, commands.Cog, metaclass=CompositeMetaClass):
     def cog_unload(self):
         if self._init_task is not None:
             self._init_task.cancel()
-        if self._unmute_task is not None:
-            self._unmute_task.cancel()
-        for task in self._unmute_tasks.values():
-            task.cancel()
+        self._unmute_scheduler.stop()
 
     async def is_allowed_by_hierarchy(
         self, guild: discord.Guild, mod: discord.Member, user: discord.Member
@@ -238,74 +247,40 @@ class Mutes(VoiceMutes, commands.Cog, metaclass=CompositeMetaClass):
         is_special = mod == guild.owner or await self.bot.is_owner(mod)
         return mod.top_role > user.top_role or is_special
 
-    async def _handle_automatic_unmute(self):
-        """This is the core task creator and loop
-        for automatic unmutes
-
-        A resolution of 30 seconds seems appropriate
-        to allow for decent resolution on low timed
-        unmutes and without being too busy on our event loop
-        """
-        await self.bot.wait_until_red_ready()
-        await self._ready.wait()
-        if self._ready_raised:
-            raise RuntimeError("Mutes cog is in a bad state, cancelling automatic unmute task.")
-        while True:
-            await self._clean_tasks()
-            try:
-                await self._handle_server_unmutes()
-            except Exception:
-                log.error("error checking server unmutes", exc_info=True)
-            await asyncio.sleep(0.1)
-            try:
-                await self._handle_channel_unmutes()
-            except Exception:
-                log.error("error checking channel unmutes", exc_info=True)
-            await asyncio.sleep(30)
-
-    async def _clean_tasks(self):
-        """This is here to cleanup our tasks
-        and log when we have something going wrong
-        inside our tasks.
-        """
-        log.debug("Cleaning unmute tasks")
-        for task_id in list(self._unmute_tasks.keys()):
-            task = self._unmute_tasks[task_id]
-
-            if task.cancelled():
-                self._unmute_tasks.pop(task_id, None)
-                continue
-
-            if task.done():
-                try:
-                    r = task.result()
-                except Exception as exc:
-                    log.error("An unexpected error occurred in the unmute task", exc_info=exc)
-                self._unmute_tasks.pop(task_id, None)
+    def _schedule_server_unmute(self, guild_id: int, user_id: int) -> None:
+        """Schedule the automatic unmute for a server mute, if it has an end time."""
+        key = ("server", guild_id, user_id)
+        data = self._server_mutes.get(guild_id, {}).get(user_id)
+        if data and data["until"]:
+            self._unmute_scheduler.schedule(
+                key, data["until"], self._handle_server_unmute, guild_id, user_id
+            )
+        else:
+            self._unmute_scheduler.cancel(key)
 
-    async def _handle_server_unmutes(self):
+    async def _handle_server_unmute(self, guild_id: int, user_id: int) -> None:
         """This is where the logic for role unmutes is taken care of"""
-        log.debug("Checking server unmutes")
-        for g_id in self._server_mutes:
-            guild = self.bot.get_guild(g_id)
-            if guild is None or await self.bot.cog_disabled_in_guild(self, guild):
-                continue
-            await i18n.set_contextual_locales_from_guild(self.bot, guild)
-            for u_id in self._server_mutes[guild.id]:
-                if self._server_mutes[guild.id][u_id]["until"] is None:
-                    continue
-                time_to_unmute = (
-                    self._server_mutes[guild.id][u_id]["until"]
-                    - datetime.now(timezone.utc).timestamp()
-                )
-                if time_to_unmute < 60.0:
-                    task_name = f"server-unmute-{g_id}-{u_id}"
-                    if task_name in self._unmute_tasks:
-                        continue
-                    log.debug(f"Creating task: {task_name}")
-                    self._unmute_tasks[task_name] = asyncio.create_task(
-                        self._auto_unmute_user(guild, self._server_mutes[guild.id][u_id])
-                    )
+        data = self._server_mutes.get(guild_id, {}).get(user_id)
+        if not data or not data["until"]:
+            return
+        now = datetime.now(timezone.utc).timestamp()
+        if data["until"] > now:
+            # the mute was extended after this was scheduled
+            self._schedule_server_unmute(guild_id, user_id)
+            return
+        guild = self.bot.get_guild(guild_id)
+        if guild is None or await self.bot.cog_disabled_in_guild(self, guild):
+            self._unmute_scheduler.schedule(
+                ("server", guild_id, user_id),
+                now + UNMUTE_RETRY_DELAY,
+                self._handle_server_unmute,
+                guild_id,
+                user_id,
+            )
+            return
+        log.debug("Automatically unmuting %s in guild %s", user_id, guild_id)
+        await i18n.set_contextual_locales_from_guild(self.bot, guild)
+        await self._auto_unmute_user(guild, data)
 
     async def _auto_unmute_user(self, guild: discord.Guild, data: dict):
         """
@@ -316,10 +291,6 @@ class Mutes(VoiceMutes, commands.Cog, metaclass=CompositeMetaClass):
         need to worry about the dict response for message
         since only role based mutes get added here
         """
-        delay = data["until"] - datetime.now(timezone.utc).timestamp()
-        if delay < 1:
-            delay = 0
-        await asyncio.sleep(delay)
 
         member = guild.get_member(data["member"])
         author = guild.get_member(data["author"])
@@ -363,57 +334,68 @@ class Mutes(VoiceMutes, commands.Cog, metaclass=CompositeMetaClass):
                 log.info(error_msg)
                 return
 
-    async def _handle_channel_unmutes(self):
-        """This is where the logic for handling channel unmutes is taken care of"""
-        log.debug("Checking channel unmutes")
-        multiple_mutes = {}
-        for c_id, c_data in self._channel_mutes.items():
-            for u_id in self._channel_mutes[c_id]:
-                if (
-                    not self._channel_mutes[c_id][u_id]
-                    or not self._channel_mutes[c_id][u_id]["until"]
-                ):
-                    continue
-                guild = self.bot.get_guild(self._channel_mutes[c_id][u_id]["guild"])
-                if guild is None or await self.bot.cog_disabled_in_guild(self, guild):
-                    continue
-                time_to_unmute = (
-                    self._channel_mutes[c_id][u_id]["until"]
-                    - datetime.now(timezone.utc).timestamp()
-                )
-                if time_to_unmute < 60.0:
-                    if guild not in multiple_mutes:
-                        multiple_mutes[guild] = {}
-                    if u_id not in multiple_mutes[guild]:
-                        multiple_mutes[guild][u_id] = {c_id: self._channel_mutes[c_id][u_id]}
-                    else:
-                        multiple_mutes[guild][u_id][c_id] = self._channel_mutes[c_id][u_id]
-
-        for guild, users in multiple_mutes.items():
-            await i18n.set_contextual_locales_from_guild(self.bot, guild)
-            for user, channels in users.items():
-                if len(channels) > 1:
-                    task_name = f"server-unmute-channels-{guild.id}-{user}"
-                    if task_name in self._unmute_tasks:
-                        continue
-                    log.debug(f"Creating task: {task_name}")
-                    member = guild.get_member(user)
-                    self._unmute_tasks[task_name] = asyncio.create_task(
-                        self._auto_channel_unmute_user_multi(member, guild, channels)
-                    )
+    def _schedule_channel_unmutes(
+        self, guild_id: int, user_id: int, channel_id: Optional[int] = None
+    ) -> None:
+        """Schedule the automatic unmute for a user's channel mutes in a guild.
 
-                else:
-                    for channel, mute_data in channels.items():
-                        task_name = f"channel-unmute-{channel}-{user}"
-                        log.debug(f"Creating task: {task_name}")
-                        if task_name in self._unmute_tasks:
-                            continue
-                        if guild_channel := guild.get_channel(channel):
-                            self._unmute_tasks[task_name] = asyncio.create_task(
-                                self._auto_channel_unmute_user(guild_channel, mute_data)
-                            )
+        All of the user's timed channel mutes in the guild share one scheduled
+        unmute at the earliest end time, so that the mutes which end together
+        are also lifted together.
+        """
+        key = ("channel", guild_id, user_id)
+        channel_ids = self._channel_unmute_index.setdefault((guild_id, user_id), set())
+        if channel_id is not None:
+            channel_ids.add(channel_id)
+        earliest = None
+        for c_id in channel_ids.copy():
+            data = self._channel_mutes.get(c_id, {}).get(user_id)
+            if not data or not data["until"]:
+                channel_ids.discard(c_id)
+            elif earliest is None or data["until"] < earliest:
+                earliest = data["until"]
+        if earliest is None:
+            del self._channel_unmute_index[(guild_id, user_id)]
+            self._unmute_scheduler.cancel(key)
+        else:
+            self._unmute_scheduler.schedule(
+                key, earliest, self._handle_channel_unmutes, guild_id, user_id
+            )
+
+    async def _handle_channel_unmutes(self, guild_id: int, user_id: int) -> None:
+        """This is where the logic for handling channel unmutes is taken care of"""
+        now = datetime.now(timezone.utc).timestamp()
+        guild = self.bot.get_guild(guild_id)
+        if guild is None or await self.bot.cog_disabled_in_guild(self, guild):
+            self._unmute_scheduler.schedule(
+                ("channel", guild_id, user_id),
+                now + UNMUTE_RETRY_DELAY,
+                self._handle_channel_unmutes,
+                guild_id,
+                user_id,
+            )
+            return
+        channel_ids = self._channel_unmute_index.get((guild_id, user_id), set())
+        channels = {}
+        for c_id in channel_ids:
+            data = self._channel_mutes.get(c_id, {}).get(user_id)
+            if data and data["until"] and data["until"] <= now:
+                channels[c_id] = data
+        # the mutes that haven't ended yet get scheduled again
+        channel_ids.difference_update(channels)
+        self._schedule_channel_unmutes(guild_id, user_id)
+        if not channels:
+            return
 
-        del multiple_mutes
+        log.debug("Automatically unmuting %s in channels %s", user_id, list(channels))
+        await i18n.set_contextual_locales_from_guild(self.bot, guild)
+        if len(channels) > 1:
+            member = guild.get_member(user_id)
+            await self._auto_channel_unmute_user_multi(member, guild, channels)
+        else:
+            ((channel_id, mute_data),) = channels.items()
+            if guild_channel := guild.get_channel(channel_id):
+                await self._auto_channel_unmute_user(guild_channel, mute_data)
 
     async def _auto_channel_unmute_user_multi(
         self, member: discord.Member, guild: discord.Guild, channels: Dict[int, dict]
@@ -490,10 +472,6 @@ class Mutes(VoiceMutes, commands.Cog, metaclass=CompositeMetaClass):
         self, channel: discord.abc.GuildChannel, data: dict, create_case: bool = True
     ) -> Optional[Tuple[discord.Member, discord.abc.GuildChannel, str]]:
         """This is meant to unmute a user in individual channels"""
-        delay = data["until"] - datetime.now(timezone.utc).timestamp()
-        if delay < 1:
-            delay = 0
-        await asyncio.sleep(delay)
         member = channel.guild.get_member(data["member"])
         author = channel.guild.get_member(data["author"])
         if not member:
@@ -1721,6 +1699,7 @@ class Mutes(VoiceMutes, commands.Cog, metaclass=CompositeMetaClass):
                     del self._server_mutes[guild.id][user.id]
                 ret.reason = _(MUTE_UNMUTE_ISSUES["permissions_issue_role"])
                 return ret
+            self._schedule_server_unmute(guild.id, user.id)
             if user.voice:
                 try:
                     await user.move_to(user.voice.channel)
@@ -1771,6 +1750,7 @@ class Mutes(VoiceMutes, commands.Cog, metaclass=CompositeMetaClass):
             if guild.id in self._server_mutes:
                 if user.id in self._server_mutes[guild.id]:
                     del self._server_mutes[guild.id][user.id]
+                    self._schedule_server_unmute(guild.id, user.id)
             if not guild.me.guild_permissions.manage_roles or mute_role >= guild.me.top_role:
                 reasons.append(_(MUTE_UNMUTE_ISSUES["permissions_issue_role"]))
             else:
@@ -1910,6 +1890,7 @@ class Mutes(VoiceMutes, commands.Cog, metaclass=CompositeMetaClass):
             )
             return ret
 
+        self._schedule_channel_unmutes(guild.id, user.id, channel.id)
         if move_channel:
             try:
                 await user.move_to(channel)
@@ -1970,6 +1951,7 @@ class Mutes(VoiceMutes, commands.Cog, metaclass=CompositeMetaClass):
         overwrites.update(**old_values)
         if channel.id in self._channel_mutes and user.id in self._channel_mutes[channel.id]:
             current_mute = self._channel_mutes[channel.id].pop(user.id)
+            self._schedule_channel_unmutes(guild.id, user.id)
         else:
             ret.reason = _(MUTE_UNMUTE_ISSUES["already_unmuted"]).format(location=channel.mention)
             return ret
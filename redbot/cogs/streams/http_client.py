@@ -0,0 +1,136 @@
+import json
+import time
+from typing import Any, Mapping, NamedTuple, Optional, Tuple
+
+import aiohttp
+
+from redbot.core._settings_caches import BoundedCache
+
+__all__ = ("HTTPResponse", "StreamsHTTPClient")
+
+# How long a cached response is used without asking the server whether it changed.
+RESPONSE_CACHE_TTL = 30
+# The least number of responses cached, whatever the number of followed streams.
+RESPONSE_CACHE_SIZE = 200
+# How many cached responses are kept for each followed stream. Checking a YouTube stream
+# requests its RSS feed and the details of its current livestream, and sometimes its channel.
+RESPONSES_PER_STREAM = 3
+
+
+class HTTPResponse(NamedTuple):
+    status: int
+    text: str
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+
+class _CachedResponse:
+    __slots__ = ("response", "etag", "last_modified", "fetched_at")
+
+    def __init__(
+        self,
+        response: HTTPResponse,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        fetched_at: float,
+    ):
+        self.response = response
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+
+
+class StreamsHTTPClient:
+    """
+    The HTTP client all of the cog's requests to the stream services go through.
+
+    It keeps one connection pool for the cog, so that each refresh reuses
+    the connections of the previous one rather than opening new ones,
+    and limits how many requests are made to a single host at once.
+
+    Responses which are requested with ``cache=True`` are reused for
+    `RESPONSE_CACHE_TTL` seconds, and are revalidated with the
+    ``ETag`` and ``Last-Modified`` headers the server sent after that.
+    Each refresh requests every followed stream's URLs in the same order,
+    so the cache has to hold all of them for a response to still be there
+    on the next refresh; see `fit_cache_to`.
+    """
+
+    def __init__(self, *, limit: int = 100, limit_per_host: int = 10):
+        self._limit = limit
+        self._limit_per_host = limit_per_host
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._cache: BoundedCache[
+            Tuple[str, Tuple[Tuple[str, str], ...]], _CachedResponse
+        ] = BoundedCache(RESPONSE_CACHE_SIZE)
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The pooled session, for requests that need more control than `get()` gives."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self._limit, limit_per_host=self._limit_per_host
+                ),
+                timeout=aiohttp.ClientTimeout(total=60),
+            )
+        return self._session
+
+    def fit_cache_to(self, num_streams: int) -> None:
+        """Size the response cache to hold the responses of ``num_streams`` followed streams."""
+        self._cache.resize(max(RESPONSE_CACHE_SIZE, num_streams * RESPONSES_PER_STREAM))
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        self._cache.clear()
+
+    async def get(
+        self,
+        url: str,
+        *,
+        params: Optional[Mapping[str, str]] = None,
+        cache: bool = False,
+    ) -> HTTPResponse:
+        """
+        Make a GET request.
+
+        Parameters
+        ----------
+        url : str
+            The URL to request.
+        params : Optional[Mapping[str, str]]
+            The query parameters.
+        cache : bool
+            Whether the response may be served from, and stored in, the response cache.
+
+        Returns
+        -------
+        HTTPResponse
+            The status and body of the response.
+        """
+        key = (url, tuple(sorted((params or {}).items())))
+        cached = self._cache.get(key) if cache else None
+        now = time.monotonic()
+        if cached is not None and now - cached.fetched_at < RESPONSE_CACHE_TTL:
+            return cached.response
+
+        headers = {}
+        if cached is not None:
+            if cached.etag is not None:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified is not None:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        async with self.session.get(url, params=params, headers=headers) as resp:
+            if resp.status == 304 and cached is not None:
+                cached.fetched_at = now
+                return cached.response
+            response = HTTPResponse(resp.status, await resp.text(encoding="utf-8"))
+            if cache and resp.status == 200:
+                self._cache[key] = _CachedResponse(
+                    response, resp.headers.get("ETag"), resp.headers.get("Last-Modified"), now
+                )
+        return response
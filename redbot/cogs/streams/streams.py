@@ -9,8 +9,10 @@ from redbot.core.utils.chat_formatting import escape, inline, pagify
 from .streamtypes import (
     PicartoStream,
     Stream,
+    TwitchRateLimit,
     TwitchStream,
     YoutubeStream,
+    get_twitch_streams_data,
 )
 from .errors import (
     APIError,
@@ -22,22 +24,34 @@ from .errors import (
     YoutubeQuotaExceeded,
 )
 from . import streamtypes as _streamtypes
+from .http_client import StreamsHTTPClient
 
 import re
 import logging
 import asyncio
 import aiohttp
 import contextlib
+import time
 from datetime import datetime
 from collections import defaultdict
-from typing import Optional, List, Tuple, Union, Dict
+from typing import NamedTuple, Optional, List, Set, Tuple, Union, Dict
 
 MAX_RETRY_COUNT = 10
+# How many streams of each service are checked at the same time during a refresh.
+# Requests to Twitch also wait on the rate limit which its responses report.
+CHECK_CONCURRENCY = {"TwitchStream": 5, "YoutubeStream": 5, "PicartoStream": 5}
 
 _ = Translator("Streams", __file__)
 log = logging.getLogger("red.core.cogs.Streams")
 
 
+class _PendingAlert(NamedTuple):
+    stream: Stream
+    channel: Union[discord.TextChannel, discord.VoiceChannel, discord.StageChannel]
+    embed: discord.Embed
+    is_schedule: bool
+
+
 @cog_i18n(_)
 class Streams(commands.Cog):
     """Various commands relating to streaming platforms.
@@ -70,6 +84,10 @@ class Streams(commands.Cog):
         super().__init__()
         self.config: Config = Config.get_conf(self, 26262626)
         self.ttv_bearer_cache: dict = {}
+        # shared by all requests to the Twitch API, as they share the rate limit
+        self.ttv_rate_limit = TwitchRateLimit()
+        # pools the connections of all requests made to the stream services
+        self.http_client = StreamsHTTPClient()
         self.config.register_global(**self.global_defaults)
         self.config.register_guild(**self.guild_defaults)
         self.config.register_role(**self.role_defaults)
@@ -157,42 +175,39 @@ class Streams(commands.Cog):
             except KeyError:
                 if notified_owner_missing_twitch_secret is False:
                     asyncio.create_task(self._notify_owner_about_missing_twitch_secret())
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "https://id.twitch.tv/oauth2/token",
-                params={
-                    "client_id": tokens.get("client_id", ""),
-                    "client_secret": tokens.get("client_secret", ""),
-                    "grant_type": "client_credentials",
-                },
-            ) as req:
-                try:
-                    data = await req.json()
-                except aiohttp.ContentTypeError:
-                    data = {}
-
-                if req.status == 200:
-                    pass
-                elif req.status == 400 and data.get("message") == "invalid client":
-                    log.error(
-                        "Twitch API request failed authentication: set Client ID is invalid."
-                    )
-                elif req.status == 403 and data.get("message") == "invalid client secret":
-                    log.error(
-                        "Twitch API request failed authentication: set Client Secret is invalid."
-                    )
-                elif "message" in data:
-                    log.error(
-                        "Twitch OAuth2 API request failed with status code %s"
-                        " and error message: %s",
-                        req.status,
-                        data["message"],
-                    )
-                else:
-                    log.error("Twitch OAuth2 API request failed with status code %s", req.status)
+        async with self.http_client.session.post(
+            "https://id.twitch.tv/oauth2/token",
+            params={
+                "client_id": tokens.get("client_id", ""),
+                "client_secret": tokens.get("client_secret", ""),
+                "grant_type": "client_credentials",
+            },
+        ) as req:
+            try:
+                data = await req.json()
+            except aiohttp.ContentTypeError:
+                data = {}
+
+            if req.status == 200:
+                pass
+            elif req.status == 400 and data.get("message") == "invalid client":
+                log.error("Twitch API request failed authentication: set Client ID is invalid.")
+            elif req.status == 403 and data.get("message") == "invalid client secret":
+                log.error(
+                    "Twitch API request failed authentication: set Client Secret is invalid."
+                )
+            elif "message" in data:
+                log.error(
+                    "Twitch OAuth2 API request failed with status code %s"
+                    " and error message: %s",
+                    req.status,
+                    data["message"],
+                )
+            else:
+                log.error("Twitch OAuth2 API request failed with status code %s", req.status)
 
-                if req.status != 200:
-                    return
+            if req.status != 200:
+                return
 
         self.ttv_bearer_cache = data
         self.ttv_bearer_cache["expires_at"] = datetime.now().timestamp() + data.get("expires_in")
@@ -210,9 +225,11 @@ class Streams(commands.Cog):
         token = (await self.bot.get_shared_api_tokens("twitch")).get("client_id")
         stream = TwitchStream(
             _bot=self.bot,
+            client=self.http_client,
             name=channel_name,
             token=token,
             bearer=self.ttv_bearer_cache.get("access_token", None),
+            rate_limit=self.ttv_rate_limit,
         )
         await self.check_online(ctx, stream)
 
@@ -227,11 +244,19 @@ class Streams(commands.Cog):
         is_name = self.check_name_or_id(channel_id_or_name)
         if is_name:
             stream = YoutubeStream(
-                _bot=self.bot, name=channel_id_or_name, token=apikey, config=self.config
+                _bot=self.bot,
+                client=self.http_client,
+                name=channel_id_or_name,
+                token=apikey,
+                config=self.config,
             )
         else:
             stream = YoutubeStream(
-                _bot=self.bot, id=channel_id_or_name, token=apikey, config=self.config
+                _bot=self.bot,
+                client=self.http_client,
+                id=channel_id_or_name,
+                token=apikey,
+                config=self.config,
             )
         await self.check_online(ctx, stream)
 
@@ -239,7 +264,7 @@ class Streams(commands.Cog):
     @commands.command()
     async def picarto(self, ctx: commands.Context, channel_name: str):
         """Check if a Picarto channel is live."""
-        stream = PicartoStream(_bot=self.bot, name=channel_name)
+        stream = PicartoStream(_bot=self.bot, client=self.http_client, name=channel_name)
         await self.check_online(ctx, stream)
 
     async def check_online(
@@ -436,22 +461,36 @@ class Streams(commands.Cog):
             is_yt = _class.__name__ == "YoutubeStream"
             is_twitch = _class.__name__ == "TwitchStream"
             if is_yt and not self.check_name_or_id(channel_name):
-                stream = _class(_bot=self.bot, id=channel_name, token=token, config=self.config)
+                stream = _class(
+                    _bot=self.bot,
+                    client=self.http_client,
+                    id=channel_name,
+                    token=token,
+                    config=self.config,
+                )
             elif is_twitch:
                 await self.maybe_renew_twitch_bearer_token()
                 stream = _class(
                     _bot=self.bot,
+                    client=self.http_client,
                     name=channel_name,
                     token=token.get("client_id"),
                     bearer=self.ttv_bearer_cache.get("access_token", None),
+                    rate_limit=self.ttv_rate_limit,
                 )
             else:
                 if is_yt:
                     stream = _class(
-                        _bot=self.bot, name=channel_name, token=token, config=self.config
+                        _bot=self.bot,
+                        client=self.http_client,
+                        name=channel_name,
+                        token=token,
+                        config=self.config,
                     )
                 else:
-                    stream = _class(_bot=self.bot, name=channel_name, token=token)
+                    stream = _class(
+                        _bot=self.bot, client=self.http_client, name=channel_name, token=token
+                    )
             try:
                 exists = await self.check_exists(stream)
             except InvalidTwitchCredentials:
@@ -799,8 +838,10 @@ class Streams(commands.Cog):
         content: str = None,
         *,
         is_schedule: bool = False,
+        use_buttons: Optional[bool] = None,
     ):
-        use_buttons: bool = await self.config.guild(channel.guild).use_buttons()
+        if use_buttons is None:
+            use_buttons = await self.config.guild(channel.guild).use_buttons()
         view = None
         if use_buttons:
             stream_url = embed.url
@@ -821,144 +862,272 @@ class Streams(commands.Cog):
             message_data["is_schedule"] = True
         stream.messages.append(message_data)
 
+    async def _fetch_twitch_streams_data(self) -> Dict[str, Tuple[Optional[int], dict]]:
+        """Get the streams of all the Twitch channels with alerts, 100 channels per request.
+
+        Channels whose IDs aren't known yet are left out.
+        The bearer token is renewed first if it's about to expire.
+        """
+        twitch_streams = [stream for stream in self.streams if isinstance(stream, TwitchStream)]
+        if not twitch_streams:
+            return {}
+        await self.maybe_renew_twitch_bearer_token()
+        user_ids = [str(stream.id) for stream in twitch_streams if stream.id]
+        if not user_ids:
+            return {}
+        tokens = await self.bot.get_shared_api_tokens("twitch")
+        return await get_twitch_streams_data(
+            self.http_client.session,
+            user_ids,
+            client_id=tokens.get("client_id"),
+            bearer=self.ttv_bearer_cache.get("access_token", None),
+            rate_limit=self.ttv_rate_limit,
+        )
+
     async def check_streams(self):
-        to_remove = []
-        for stream in self.streams:
-            try:
+        start = time.perf_counter()
+        streams = list(self.streams)
+        to_remove: List[Stream] = []
+        self.http_client.fit_cache_to(len(streams))
+        try:
+            twitch_streams_data = await self._fetch_twitch_streams_data()
+        except Exception as e:
+            log.error("An error has occurred with Streams. Please report it.", exc_info=e)
+            twitch_streams_data = {}
+        # read once per refresh, rather than for every alert
+        guild_settings: Dict[int, dict] = {}
+        mention_role_ids = {
+            role_id for role_id, data in (await self.config.all_roles()).items() if data["mention"]
+        }
+        semaphores = {
+            stream_type: asyncio.Semaphore(limit)
+            for stream_type, limit in CHECK_CONCURRENCY.items()
+        }
+        guild_alerts: Dict[int, List[_PendingAlert]] = defaultdict(list)
+
+        async def check(stream: Stream) -> bool:
+            async with semaphores[stream.type]:
                 try:
-                    is_rerun = False
-                    is_schedule = False
-                    if stream.__class__.__name__ == "TwitchStream":
-                        await self.maybe_renew_twitch_bearer_token()
-                        embed, is_rerun = await stream.is_online()
+                    return await self._check_stream(
+                        stream, to_remove, twitch_streams_data, guild_settings, guild_alerts
+                    )
+                except Exception as e:
+                    log.error("An error has occurred with Streams. Please report it.", exc_info=e)
+                    return False
+
+        changed = await asyncio.gather(*(check(stream) for stream in streams))
+        # The alerts of each guild are sent by a single task, so that the roles
+        # made mentionable for them aren't made unmentionable by another alert's task
+        # before they're all sent.
+        sent = await asyncio.gather(
+            *(
+                self._send_guild_alerts(alerts, guild_settings[guild_id], mention_role_ids)
+                for guild_id, alerts in guild_alerts.items()
+            )
+        )
+
+        for stream in to_remove:
+            self.streams.remove(stream)
+        if to_remove or any(changed) or any(sent):
+            await self.save_streams()
+        log.debug(
+            "Checked %s streams in %.2f seconds, %s of which changed, and sent %s alerts.",
+            len(streams),
+            time.perf_counter() - start,
+            sum(changed),
+            sum(sent),
+        )
 
-                    elif stream.__class__.__name__ == "YoutubeStream":
-                        embed, is_schedule = await stream.is_online()
+    async def _get_guild_settings(
+        self, guild: discord.Guild, guild_settings: Dict[int, dict]
+    ) -> dict:
+        guild_data = guild_settings.get(guild.id)
+        if guild_data is None:
+            guild_data = guild_settings[guild.id] = await self.config.guild(guild).all()
+        return guild_data
 
-                    else:
-                        embed = await stream.is_online()
-                except StreamNotFound:
-                    if stream.retry_count > MAX_RETRY_COUNT:
-                        log.info("Stream with name %s no longer exists. Removing...", stream.name)
-                        to_remove.append(stream)
-                    else:
-                        log.info(
-                            "Stream with name %s seems to not exist, will retry later", stream.name
-                        )
-                        stream.retry_count += 1
+    async def _check_stream(
+        self,
+        stream: Stream,
+        to_remove: List[Stream],
+        twitch_streams_data: Dict[str, Tuple[Optional[int], dict]],
+        guild_settings: Dict[int, dict],
+        guild_alerts: Dict[int, List[_PendingAlert]],
+    ) -> bool:
+        """Check whether a stream is live, and delete its alerts or queue new ones.
+
+        The new alerts are added to ``guild_alerts`` under their guild's ID,
+        to be sent by `_send_guild_alerts`.
+
+        Returns whether the stream's data changed and needs to be saved.
+        """
+        try:
+            is_rerun = False
+            is_schedule = False
+            if stream.__class__.__name__ == "TwitchStream":
+                embed, is_rerun = await stream.is_online(twitch_streams_data.get(str(stream.id)))
+
+            elif stream.__class__.__name__ == "YoutubeStream":
+                embed, is_schedule = await stream.is_online()
+
+            else:
+                embed = await stream.is_online()
+        except StreamNotFound:
+            if stream.retry_count > MAX_RETRY_COUNT:
+                log.info("Stream with name %s no longer exists. Removing...", stream.name)
+                to_remove.append(stream)
+            else:
+                log.info("Stream with name %s seems to not exist, will retry later", stream.name)
+                stream.retry_count += 1
+            return False
+        except OfflineStream:
+            if not stream.messages:
+                return False
+
+            for msg_data in stream.iter_messages():
+                partial_msg = msg_data["partial_message"]
+                if partial_msg is None:
                     continue
-                except OfflineStream:
-                    if not stream.messages:
-                        continue
-
-                    for msg_data in stream.iter_messages():
-                        partial_msg = msg_data["partial_message"]
-                        if partial_msg is None:
-                            continue
-                        if await self.bot.cog_disabled_in_guild(self, partial_msg.guild):
-                            continue
-                        if not await self.config.guild(partial_msg.guild).autodelete():
-                            continue
-
-                        with contextlib.suppress(discord.NotFound):
-                            await partial_msg.delete()
-
-                    stream.messages.clear()
-                    await self.save_streams()
-                except APIError as e:
-                    log.error(
-                        "Something went wrong whilst trying to contact the stream service's API.\n"
-                        "Raw response data:\n%r",
-                        e,
-                    )
+                if await self.bot.cog_disabled_in_guild(self, partial_msg.guild):
                     continue
-                else:
-                    if stream.messages:
-                        continue
-                    for channel_id in stream.channels:
-                        channel = self.bot.get_channel(channel_id)
-                        if not channel:
-                            continue
-                        if await self.bot.cog_disabled_in_guild(self, channel.guild):
-                            continue
-
-                        guild_data = await self.config.guild(channel.guild).all()
-                        if guild_data["ignore_reruns"] and is_rerun:
-                            continue
-                        if guild_data["ignore_schedule"] and is_schedule:
-                            continue
-                        if is_schedule:
-                            # skip messages and mentions
-                            await self._send_stream_alert(stream, channel, embed, is_schedule=True)
-                            await self.save_streams()
-                            continue
-                        await set_contextual_locales_from_guild(self.bot, channel.guild)
-
-                        mention_str, edited_roles = await self._get_mention_str(
-                            channel.guild, channel, guild_data
+                guild_data = await self._get_guild_settings(partial_msg.guild, guild_settings)
+                if not guild_data["autodelete"]:
+                    continue
+
+                with contextlib.suppress(discord.NotFound):
+                    await partial_msg.delete()
+
+            stream.messages.clear()
+            return True
+        except APIError as e:
+            log.error(
+                "Something went wrong whilst trying to contact the stream service's API.\n"
+                "Raw response data:\n%r",
+                e,
+            )
+            return False
+
+        if stream.messages:
+            return False
+        for channel_id in stream.channels:
+            channel = self.bot.get_channel(channel_id)
+            if not channel:
+                continue
+            if await self.bot.cog_disabled_in_guild(self, channel.guild):
+                continue
+
+            guild_data = await self._get_guild_settings(channel.guild, guild_settings)
+            if guild_data["ignore_reruns"] and is_rerun:
+                continue
+            if guild_data["ignore_schedule"] and is_schedule:
+                continue
+            guild_alerts[channel.guild.id].append(
+                _PendingAlert(stream, channel, embed, is_schedule)
+            )
+        return False
+
+    async def _send_guild_alerts(
+        self, alerts: List[_PendingAlert], guild_data: dict, mention_role_ids: Set[int]
+    ) -> int:
+        """Send the alerts for a single guild, one at a time.
+
+        The roles which have to be made mentionable are only made unmentionable again
+        once all of the alerts are sent.
+
+        Returns the number of alerts sent.
+        """
+        guild = alerts[0].channel.guild
+        await set_contextual_locales_from_guild(self.bot, guild)
+        edited_roles: Dict[int, discord.Role] = {}
+        sent = 0
+        try:
+            for stream, channel, embed, is_schedule in alerts:
+                try:
+                    if is_schedule:
+                        # skip messages and mentions
+                        await self._send_stream_alert(
+                            stream,
+                            channel,
+                            embed,
+                            is_schedule=True,
+                            use_buttons=guild_data["use_buttons"],
+                        )
+                    else:
+                        mention_str, roles = await self._get_mention_str(
+                            guild, channel, guild_data, mention_role_ids
+                        )
+                        edited_roles.update((role.id, role) for role in roles)
+                        await self._send_stream_alert(
+                            stream,
+                            channel,
+                            embed,
+                            self._get_live_message(stream, guild_data, mention_str),
+                            use_buttons=guild_data["use_buttons"],
                         )
+                except Exception as e:
+                    log.error("An error has occurred with Streams. Please report it.", exc_info=e)
+                else:
+                    sent += 1
+        finally:
+            for role in edited_roles.values():
+                try:
+                    await role.edit(mentionable=False)
+                except discord.HTTPException as e:
+                    log.error("Could not make role %s unmentionable again.", role.id, exc_info=e)
+        return sent
 
-                        if mention_str:
-                            if guild_data["live_message_mention"]:
-                                # Stop bad things from happening here...
-                                content = guild_data["live_message_mention"]
-                                content = content.replace(
-                                    "{stream.name}", str(stream.name)
-                                )  # Backwards compatibility
-                                content = content.replace(
-                                    "{stream.display_name}", str(stream.display_name)
-                                )
-                                content = content.replace("{stream}", str(stream.name))
-                                content = content.replace("{mention}", mention_str)
-                            else:
-                                content = _("{mention}, {display_name} is live!").format(
-                                    mention=mention_str,
-                                    display_name=escape(
-                                        str(stream.display_name),
-                                        mass_mentions=True,
-                                        formatting=True,
-                                    ),
-                                )
-                        else:
-                            if guild_data["live_message_nomention"]:
-                                # Stop bad things from happening here...
-                                content = guild_data["live_message_nomention"]
-                                content = content.replace(
-                                    "{stream.name}", str(stream.name)
-                                )  # Backwards compatibility
-                                content = content.replace(
-                                    "{stream.display_name}", str(stream.display_name)
-                                )
-                                content = content.replace("{stream}", str(stream.name))
-                            else:
-                                content = _("{display_name} is live!").format(
-                                    display_name=escape(
-                                        str(stream.display_name),
-                                        mass_mentions=True,
-                                        formatting=True,
-                                    )
-                                )
-                        await self._send_stream_alert(stream, channel, embed, content)
-                        if edited_roles:
-                            for role in edited_roles:
-                                await role.edit(mentionable=False)
-                        await self.save_streams()
-            except Exception as e:
-                log.error("An error has occurred with Streams. Please report it.", exc_info=e)
-
-        if to_remove:
-            for stream in to_remove:
-                self.streams.remove(stream)
-            await self.save_streams()
+    @staticmethod
+    def _get_live_message(stream: Stream, guild_data: dict, mention_str: str) -> str:
+        if mention_str:
+            if guild_data["live_message_mention"]:
+                # Stop bad things from happening here...
+                content = guild_data["live_message_mention"]
+                content = content.replace(
+                    "{stream.name}", str(stream.name)
+                )  # Backwards compatibility
+                content = content.replace("{stream.display_name}", str(stream.display_name))
+                content = content.replace("{stream}", str(stream.name))
+                content = content.replace("{mention}", mention_str)
+            else:
+                content = _("{mention}, {display_name} is live!").format(
+                    mention=mention_str,
+                    display_name=escape(
+                        str(stream.display_name),
+                        mass_mentions=True,
+                        formatting=True,
+                    ),
+                )
+        else:
+            if guild_data["live_message_nomention"]:
+                # Stop bad things from happening here...
+                content = guild_data["live_message_nomention"]
+                content = content.replace(
+                    "{stream.name}", str(stream.name)
+                )  # Backwards compatibility
+                content = content.replace("{stream.display_name}", str(stream.display_name))
+                content = content.replace("{stream}", str(stream.name))
+            else:
+                content = _("{display_name} is live!").format(
+                    display_name=escape(
+                        str(stream.display_name),
+                        mass_mentions=True,
+                        formatting=True,
+                    )
+                )
+        return content
 
     async def _get_mention_str(
         self,
         guild: discord.Guild,
         channel: Union[discord.TextChannel, discord.VoiceChannel, discord.StageChannel],
         guild_data: dict,
+        mention_role_ids: Optional[Set[int]] = None,
     ) -> Tuple[str, List[discord.Role]]:
         """Returns a 2-tuple with the string containing the mentions, and a list of
         all roles which need to have their `mentionable` property set back to False.
+
+        ``mention_role_ids`` can be given the IDs of the roles set to be mentioned,
+        so that they don't have to be read from Config for each of the guild's roles.
         """
         mentions = []
         edited_roles = []
@@ -969,7 +1138,11 @@ class Streams(commands.Cog):
         can_manage_roles = guild.me.guild_permissions.manage_roles
         can_mention_everyone = channel.permissions_for(guild.me).mention_everyone
         for role in guild.roles:
-            if await self.config.role(role).mention():
+            if mention_role_ids is not None:
+                mention = role.id in mention_role_ids
+            else:
+                mention = await self.config.role(role).mention()
+            if mention:
                 if not can_mention_everyone and can_manage_roles and not role.mentionable:
                     try:
                         await role.edit(mentionable=True)
@@ -1008,11 +1181,13 @@ class Streams(commands.Cog):
                 if _class.__name__ == "TwitchStream":
                     raw_stream["token"] = token.get("client_id")
                     raw_stream["bearer"] = self.ttv_bearer_cache.get("access_token", None)
+                    raw_stream["rate_limit"] = self.ttv_rate_limit
                 else:
                     if _class.__name__ == "YoutubeStream":
                         raw_stream["config"] = self.config
                     raw_stream["token"] = token
             raw_stream["_bot"] = self.bot
+            raw_stream["client"] = self.http_client
             streams.append(_class(**raw_stream))
 
         return streams
@@ -1024,6 +1199,7 @@ class Streams(commands.Cog):
 
         await self.config.streams.set(raw_streams)
 
-    def cog_unload(self):
+    async def cog_unload(self):
         if self.task:
             self.task.cancel()
+        await self.http_client.close()
@@ -8,11 +8,12 @@ from random import choice
 from string import ascii_letters
 from datetime import datetime, timedelta, timezone
 import xml.etree.ElementTree as ET
-from typing import ClassVar, Optional, List, Tuple
+from typing import ClassVar, Dict, Iterable, Optional, List, Tuple
 
 import aiohttp
 import discord
 
+from .http_client import StreamsHTTPClient
 from .errors import (
     APIError,
     OfflineStream,
@@ -28,6 +29,8 @@ TWITCH_BASE_URL = "https://api.twitch.tv"
 TWITCH_ID_ENDPOINT = TWITCH_BASE_URL + "/helix/users"
 TWITCH_STREAMS_ENDPOINT = TWITCH_BASE_URL + "/helix/streams/"
 TWITCH_FOLLOWS_ENDPOINT = TWITCH_BASE_URL + "/helix/channels/followers"
+# the most user IDs the streams endpoint takes in one request
+TWITCH_STREAMS_BATCH_SIZE = 100
 
 YOUTUBE_BASE_URL = "https://www.googleapis.com/youtube/v3"
 YOUTUBE_CHANNELS_ENDPOINT = YOUTUBE_BASE_URL + "/channels"
@@ -53,12 +56,122 @@ def get_video_ids_from_feed(feed):
             yield i.text
 
 
+class TwitchRateLimit:
+    """Keeps track of the Twitch API's rate limit from the ``Ratelimit-*`` response headers.
+
+    The rate limit applies to everything requested with a client ID,
+    so the same instance should be used for all of those requests.
+    """
+
+    def __init__(self):
+        self.resets: set = set()
+        self.remaining: int = 0
+
+    async def wait(self) -> None:
+        """Check rate limits in response header and ensure we're following them.
+
+        From python-twitch-client and adapted to asyncio from Trusty-cogs:
+        https://github.com/tsifrer/python-twitch-client/blob/master/twitch/helix/base.py
+        https://github.com/TrustyJAID/Trusty-cogs/blob/master/twitch/twitch_api.py
+        """
+        current_time = int(time.time())
+        self.resets = {x for x in self.resets if x > current_time}
+
+        if self.remaining == 0:
+            if self.resets:
+                reset_time = next(iter(self.resets))
+                # Calculate wait time and add 0.1s to the wait time to allow Twitch to reset
+                # their counter
+                wait_time = reset_time - current_time + 0.1
+                await asyncio.sleep(wait_time)
+
+
+async def get_twitch_data(
+    session: aiohttp.ClientSession,
+    url: str,
+    params,
+    *,
+    client_id: Optional[str],
+    bearer: Optional[str],
+    rate_limit: TwitchRateLimit,
+) -> Tuple[Optional[int], dict]:
+    header = {"Client-ID": str(client_id)}
+    if bearer is not None:
+        header["Authorization"] = f"Bearer {bearer}"
+    await rate_limit.wait()
+    try:
+        async with session.get(url, headers=header, params=params, timeout=60) as resp:
+            remaining = resp.headers.get("Ratelimit-Remaining")
+            if remaining:
+                rate_limit.remaining = int(remaining)
+            reset = resp.headers.get("Ratelimit-Reset")
+            if reset:
+                rate_limit.resets.add(int(reset))
+
+            if resp.status == 429:
+                log.info("Ratelimited. Trying again at %s.", datetime.fromtimestamp(int(reset)))
+                resp.release()
+                return await get_twitch_data(
+                    session, url, params, client_id=client_id, bearer=bearer, rate_limit=rate_limit
+                )
+
+            if resp.status != 200:
+                return resp.status, {}
+
+            return resp.status, await resp.json(encoding="utf-8")
+    except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as exc:
+        log.warning("Connection error occurred when fetching Twitch stream", exc_info=exc)
+        return None, {}
+
+
+async def get_twitch_streams_data(
+    session: aiohttp.ClientSession,
+    user_ids: Iterable[str],
+    *,
+    client_id: Optional[str],
+    bearer: Optional[str],
+    rate_limit: TwitchRateLimit,
+) -> Dict[str, Tuple[Optional[int], dict]]:
+    """Get the streams of many Twitch users, with one request for every 100 of them.
+
+    Returns
+    -------
+    Dict[str, Tuple[Optional[int], dict]]
+        The response for each of the user IDs, in the form a request
+        for only that user would have given it. These can be passed
+        to `TwitchStream.is_online()`.
+    """
+    user_ids = list(dict.fromkeys(user_ids))
+    responses = {}
+    for start in range(0, len(user_ids), TWITCH_STREAMS_BATCH_SIZE):
+        batch = user_ids[start : start + TWITCH_STREAMS_BATCH_SIZE]
+        params = [("user_id", user_id) for user_id in batch]
+        params.append(("first", str(len(batch))))
+        code, data = await get_twitch_data(
+            session,
+            TWITCH_STREAMS_ENDPOINT,
+            params,
+            client_id=client_id,
+            bearer=bearer,
+            rate_limit=rate_limit,
+        )
+        if code != 200:
+            for user_id in batch:
+                responses[user_id] = (code, data)
+            continue
+        live = {stream_data["user_id"]: stream_data for stream_data in data["data"]}
+        for user_id in batch:
+            responses[user_id] = (code, {"data": [live[user_id]] if user_id in live else []})
+    return responses
+
+
 class Stream:
     token_name: ClassVar[Optional[str]] = None
     platform_name: ClassVar[Optional[str]] = None
 
     def __init__(self, **kwargs):
         self._bot = kwargs.pop("_bot")
+        self._client: StreamsHTTPClient = kwargs.pop("client")
         self.name = kwargs.pop("name", None)
         self.channels = kwargs.pop("channels", [])
         # self.already_online = kwargs.pop("already_online", False)
@@ -126,11 +239,10 @@ class YoutubeStream(Stream):
         elif not self.name:
             self.name = await self.fetch_name()
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(YOUTUBE_CHANNEL_RSS.format(channel_id=self.id)) as r:
-                if r.status == 404:
-                    raise StreamNotFound()
-                rssdata = await r.text()
+        r = await self._client.get(YOUTUBE_CHANNEL_RSS.format(channel_id=self.id), cache=True)
+        if r.status == 404:
+            raise StreamNotFound()
+        rssdata = r.text
 
         # Reset the retry count since we successfully got information about this
         # channel's streams
@@ -152,47 +264,46 @@ class YoutubeStream(Stream):
                 "id": video_id,
                 "part": "id,liveStreamingDetails",
             }
-            async with aiohttp.ClientSession() as session:
-                async with session.get(YOUTUBE_VIDEOS_ENDPOINT, params=params) as r:
-                    data = await r.json()
-                    try:
-                        self._check_api_errors(data)
-                    except InvalidYoutubeCredentials:
-                        log.error("The YouTube API key is either invalid or has not been set.")
-                        break
-                    except YoutubeQuotaExceeded:
-                        log.error("YouTube quota has been exceeded.")
-                        break
-                    except APIError as e:
-                        log.error(
-                            "Something went wrong whilst trying to"
-                            " contact the stream service's API.\n"
-                            "Raw response data:\n%r",
-                            e,
-                        )
+            r = await self._client.get(YOUTUBE_VIDEOS_ENDPOINT, params=params, cache=True)
+            data = r.json()
+            try:
+                self._check_api_errors(data)
+            except InvalidYoutubeCredentials:
+                log.error("The YouTube API key is either invalid or has not been set.")
+                break
+            except YoutubeQuotaExceeded:
+                log.error("YouTube quota has been exceeded.")
+                break
+            except APIError as e:
+                log.error(
+                    "Something went wrong whilst trying to"
+                    " contact the stream service's API.\n"
+                    "Raw response data:\n%r",
+                    e,
+                )
+                continue
+            video_data = data.get("items", [{}])[0]
+            stream_data = video_data.get("liveStreamingDetails", {})
+            log.debug(f"stream_data for {video_id}: {stream_data}")
+            if (
+                stream_data
+                and stream_data != "None"
+                and stream_data.get("actualEndTime", None) is None
+            ):
+                actual_start_time = stream_data.get("actualStartTime", None)
+                scheduled = stream_data.get("scheduledStartTime", None)
+                if scheduled is not None and actual_start_time is None:
+                    scheduled = parse_time(scheduled)
+                    if (scheduled - datetime.now(timezone.utc)).total_seconds() < -3600:
                         continue
-                    video_data = data.get("items", [{}])[0]
-                    stream_data = video_data.get("liveStreamingDetails", {})
-                    log.debug(f"stream_data for {video_id}: {stream_data}")
-                    if (
-                        stream_data
-                        and stream_data != "None"
-                        and stream_data.get("actualEndTime", None) is None
-                    ):
-                        actual_start_time = stream_data.get("actualStartTime", None)
-                        scheduled = stream_data.get("scheduledStartTime", None)
-                        if scheduled is not None and actual_start_time is None:
-                            scheduled = parse_time(scheduled)
-                            if (scheduled - datetime.now(timezone.utc)).total_seconds() < -3600:
-                                continue
-                        elif actual_start_time is None:
-                            continue
-                        if video_id not in self.livestreams:
-                            self.livestreams.append(video_id)
-                    else:
-                        self.not_livestreams.append(video_id)
-                        if video_id in self.livestreams:
-                            self.livestreams.remove(video_id)
+                elif actual_start_time is None:
+                    continue
+                if video_id not in self.livestreams:
+                    self.livestreams.append(video_id)
+            else:
+                self.not_livestreams.append(video_id)
+                if video_id in self.livestreams:
+                    self.livestreams.remove(video_id)
         log.debug(f"livestreams for {self.name}: {self.livestreams}")
         log.debug(f"not_livestreams for {self.name}: {self.not_livestreams}")
         # This is technically redundant since we have the
@@ -204,10 +315,8 @@ class YoutubeStream(Stream):
                 "id": self.livestreams[-1],
                 "part": "snippet,liveStreamingDetails",
             }
-            async with aiohttp.ClientSession() as session:
-                async with session.get(YOUTUBE_VIDEOS_ENDPOINT, params=params) as r:
-                    data = await r.json()
-            return await self.make_embed(data)
+            r = await self._client.get(YOUTUBE_VIDEOS_ENDPOINT, params=params, cache=True)
+            return await self.make_embed(r.json())
         raise OfflineStream()
 
     async def make_embed(self, data):
@@ -268,9 +377,8 @@ class YoutubeStream(Stream):
         else:
             params["id"] = self.id
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(YOUTUBE_CHANNELS_ENDPOINT, params=params) as r:
-                data = await r.json()
+        r = await self._client.get(YOUTUBE_CHANNELS_ENDPOINT, params=params, cache=True)
+        data = r.json()
 
         self._check_api_errors(data)
         if "items" in data and len(data["items"]) == 0:
@@ -311,8 +419,7 @@ class TwitchStream(Stream):
         self._display_name = None
         self._client_id = kwargs.pop("token", None)
         self._bearer = kwargs.pop("bearer", None)
-        self._rate_limit_resets: set = set()
-        self._rate_limit_remaining: int = 0
+        self._rate_limit: TwitchRateLimit = kwargs.pop("rate_limit", None) or TwitchRateLimit()
         super().__init__(**kwargs)
 
     @property
@@ -324,61 +431,34 @@ class TwitchStream(Stream):
         self._display_name = value
 
     async def wait_for_rate_limit_reset(self) -> None:
-        """Check rate limits in response header and ensure we're following them.
-
-        From python-twitch-client and adapted to asyncio from Trusty-cogs:
-        https://github.com/tsifrer/python-twitch-client/blob/master/twitch/helix/base.py
-        https://github.com/TrustyJAID/Trusty-cogs/blob/master/twitch/twitch_api.py
-        """
-        current_time = int(time.time())
-        self._rate_limit_resets = {x for x in self._rate_limit_resets if x > current_time}
-
-        if self._rate_limit_remaining == 0:
-            if self._rate_limit_resets:
-                reset_time = next(iter(self._rate_limit_resets))
-                # Calculate wait time and add 0.1s to the wait time to allow Twitch to reset
-                # their counter
-                wait_time = reset_time - current_time + 0.1
-                await asyncio.sleep(wait_time)
+        await self._rate_limit.wait()
 
     async def get_data(self, url: str, params: dict = {}) -> Tuple[Optional[int], dict]:
-        header = {"Client-ID": str(self._client_id)}
-        if self._bearer is not None:
-            header["Authorization"] = f"Bearer {self._bearer}"
-        await self.wait_for_rate_limit_reset()
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(url, headers=header, params=params, timeout=60) as resp:
-                    remaining = resp.headers.get("Ratelimit-Remaining")
-                    if remaining:
-                        self._rate_limit_remaining = int(remaining)
-                    reset = resp.headers.get("Ratelimit-Reset")
-                    if reset:
-                        self._rate_limit_resets.add(int(reset))
-
-                    if resp.status == 429:
-                        log.info(
-                            "Ratelimited. Trying again at %s.", datetime.fromtimestamp(int(reset))
-                        )
-                        resp.release()
-                        return await self.get_data(url)
-
-                    if resp.status != 200:
-                        return resp.status, {}
-
-                    return resp.status, await resp.json(encoding="utf-8")
-            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as exc:
-                log.warning("Connection error occurred when fetching Twitch stream", exc_info=exc)
-                return None, {}
+        return await get_twitch_data(
+            self._client.session,
+            url,
+            params,
+            client_id=self._client_id,
+            bearer=self._bearer,
+            rate_limit=self._rate_limit,
+        )
 
-    async def is_online(self):
+    async def is_online(self, stream_response: Optional[Tuple[Optional[int], dict]] = None):
+        """Check if the stream is online.
+
+        ``stream_response`` can be given the stream's response from
+        `get_twitch_streams_data()`, so that it isn't requested again.
+        """
         user_profile_data = None
         if self.id is None:
             user_profile_data = await self._fetch_user_profile()
 
-        stream_code, stream_data = await self.get_data(
-            TWITCH_STREAMS_ENDPOINT, {"user_id": self.id}
-        )
+        if stream_response is None:
+            stream_code, stream_data = await self.get_data(
+                TWITCH_STREAMS_ENDPOINT, {"user_id": self.id}
+            )
+        else:
+            stream_code, stream_data = stream_response
         if stream_code == 200:
             if not stream_data["data"]:
                 raise OfflineStream()
@@ -468,9 +548,8 @@ class PicartoStream(Stream):
     async def is_online(self):
         url = "https://api.picarto.tv/api/v1/channel/name/" + self.name
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as r:
-                data = await r.text(encoding="utf-8")
+        r = await self._client.get(url, cache=True)
+        data = r.text
         if r.status == 200:
             data = json.loads(data)
             # Reset the retry count since we successfully got information about this
@@ -0,0 +1,171 @@
+import os
+import pathlib
+import pickle
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+from uuid import uuid4
+
+from .log import LOG
+
+__all__ = ("TriviaListStore",)
+
+# Bump this whenever the format of the compiled index changes.
+INDEX_VERSION = 1
+
+
+class _CompiledList(NamedTuple):
+    mtime_ns: int
+    size: int
+    data: Dict[str, Any]
+
+
+class TriviaListStore:
+    """
+    Finds the trivia lists and keeps them parsed.
+
+    Parsing a list's YAML is slow, so the parsed lists are kept in memory
+    and in a compiled index on disk, so that they don't have to be parsed again
+    on the next load. A list is parsed again once its file's modification time
+    or size changes.
+
+    The map from categories to list paths is only rebuilt once the modification
+    time of one of the list directories changes, i.e. when a list is added,
+    renamed or removed.
+
+    Parameters
+    ----------
+    list_dirs : Iterable[pathlib.Path]
+        The directories with the lists. When a category is in more than one
+        of them, the list in the directory that comes first is used.
+    index_path : pathlib.Path
+        The path of the compiled index.
+    loader : Callable[[pathlib.Path], Dict[str, Any]]
+        The function which parses and validates a list's file.
+    """
+
+    def __init__(
+        self,
+        list_dirs: Iterable[pathlib.Path],
+        index_path: pathlib.Path,
+        loader: Callable[[pathlib.Path], Dict[str, Any]],
+    ):
+        self.list_dirs = tuple(path.resolve() for path in list_dirs)
+        self._index_path = index_path
+        self._loader = loader
+        self._dir_mtimes: Optional[Tuple[int, ...]] = None
+        self._paths: Dict[str, pathlib.Path] = {}
+        # keyed by the list's path
+        self._lists: Dict[str, _CompiledList] = {}
+
+    def load(self) -> None:
+        """
+        Load the compiled index and compile the lists which changed since it was saved.
+
+        This does blocking IO, so it should be run in an executor.
+        """
+        self._lists = self._read_index()
+        paths = self.paths().values()
+        changed = len(self._lists) != len(paths)
+        for path in paths:
+            try:
+                changed |= self._get_compiled(path)[1]
+            except Exception:
+                # invalid lists aren't compiled; getting them raises the error again
+                pass
+        if changed:
+            self.save()
+
+    def save(self) -> None:
+        """Save the compiled index, leaving out the lists which no longer exist."""
+        paths = {str(path) for path in self.paths().values()}
+        self._lists = {key: value for key, value in self._lists.items() if key in paths}
+        tmp_path = self._index_path.with_name(f"{self._index_path.name}-{uuid4().hex}.tmp")
+        try:
+            with tmp_path.open("wb") as fp:
+                pickle.dump(
+                    {"version": INDEX_VERSION, "lists": self._lists}, fp, pickle.HIGHEST_PROTOCOL
+                )
+            tmp_path.replace(self._index_path)
+        except OSError:
+            LOG.exception("Could not save the compiled trivia lists to %s", self._index_path)
+            tmp_path.unlink(missing_ok=True)
+
+    def invalidate(self) -> None:
+        """Rebuild the map from categories to list paths on its next use."""
+        self._dir_mtimes = None
+
+    def paths(self) -> Dict[str, pathlib.Path]:
+        """
+        Get the map from categories to the paths of their lists.
+
+        The returned dict must not be modified.
+        """
+        dir_mtimes = tuple(_mtime_ns(path) for path in self.list_dirs)
+        if dir_mtimes != self._dir_mtimes:
+            paths = {}
+            for directory in reversed(self.list_dirs):
+                paths.update((path.stem, path) for path in directory.glob("*.yaml"))
+            self._paths = paths
+            self._dir_mtimes = dir_mtimes
+        return self._paths
+
+    def get(self, category: str) -> Dict[str, Any]:
+        """
+        Get the trivia list of the given category.
+
+        Parameters
+        ----------
+        category : str
+            The category. Case sensitive.
+
+        Returns
+        -------
+        Dict[str, Any]
+            A copy of the parsed list.
+
+        Raises
+        ------
+        FileNotFoundError
+            There's no list for the category.
+        """
+        path = self.paths().get(category)
+        if path is None:
+            raise FileNotFoundError("Could not find the `{}` category.".format(category))
+        compiled, changed = self._get_compiled(path)
+        if changed:
+            self.save()
+        return dict(compiled.data)
+
+    def _get_compiled(self, path: pathlib.Path) -> Tuple[_CompiledList, bool]:
+        stat = path.stat()
+        key = str(path)
+        compiled = self._lists.get(key)
+        if (
+            compiled is not None
+            and compiled.mtime_ns == stat.st_mtime_ns
+            and compiled.size == stat.st_size
+        ):
+            return compiled, False
+        compiled = self._lists[key] = _CompiledList(
+            stat.st_mtime_ns, stat.st_size, self._loader(path)
+        )
+        return compiled, True
+
+    def _read_index(self) -> Dict[str, _CompiledList]:
+        try:
+            with self._index_path.open("rb") as fp:
+                index = pickle.load(fp)
+        except FileNotFoundError:
+            return {}
+        except Exception:
+            LOG.warning("The compiled trivia lists are corrupted and will be rebuilt.")
+            return {}
+        if not isinstance(index, dict) or index.get("version") != INDEX_VERSION:
+            return {}
+        return index["lists"]
+
+
+def _mtime_ns(path: pathlib.Path) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return -1
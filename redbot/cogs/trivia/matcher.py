@@ -0,0 +1,39 @@
+import re
+from typing import FrozenSet, Iterable, Optional, Pattern
+
+from redbot.core.utils.common_filters import normalize_smartquotes
+
+__all__ = ("AnswerMatcher",)
+
+
+class AnswerMatcher:
+    """
+    Checks whether a guess contains any of a question's answers.
+
+    Matching is case-insensitive and ignores the difference between smart
+    and plain quotes in the guess. An answer of one word only matches
+    a whole word of the guess, while an answer with a space in it matches
+    anywhere in the guess (see issue #331).
+
+    The answers are compiled once per question: the single-word answers
+    into a set which the guess's words are looked up in, and the others
+    into a single regex, so a guess is split and scanned only once
+    however many answers there are.
+    """
+
+    __slots__ = ("_words", "_phrases")
+
+    def __init__(self, answers: Iterable[str]):
+        answers = {answer.lower() for answer in answers}
+        self._words: FrozenSet[str] = frozenset(a for a in answers if " " not in a)
+        phrases = [a for a in answers if " " in a]
+        self._phrases: Optional[Pattern[str]] = (
+            re.compile("|".join(map(re.escape, phrases))) if phrases else None
+        )
+
+    def matches(self, guess: str) -> bool:
+        """Check whether ``guess`` contains any of the answers."""
+        guess = normalize_smartquotes(guess.lower())
+        if self._words and not self._words.isdisjoint(guess.split(" ")):
+            return True
+        return self._phrases is not None and self._phrases.search(guess) is not None
@@ -7,9 +7,9 @@ import discord
 from redbot.core import bank, errors
 from redbot.core.i18n import Translator
 from redbot.core.utils.chat_formatting import box, bold, humanize_list, humanize_number
-from redbot.core.utils.common_filters import normalize_smartquotes
 from .converters import MAX_VALUE
 from .log import LOG
+from .matcher import AnswerMatcher
 
 __all__ = ["TriviaSession"]
 
@@ -204,8 +204,8 @@ class TriviaSession:
 
         """
         try:
-            message = await self.ctx.bot.wait_for(
-                "message", check=self.check_answer(answers), timeout=delay
+            message = await self.ctx.bot.wait_for_message(
+                channel=self.ctx.channel, check=self.check_answer(answers), timeout=delay
             )
         except asyncio.TimeoutError:
             if time.time() - self._last_response >= timeout:
@@ -247,7 +247,7 @@ class TriviaSession:
             The message predicate.
 
         """
-        answers = tuple(s.lower() for s in answers)
+        matcher = AnswerMatcher(answers)
 
         def _pred(message: discord.Message):
             early_exit = (
@@ -257,15 +257,7 @@ class TriviaSession:
                 return False
 
             self._last_response = time.time()
-            guess = message.content.lower()
-            guess = normalize_smartquotes(guess)
-            for answer in answers:
-                if " " in answer and answer in guess:
-                    # Exact matching, issue #331
-                    return True
-                elif any(word == answer for word in guess.split(" ")):
-                    return True
-            return False
+            return matcher.matches(message.content)
 
         return _pred
 
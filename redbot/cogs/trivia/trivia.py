@@ -14,13 +14,14 @@ from redbot.core import Config, commands, bank
 from redbot.core.bot import Red
 from redbot.core.data_manager import cog_data_path
 from redbot.core.i18n import Translator, cog_i18n
-from redbot.core.utils import AsyncIter, can_user_react_in
+from redbot.core.utils import can_user_react_in
 from redbot.core.utils.chat_formatting import box, pagify, bold, inline, italics, humanize_number
 from redbot.core.utils.menus import start_adding_reactions
 from redbot.core.utils.predicates import MessagePredicate, ReactionPredicate
 
 from .checks import trivia_stop_check
 from .converters import finite_float
+from .list_store import TriviaListStore
 from .log import LOG
 from .session import TriviaSession
 from .schema import TRIVIA_LIST_SCHEMA, format_schema_error
@@ -30,6 +31,7 @@ __all__ = ("Trivia", "UNIQUE_ID", "InvalidListError", "get_core_lists", "get_lis
 UNIQUE_ID = 0xB3C0E453
 _ = Translator("Trivia", __file__)
 YAMLSafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+CORE_LISTS_PATH = pathlib.Path(__file__).parent.resolve() / "data/lists"
 
 
 class InvalidListError(Exception):
@@ -93,6 +95,16 @@ class Trivia(commands.Cog):
 
         self.config.register_member(wins=0, games=0, total_score=0)
 
+        self._custom_lists_path = cog_data_path(self).resolve()
+        self._list_store = TriviaListStore(
+            (self._custom_lists_path, CORE_LISTS_PATH),
+            self._custom_lists_path / "compiled_lists.pickle",
+            get_list,
+        )
+
+    async def cog_load(self) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, self._list_store.load)
+
     async def red_delete_data_for_user(
         self,
         *,
@@ -102,10 +114,8 @@ class Trivia(commands.Cog):
         if requester != "discord_deleted_user":
             return
 
-        all_members = await self.config.all_members()
-
-        async for guild_id, guild_data in AsyncIter(all_members.items(), steps=100):
-            if user_id in guild_data:
+        async for guild_id, member_id, _ in self.config.iter_members(fields=()):
+            if member_id == user_id:
                 await self.config.member_from_ids(guild_id, user_id).clear()
 
     @commands.group()
@@ -244,7 +254,7 @@ class Trivia(commands.Cog):
     @triviaset_custom.command(name="list")
     async def custom_trivia_list(self, ctx: commands.Context):
         """List uploaded custom trivia."""
-        personal_lists = sorted([p.resolve().stem for p in cog_data_path(self).glob("*.yaml")])
+        personal_lists = sorted(self._custom_list_categories())
         no_lists_uploaded = _("No custom Trivia lists uploaded.")
 
         if not personal_lists:
@@ -318,6 +328,7 @@ class Trivia(commands.Cog):
         filepath = cog_data_path(self) / f"{name}.yaml"
         if filepath.exists():
             filepath.unlink()
+            self._list_store.invalidate()
             await ctx.send(_("Trivia {filename} was deleted.").format(filename=filepath.stem))
         else:
             await ctx.send(_("Trivia file was not found."))
@@ -392,7 +403,7 @@ class Trivia(commands.Cog):
     @trivia.command(name="list")
     async def trivia_list(self, ctx: commands.Context):
         """List available trivia categories."""
-        lists = set(p.stem for p in self._all_lists())
+        lists = self._list_store.paths().keys()
         if await ctx.embed_requested():
             await ctx.send(
                 embed=discord.Embed(
@@ -440,9 +451,7 @@ class Trivia(commands.Cog):
         embed.add_field(name=_("Question count"), value=len(data))
         embed.add_field(
             name=_("Custom"),
-            value=_format_setting_value(
-                "", any(category == p.resolve().stem for p in cog_data_path(self).glob("*.yaml"))
-            ),
+            value=_format_setting_value("", category in self._custom_list_categories()),
         )
         embed.add_field(
             name=_("Description"),
@@ -693,12 +702,7 @@ class Trivia(commands.Cog):
             A dict mapping questions (`str`) to answers (`list` of `str`).
 
         """
-        try:
-            path = next(p for p in self._all_lists() if p.stem == category)
-        except StopIteration:
-            raise FileNotFoundError("Could not find the `{}` category.".format(category))
-
-        return get_list(path)
+        return self._list_store.get(category)
 
     async def _save_trivia_list(
         self, ctx: commands.Context, attachment: discord.Attachment
@@ -767,6 +771,7 @@ class Trivia(commands.Cog):
         try:
             with file.open("wb") as fp:
                 fp.write(buffer.read())
+            self._list_store.invalidate()
         except FileNotFoundError as e:
             await ctx.send(
                 _(
@@ -788,10 +793,12 @@ class Trivia(commands.Cog):
             (session for session in self.trivia_sessions if session.ctx.channel == channel), None
         )
 
-    def _all_lists(self) -> List[pathlib.Path]:
-        personal_lists = [p.resolve() for p in cog_data_path(self).glob("*.yaml")]
-
-        return personal_lists + get_core_lists()
+    def _custom_list_categories(self) -> List[str]:
+        return [
+            category
+            for category, path in self._list_store.paths().items()
+            if path.parent == self._custom_lists_path
+        ]
 
     def cog_unload(self):
         for session in self.trivia_sessions:
@@ -800,8 +807,7 @@ class Trivia(commands.Cog):
 
 def get_core_lists() -> List[pathlib.Path]:
     """Return a list of paths for all trivia lists packaged with the bot."""
-    core_lists_path = pathlib.Path(__file__).parent.resolve() / "data/lists"
-    return list(core_lists_path.glob("*.yaml"))
+    return list(CORE_LISTS_PATH.glob("*.yaml"))
 
 
 def get_list(path: pathlib.Path, *, validate_schema: bool = True) -> Dict[str, Any]:
@@ -17,7 +17,6 @@ from redbot.core import Config, commands, modlog
 from redbot.core.bot import Red
 from redbot.core.commands import UserInputOptional, RawUserIdConverter
 from redbot.core.i18n import Translator, cog_i18n
-from redbot.core.utils import AsyncIter
 from redbot.core.utils.views import ConfirmView
 from redbot.core.utils.chat_formatting import warning, pagify
 from redbot.core.utils.menus import menu
@@ -61,31 +60,23 @@ class Warnings(commands.Cog):
         if requester != "discord_deleted_user":
             return
 
-        all_members = await self.config.all_members()
-
         c = 0
 
-        for guild_id, guild_data in all_members.items():
-            c += 1
-            if not c % 100:
-                await asyncio.sleep(0)
-
-            if user_id in guild_data:
+        async for guild_id, member_id, member_data in self.config.iter_members(
+            fields=("warnings",), read_only=True
+        ):
+            if member_id == user_id:
                 await self.config.member_from_ids(guild_id, user_id).clear()
+                continue
 
-            for remaining_user, user_warns in guild_data.items():
+            for warn_id, warning in member_data["warnings"].items():
                 c += 1
                 if not c % 100:
                     await asyncio.sleep(0)
 
-                for warn_id, warning in user_warns.get("warnings", {}).items():
-                    c += 1
-                    if not c % 100:
-                        await asyncio.sleep(0)
-
-                    if warning.get("mod", 0) == user_id:
-                        grp = self.config.member_from_ids(guild_id, remaining_user)
-                        await grp.set_raw("warnings", warn_id, "mod", value=0xDE1)
+                if warning.get("mod", 0) == user_id:
+                    grp = self.config.member_from_ids(guild_id, member_id)
+                    await grp.set_raw("warnings", warn_id, "mod", value=0xDE1)
 
     # We're not utilising modlog yet - no need to register a casetype
     @staticmethod
@@ -2,7 +2,7 @@ import enum
 from typing import Optional, Type
 
 from .. import data_manager
-from .base import IdentifierData, BaseDriver, ConfigCategory
+from .base import IdentifierData, BaseDriver, ConfigCategory, FrozenDict, FrozenList, freeze
 from .json import JsonDriver
 from .postgres import PostgresDriver
 
@@ -11,6 +11,9 @@ __all__ = [
     "ConfigCategory",
     "IdentifierData",
     "BaseDriver",
+    "FrozenDict",
+    "FrozenList",
+    "freeze",
     "JsonDriver",
     "PostgresDriver",
     "BackendType",
@@ -5,7 +5,18 @@ import contextlib
 import itertools
 import re
 from getpass import getpass
-from typing import Match, Pattern, Tuple, Optional, AsyncIterator, Any, Dict, Iterator, List
+from typing import (
+    Match,
+    Pattern,
+    Tuple,
+    Optional,
+    AsyncIterator,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Sequence,
+)
 from urllib.parse import quote_plus
 
 try:
@@ -18,7 +29,7 @@ except ModuleNotFoundError:
     pymongo = None
 
 from .. import errors
-from .base import BaseDriver, IdentifierData
+from .base import BaseDriver, IdentifierData, freeze
 
 __all__ = ["MongoDriver"]
 
@@ -176,6 +187,27 @@ class MongoDriver(BaseDriver):
             return self._unescape_dict_keys(partial)
         return partial
 
+    async def iter_entries(
+        self,
+        identifier_data: IdentifierData,
+        fields: Optional[Sequence[str]] = None,
+        *,
+        read_only: bool = False,
+    ) -> AsyncIterator[Tuple[Tuple[str, ...], Any]]:
+        mongo_collection = self.get_collection(identifier_data.category)
+        pkey_filter = self.generate_primary_key_filter(identifier_data)
+        pkey_len = identifier_data.primary_key_len
+        # Only whole documents are entries, not data stored above them.
+        pkey_filter[f"_id.RED_primary_key.{pkey_len - 1}"] = {"$exists": True}
+        proj = None
+        if fields is not None:
+            proj = {"_id": True, **{self._escape_key(k): True for k in fields}}
+        async for doc in mongo_collection.find(filter=pkey_filter, projection=proj):
+            pkeys = tuple(doc["_id"]["RED_primary_key"][len(identifier_data.primary_key) :])
+            del doc["_id"]
+            doc = self._unescape_dict_keys(doc)
+            yield pkeys, freeze(doc) if read_only else doc
+
     async def set(self, identifier_data: IdentifierData, value=None):
         uuid = self._escape_key(identifier_data.uuid)
         primary_key = list(map(self._escape_key, self.get_primary_key(identifier_data)))
@@ -1,12 +1,26 @@
 import abc
+import collections.abc
 import enum
-from typing import Tuple, Dict, Any, Union, List, AsyncIterator, Type
+from typing import (
+    Tuple,
+    Dict,
+    Any,
+    ClassVar,
+    Iterator,
+    Optional,
+    Union,
+    List,
+    AsyncIterator,
+    Sequence,
+    Type,
+)
 
 import rich.progress
 
 from redbot.core.utils._internal_utils import RichIndefiniteBarColumn
+from .. import errors
 
-__all__ = ["BaseDriver", "IdentifierData", "ConfigCategory"]
+__all__ = ["BaseDriver", "IdentifierData", "ConfigCategory", "FrozenDict", "FrozenList", "freeze"]
 
 
 class ConfigCategory(str, enum.Enum):
@@ -51,6 +65,122 @@ _CATEGORY_PKEY_COUNTS = {
 }
 
 
+class FrozenDict(collections.abc.Mapping):
+    """A read-only view over a `dict` of stored data.
+
+    Nested `dict` and `list` values are wrapped in read-only views as
+    they are accessed, so nothing is copied up front.
+
+    When ``defaults`` is given, keys missing from the data are looked up
+    in it instead. With ``nested`` set, this also applies to sub-dicts,
+    which mirrors `Group.nested_update`; otherwise only the top level
+    falls back to defaults, which mirrors the ``all_*`` methods of `Config`.
+
+    Views of nested values keep a reference to the view they came from
+    (the ``owner``), so drivers can tell when data is no longer viewed.
+    """
+
+    __slots__ = ("_data", "_defaults", "_nested", "_owner", "__weakref__")
+
+    def __init__(
+        self,
+        data: Dict[str, Any],
+        defaults: Optional[Dict[str, Any]] = None,
+        *,
+        nested: bool = True,
+        owner: Optional[object] = None,
+    ):
+        self._data = data
+        self._defaults = defaults
+        self._nested = nested
+        self._owner = owner
+
+    def with_defaults(self, defaults: Dict[str, Any], *, nested: bool = True) -> "FrozenDict":
+        """Get a view over the same data, falling back to the given defaults."""
+        owner = self if self._owner is None else self._owner
+        return FrozenDict(self._data, defaults, nested=nested, owner=owner)
+
+    def items_with_defaults(
+        self, defaults: Dict[str, Any], *, nested: bool = True
+    ) -> Iterator[Tuple[str, "FrozenDict"]]:
+        """Iterate over the dicts in this view, with each falling back to the given defaults.
+
+        This is equivalent to calling `with_defaults` on every value,
+        but avoids creating intermediate views.
+        """
+        owner = self if self._owner is None else self._owner
+        for key, value in self._data.items():
+            yield key, FrozenDict(value, defaults, nested=nested, owner=owner)
+
+    def __getitem__(self, key: str) -> Any:
+        owner = self if self._owner is None else self._owner
+        try:
+            value = self._data[key]
+        except KeyError:
+            if self._defaults is None:
+                raise
+            return freeze(self._defaults[key])
+        if self._nested and self._defaults is not None and isinstance(value, dict):
+            default = self._defaults.get(key)
+            if isinstance(default, dict):
+                return FrozenDict(value, default, owner=owner)
+        return freeze(value, owner=owner)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._data
+        if self._defaults is not None:
+            yield from (k for k in self._defaults if k not in self._data)
+
+    def __len__(self) -> int:
+        if self._defaults is None:
+            return len(self._data)
+        return len(self._data) + sum(1 for k in self._defaults if k not in self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data or (self._defaults is not None and key in self._defaults)
+
+    def __repr__(self) -> str:
+        return f"FrozenDict({dict(self.items())!r})"
+
+
+class FrozenList(collections.abc.Sequence):
+    """A read-only view over a `list` of stored data."""
+
+    __slots__ = ("_data", "_owner")
+
+    def __init__(self, data: List[Any], *, owner: Optional[object] = None):
+        self._data = data
+        self._owner = owner
+
+    def __getitem__(self, index):
+        owner = self if self._owner is None else self._owner
+        if isinstance(index, slice):
+            return FrozenList(self._data[index], owner=owner)
+        return freeze(self._data[index], owner=owner)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (FrozenList, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"FrozenList({list(self)!r})"
+
+
+def freeze(value: Any, *, owner: Optional[object] = None) -> Any:
+    """Wrap the given stored value in a read-only view, if it is mutable."""
+    if isinstance(value, dict):
+        return FrozenDict(value, owner=owner)
+    if isinstance(value, list):
+        return FrozenList(value, owner=owner)
+    return value
+
+
 class IdentifierData:
     def __init__(
         self,
@@ -159,6 +289,9 @@ class IdentifierData:
 
 
 class BaseDriver(abc.ABC):
+    #: Whether this driver implements `fetch_sorted` and `fetch_rank`.
+    can_sort: ClassVar[bool] = False
+
     def __init__(self, cog_name: str, identifier: str, **kwargs):
         self.cog_name = cog_name
         self.unique_cog_identifier = identifier
@@ -222,6 +355,78 @@ class BaseDriver(abc.ABC):
         """
         raise NotImplementedError
 
+    async def get_frozen(self, identifier_data: IdentifierData) -> Any:
+        """
+        Finds the value indicated by the given identifiers, without copying it.
+
+        Mutable values are returned as read-only `FrozenDict` and
+        `FrozenList` views. Drivers which keep data in memory should
+        override this to avoid copying; the default implementation
+        simply wraps the result of `get`.
+
+        Parameters
+        ----------
+        identifier_data
+
+        Returns
+        -------
+        Any
+            Stored value, which must not change after it is returned.
+        """
+        return freeze(await self.get(identifier_data))
+
+    async def iter_entries(
+        self,
+        identifier_data: IdentifierData,
+        fields: Optional[Sequence[str]] = None,
+        *,
+        read_only: bool = False,
+    ) -> AsyncIterator[Tuple[Tuple[str, ...], Any]]:
+        """
+        Iterates over the entries below a partial primary key.
+
+        An entry is the data stored under a full primary key, e.g. a single
+        member's data when iterating over a guild's members.
+        The BaseDriver provides a generic implementation which reads
+        all of the entries at once, and should be overridden by subclasses
+        which can stream them. Those mustn't hold any resource like a database
+        connection while the caller handles an entry, since the caller may write
+        to the same data, or stop iterating early.
+
+        Parameters
+        ----------
+        identifier_data
+            Identifier data with a partial primary key and no identifiers.
+        fields
+            When given, only these top-level keys are included in each entry
+            (those which aren't stored are left out).
+
+        Other Parameters
+        ----------------
+        read_only
+            When ``True``, entries are yielded as read-only views which
+            must not change after being yielded, like `get_frozen`.
+            Otherwise, each entry is a new `dict` owned by the caller.
+
+        Yields
+        ------
+        Tuple[Tuple[str, ...], Any]
+            The rest of each entry's primary key, and its data.
+            Entries which aren't dicts are skipped.
+        """
+        try:
+            data = await (self.get_frozen if read_only else self.get)(identifier_data)
+        except KeyError:
+            return
+        for pkeys, entry in _walk_entries(
+            data, identifier_data.primary_key_len - len(identifier_data.primary_key)
+        ):
+            if fields is not None:
+                entry = {k: entry[k] for k in fields if k in entry}
+                if read_only:
+                    entry = FrozenDict(entry, owner=data)
+            yield pkeys, entry
+
     @abc.abstractmethod
     async def set(self, identifier_data: IdentifierData, value=None) -> None:
         """
@@ -248,6 +453,152 @@ class BaseDriver(abc.ABC):
         """
         raise NotImplementedError
 
+    async def apply_batch(self, changes: Sequence[Tuple[IdentifierData, Tuple[Any, ...]]]) -> None:
+        """
+        Applies several sets and clears at once, in order.
+
+        Either all of the changes should be applied, or none of them.
+        The BaseDriver provides a generic (non-atomic) implementation
+        which applies them one by one, and should be overridden by subclasses.
+
+        Parameters
+        ----------
+        changes
+            Pairs of identifier data and either ``(value,)`` for a set,
+            or ``()`` for a clear.
+
+        Raises
+        ------
+        CannotSetSubfield
+            If one of the sets tried to set a sub-field of something which isn't a dict.
+        """
+        for identifier_data, value in changes:
+            if value:
+                await self.set(identifier_data, value[0])
+            else:
+                await self.clear(identifier_data)
+
+    async def inc(
+        self, identifier_data: IdentifierData, value: Union[int, float], default: Union[int, float]
+    ) -> Union[int, float]:
+        """
+        Increments the number indicated by the given identifiers.
+
+        The BaseDriver provides a generic (non-atomic) implementation
+        which should be overridden by subclasses.
+
+        Parameters
+        ----------
+        identifier_data
+        value : Union[int, float]
+            The amount to increment the number by.
+        default : Union[int, float]
+            The value to increment when nothing is stored yet.
+
+        Returns
+        -------
+        Union[int, float]
+            The new value.
+
+        Raises
+        ------
+        StoredTypeError
+            If the stored value is not a number.
+        """
+        try:
+            existing = await self.get(identifier_data)
+        except KeyError:
+            existing = default
+        result = _inc_value(existing, value)
+        await self.set(identifier_data, result)
+        return result
+
+    async def toggle(self, identifier_data: IdentifierData, default: bool) -> bool:
+        """
+        Toggles the boolean indicated by the given identifiers.
+
+        The BaseDriver provides a generic (non-atomic) implementation
+        which should be overridden by subclasses.
+
+        Parameters
+        ----------
+        identifier_data
+        default : bool
+            The value to toggle when nothing is stored yet.
+
+        Returns
+        -------
+        bool
+            The new value.
+
+        Raises
+        ------
+        StoredTypeError
+            If the stored value is not a boolean.
+        """
+        try:
+            existing = await self.get(identifier_data)
+        except KeyError:
+            existing = default
+        result = _toggle_value(existing)
+        await self.set(identifier_data, result)
+        return result
+
+    async def fetch_sorted(
+        self, identifier_data: IdentifierData, key: str, default: Any, *, limit: Optional[int]
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Gets the entries one level below a partial primary key, sorted by a number.
+
+        Only drivers which can sort in the backend implement this,
+        and set `can_sort` to ``True``.
+
+        Parameters
+        ----------
+        identifier_data
+            Identifier data with a partial primary key and no identifiers.
+        key : str
+            The top-level key of the number to sort by, highest first.
+            Ties are ordered by primary key, numerically for IDs.
+        default : Any
+            The number of entries which don't have ``key``.
+        limit : Optional[int]
+            The maximum number of entries to return.
+
+        Returns
+        -------
+        List[Tuple[str, Dict[str, Any]]]
+            The primary key and data of each entry.
+        """
+        raise NotImplementedError
+
+    async def fetch_rank(
+        self, identifier_data: IdentifierData, key: str, default: Any, pkey: str
+    ) -> Optional[int]:
+        """
+        Gets the 1-based position of an entry in the order given by `fetch_sorted`.
+
+        Only drivers which can sort in the backend implement this,
+        and set `can_sort` to ``True``.
+
+        Parameters
+        ----------
+        identifier_data
+            Identifier data with a partial primary key and no identifiers.
+        key : str
+            The top-level key of the number to sort by.
+        default : Any
+            The number of entries which don't have ``key``.
+        pkey : str
+            The primary key of the entry, one level below ``identifier_data``'s.
+
+        Returns
+        -------
+        Optional[int]
+            The entry's position, or ``None`` if there's no such entry.
+        """
+        raise NotImplementedError
+
     @classmethod
     @abc.abstractmethod
     def aiter_cogs(cls) -> AsyncIterator[Tuple[str, str]]:
@@ -390,3 +741,32 @@ class BaseDriver(abc.ABC):
                     *ConfigCategory.get_pkey_info(category, custom_group_data),
                 )
                 await self.set(ident_data, data)
+
+
+def _walk_entries(
+    data: Any, depth: int, pkeys: Tuple[str, ...] = ()
+) -> Iterator[Tuple[Tuple[str, ...], Any]]:
+    """Iterate over the dicts ``depth`` levels below ``data``, with the keys leading to them."""
+    if not isinstance(data, collections.abc.Mapping):
+        return
+    if depth == 0:
+        yield pkeys, data
+        return
+    for key, value in data.items():
+        yield from _walk_entries(value, depth - 1, pkeys + (key,))
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _inc_value(existing: Any, value: Union[int, float]) -> Union[int, float]:
+    if not _is_number(existing):
+        raise errors.StoredTypeError(f"Cannot increment non-numeric value {existing!r}")
+    return existing + value
+
+
+def _toggle_value(existing: Any) -> bool:
+    if not isinstance(existing, bool):
+        raise errors.StoredTypeError(f"Cannot toggle non-boolean value {existing!r}")
+    return not existing
@@ -1,4 +1,5 @@
 import asyncio
+import contextlib
 import json
 import logging
 import os
@@ -6,11 +7,20 @@ import pickle
 import weakref
 from collections import defaultdict
 from pathlib import Path
-from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple, Union
 from uuid import uuid4
 
 from .. import data_manager, errors
-from .base import BaseDriver, IdentifierData, ConfigCategory
+from .base import (
+    BaseDriver,
+    IdentifierData,
+    ConfigCategory,
+    FrozenDict,
+    freeze,
+    _inc_value,
+    _walk_entries,
+    _toggle_value,
+)
 
 __all__ = ["JsonDriver"]
 
@@ -19,6 +29,18 @@ _shared_datastore = {}
 _driver_counts = {}
 _finalizers = []
 _locks = defaultdict(asyncio.Lock)
+_journals: Dict[str, "_Journal"] = {}
+# Maps cog names to dicts in their data which are viewed by frozen views, keyed by id.
+# Each entry is ``[dict, refcount, inherited]``: the refcount counts live views of the dict,
+# plus copied dicts still sharing it as a child, which are listed in their ``inherited``.
+_frozen_nodes: Dict[str, Dict[int, List[Any]]] = defaultdict(dict)
+
+#: Seconds to buffer journal entries for before writing them out with a single fsync.
+JOURNAL_FLUSH_INTERVAL = 0.25
+#: Journals smaller than this (in bytes) are never compacted into the snapshot.
+JOURNAL_MIN_COMPACT_SIZE = 1024 * 1024
+
+_MISSING = object()
 
 log = logging.getLogger("redbot.json_driver")
 
@@ -30,6 +52,10 @@ def finalize_driver(cog_name):
     _driver_counts[cog_name] -= 1
 
     if _driver_counts[cog_name] == 0:
+        journal = _journals.pop(cog_name, None)
+        if journal is not None:
+            journal.close(_shared_datastore.get(cog_name))
+        _frozen_nodes.pop(cog_name, None)
         if cog_name in _shared_datastore:
             del _shared_datastore[cog_name]
         if cog_name in _locks:
@@ -52,8 +78,18 @@ class JsonDriver(BaseDriver):
     .. py:attribute:: data_path
 
         The path in which to store the file indicated by :py:attr:`file_name`.
+
+    When journaling is enabled (either through the ``journal`` storage detail
+    or the ``journal`` keyword argument), sets and clears are appended to a
+    write-ahead journal next to :py:attr:`data_path` instead of rewriting the
+    whole file. The journal is fsynced in batches every
+    `JOURNAL_FLUSH_INTERVAL` seconds and compacted back into the main file
+    in the background, so up to that many seconds of writes may be lost on
+    a hard crash. Any journal left behind is replayed on load.
     """
 
+    _journal_by_default: bool = False
+
     def __init__(
         self,
         cog_name: str,
@@ -61,6 +97,7 @@ class JsonDriver(BaseDriver):
         *,
         data_path_override: Optional[Path] = None,
         file_name_override: str = "settings.json",
+        journal: Optional[bool] = None,
     ):
         super().__init__(cog_name, identifier)
         self.file_name = file_name_override
@@ -73,11 +110,19 @@ class JsonDriver(BaseDriver):
         self.data_path.mkdir(parents=True, exist_ok=True)
         self.data_path = self.data_path / self.file_name
         self._load_data()
+        if journal is None:
+            journal = self._journal_by_default
+        if journal and cog_name not in _journals:
+            _journals[cog_name] = _Journal(cog_name, self.data_path)
 
     @property
     def _lock(self):
         return _locks[self.cog_name]
 
+    @property
+    def _journal(self) -> Optional["_Journal"]:
+        return _journals.get(self.cog_name)
+
     @property
     def data(self):
         return _shared_datastore.get(self.cog_name)
@@ -88,13 +133,15 @@ class JsonDriver(BaseDriver):
 
     @classmethod
     async def initialize(cls, **storage_details) -> None:
-        # No initializing to do
-        return
+        cls._journal_by_default = bool(storage_details.get("journal", False))
 
     @classmethod
     async def teardown(cls) -> None:
-        # No tearing down to do
-        return
+        for cog_name, journal in list(_journals.items()):
+            journal.cancel_flush()
+            if journal.dirty:
+                async with _locks[cog_name]:
+                    await journal.compact(_shared_datastore.get(cog_name))
 
     @staticmethod
     def get_config_details() -> Dict[str, Any]:
@@ -111,6 +158,7 @@ class JsonDriver(BaseDriver):
         if self.data is not None:
             return
 
+        _recover_snapshot(self.data_path)
         try:
             with self.data_path.open("r", encoding="utf-8") as fs:
                 self.data = json.load(fs)
@@ -119,6 +167,15 @@ class JsonDriver(BaseDriver):
             with self.data_path.open("w", encoding="utf-8") as fs:
                 json.dump(self.data, fs)
 
+        journal_path = _journal_path(self.data_path)
+        recovered = _replay_journal(journal_path, self.data)
+        if recovered:
+            log.info("Recovered %s journaled writes for %s.", recovered, self.cog_name)
+            _commit_snapshot(self.data_path, self.data)
+        else:
+            with contextlib.suppress(FileNotFoundError):
+                journal_path.unlink()
+
     def migrate_identifier(self, raw_identifier: int):
         if self.unique_cog_identifier in self.data:
             # Data has already been migrated
@@ -128,7 +185,10 @@ class JsonDriver(BaseDriver):
             if ident in self.data:
                 self.data[self.unique_cog_identifier] = self.data[ident]
                 del self.data[ident]
-                _save_json(self.data_path, self.data)
+                if self._journal is not None:
+                    self._journal.compact_sync(self.data)
+                else:
+                    _save_json(self.data_path, self.data)
                 break
 
     async def get(self, identifier_data: IdentifierData):
@@ -138,23 +198,108 @@ class JsonDriver(BaseDriver):
             partial = partial[i]
         return pickle.loads(pickle.dumps(partial, -1))
 
-    async def set(self, identifier_data: IdentifierData, value=None):
+    async def get_frozen(self, identifier_data: IdentifierData):
+        partial = self.data
+        full_identifiers = identifier_data.to_tuple()[1:]
+        for i in full_identifiers:
+            partial = partial[i]
+        if not isinstance(partial, dict):
+            # Lists are always replaced as a whole, never modified in place.
+            return freeze(partial)
+
+        view = FrozenDict(partial)
+        entry = _frozen_nodes[self.cog_name].setdefault(id(partial), [partial, 0, []])
+        entry[1] += 1
+        weakref.finalize(view, _release_frozen_node, self.cog_name, partial)
+        return view
+
+    async def iter_entries(
+        self,
+        identifier_data: IdentifierData,
+        fields: Optional[Sequence[str]] = None,
+        *,
+        read_only: bool = False,
+    ) -> AsyncIterator[Tuple[Tuple[str, ...], Any]]:
+        try:
+            view = await self.get_frozen(identifier_data)
+        except KeyError:
+            return
+        if not isinstance(view, FrozenDict):
+            return
+        # Nothing below a viewed dict is modified in place while the view is alive,
+        # so its contents can be read across suspensions, and entries copied one at a time.
+        depth = identifier_data.primary_key_len - len(identifier_data.primary_key)
+        for n, (pkeys, entry) in enumerate(_walk_entries(view._data, depth), start=1):
+            if fields is not None:
+                entry = {k: entry[k] for k in fields if k in entry}
+            if read_only:
+                yield pkeys, FrozenDict(entry, owner=view)
+            else:
+                yield pkeys, pickle.loads(pickle.dumps(entry, -1))
+            if not n % 100:
+                # Don't hog the event loop when iterating over lots of entries.
+                await asyncio.sleep(0)
+
+    def _writable_parent(
+        self,
+        identifiers: Tuple[str, ...],
+        *,
+        create: bool,
+        undo: Optional[List[Tuple[Dict[str, Any], str, Any]]] = None,
+    ) -> Dict[str, Any]:
+        """Walk to the dict holding the last of the given identifiers, so it can be modified.
+
+        Dicts on the way which are seen by frozen views (and everything
+        below them) are copied rather than modified, so those views never
+        change. The caller must be holding the lock.
+
+        When ``undo`` is given, every ``(dict, key, old_value)`` replaced
+        or added on the way is appended to it.
+        """
+        frozen = _frozen_nodes.get(self.cog_name)
         partial = self.data
+        copying = False
+        for i in identifiers[:-1]:
+            if create:
+                child = partial.get(i, _MISSING)
+                if child is _MISSING:
+                    if undo is not None:
+                        undo.append((partial, i, _MISSING))
+                    child = partial[i] = {}
+            else:
+                child = partial[i]
+            entry = frozen.get(id(child)) if frozen and isinstance(child, dict) else None
+            if entry is not None or (copying and isinstance(child, dict)):
+                if undo is not None:
+                    undo.append((partial, i, child))
+                if entry is not None and not entry[2]:
+                    # The copy shares its children with the viewed dict,
+                    # so they must be copied too before being modified.
+                    for grandchild in child.values():
+                        if isinstance(grandchild, dict):
+                            inherited = frozen.setdefault(id(grandchild), [grandchild, 0, []])
+                            inherited[1] += 1
+                            entry[2].append(grandchild)
+                child = partial[i] = child.copy()
+                copying = True
+            partial = child
+        return partial
+
+    async def set(self, identifier_data: IdentifierData, value=None):
         full_identifiers = identifier_data.to_tuple()[1:]
         # This is both our deepcopy() and our way of making sure this value is actually JSON
         # serializable.
         value_copy = json.loads(json.dumps(value))
 
         async with self._lock:
-            for i in full_identifiers[:-1]:
-                try:
-                    partial = partial.setdefault(i, {})
-                except AttributeError:
-                    # Tried to set sub-field of non-object
-                    raise errors.CannotSetSubfield
+            try:
+                partial = self._writable_parent(full_identifiers, create=True)
+            except AttributeError:
+                # Tried to set sub-field of non-object
+                raise errors.CannotSetSubfield
 
             partial[full_identifiers[-1]] = value_copy
-            await self._save()
+            await self._commit(full_identifiers, value_copy)
 
     async def clear(self, identifier_data: IdentifierData):
         partial = self.data
@@ -166,12 +311,95 @@ class JsonDriver(BaseDriver):
             pass
         else:
             async with self._lock:
-                try:
-                    del partial[full_identifiers[-1]]
-                except KeyError:
-                    pass
-                else:
-                    await self._save()
+                if full_identifiers[-1] not in partial:
+                    return
+                partial = self._writable_parent(full_identifiers, create=False)
+                del partial[full_identifiers[-1]]
+                await self._commit(full_identifiers)
+
+    async def apply_batch(self, changes: Sequence[Tuple[IdentifierData, Tuple[Any, ...]]]) -> None:
+        # Copy (and check) every value before anything is touched.
+        pending = [
+            (
+                identifier_data.to_tuple()[1:],
+                tuple(json.loads(json.dumps(v)) for v in value),
+            )
+            for identifier_data, value in changes
+        ]
+
+        async with self._lock:
+            undo = []
+            applied = []
+            try:
+                for full_identifiers, value in pending:
+                    key = full_identifiers[-1]
+                    if value:
+                        try:
+                            partial = self._writable_parent(
+                                full_identifiers, create=True, undo=undo
+                            )
+                        except AttributeError:
+                            raise errors.CannotSetSubfield
+                        if not isinstance(partial, dict):
+                            raise errors.CannotSetSubfield
+                        undo.append((partial, key, partial.get(key, _MISSING)))
+                        partial[key] = value[0]
+                    else:
+                        try:
+                            partial = self._writable_parent(
+                                full_identifiers, create=False, undo=undo
+                            )
+                        except (KeyError, TypeError):
+                            continue
+                        if not isinstance(partial, dict) or key not in partial:
+                            continue
+                        undo.append((partial, key, partial.pop(key)))
+                    applied.append((full_identifiers, value))
+            except BaseException:
+                # Put back everything this batch touched, newest first.
+                for partial, key, old in reversed(undo):
+                    if old is _MISSING:
+                        del partial[key]
+                    else:
+                        partial[key] = old
+                raise
+
+            if not applied:
+                return
+            journal = self._journal
+            if journal is None:
+                await self._save()
+            else:
+                for full_identifiers, value in applied:
+                    journal.record(full_identifiers, *value)
+
+    async def inc(
+        self, identifier_data: IdentifierData, value: Union[int, float], default: Union[int, float]
+    ) -> Union[int, float]:
+        return await self._update(
+            identifier_data, default, lambda existing: _inc_value(existing, value)
+        )
+
+    async def toggle(self, identifier_data: IdentifierData, default: bool) -> bool:
+        return await self._update(identifier_data, default, _toggle_value)
+
+    async def _update(
+        self, identifier_data: IdentifierData, default: Any, func: Callable[[Any], Any]
+    ) -> Any:
+        # Replace the stored value (or default) with func(value), all under the lock.
+        full_identifiers = identifier_data.to_tuple()[1:]
+        async with self._lock:
+            try:
+                partial = self._writable_parent(full_identifiers, create=True)
+            except AttributeError:
+                raise errors.CannotSetSubfield
+            if not isinstance(partial, dict):
+                raise errors.CannotSetSubfield
+
+            result = func(partial.get(full_identifiers[-1], default))
+            partial[full_identifiers[-1]] = result
+            await self._commit(full_identifiers, result)
+        return result
 
     @classmethod
     async def aiter_cogs(cls) -> AsyncIterator[Tuple[str, str]]:
@@ -195,10 +423,8 @@ class JsonDriver(BaseDriver):
 
     async def import_data(self, cog_data, custom_group_data):
         def update_write_data(identifier_data: IdentifierData, _data):
-            partial = self.data
             idents = identifier_data.to_tuple()[1:]
-            for ident in idents[:-1]:
-                partial = partial.setdefault(ident, {})
+            partial = self._writable_parent(idents, create=True)
             partial[idents[-1]] = _data
 
         async with self._lock:
@@ -216,11 +442,212 @@ class JsonDriver(BaseDriver):
                     update_write_data(ident_data, data)
             await self._save()
 
+    async def _commit(self, identifiers: Tuple[str, ...], *value: Any) -> None:
+        # Persist a single set (when value is given) or clear made to the data.
+        # The caller must be holding the lock.
+        journal = self._journal
+        if journal is None:
+            await self._save()
+        else:
+            journal.record(identifiers, *value)
+
     async def _save(self) -> None:
+        journal = self._journal
+        if journal is not None:
+            await journal.compact(self.data)
+            return
         loop = asyncio.get_running_loop()
         await loop.run_in_executor(None, _save_json, self.data_path, self.data)
 
 
+class _Journal:
+    """Append-only write-ahead journal for a single cog's JSON data.
+
+    Each line of the journal is a JSON array: ``[identifiers, value]`` for a
+    set, or ``[identifiers]`` for a clear. Entries are buffered and written
+    out in batches with a single fsync, and the journal is folded back into
+    the snapshot once it grows larger than the snapshot itself.
+    """
+
+    def __init__(self, cog_name: str, snapshot_path: Path):
+        self.cog_name = cog_name
+        self.snapshot_path = snapshot_path
+        self.path = _journal_path(snapshot_path)
+        self._pending: List[str] = []
+        self._io_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._size = 0
+        self._snapshot_size = _file_size(snapshot_path)
+
+    def record(self, identifiers: Tuple[str, ...], *value: Any) -> None:
+        self._pending.append(json.dumps([identifiers, *value]) + "\n")
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(JOURNAL_FLUSH_INTERVAL)
+        self._flush_task = None
+        try:
+            await self.flush()
+            if self._size > max(self._snapshot_size, JOURNAL_MIN_COMPACT_SIZE):
+                async with _locks[self.cog_name]:
+                    await self.compact(_shared_datastore.get(self.cog_name))
+        except Exception:
+            # Nobody awaits this task, so the error would otherwise go unnoticed.
+            log.exception("Failed to write out the journal for %s.", self.cog_name)
+
+    async def flush(self) -> None:
+        async with self._io_lock:
+            if not self._pending:
+                return
+            payload = "".join(self._pending)
+            self._pending.clear()
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(None, self._append, payload)
+            except BaseException:
+                # Keep the entries for the next flush. Replaying the ones which did get
+                # written twice is harmless, since they're replayed in the same order.
+                self._pending.insert(0, payload)
+                raise
+
+    async def compact(self, data: Optional[Dict[str, Any]]) -> None:
+        """Write out a fresh snapshot and truncate the journal.
+
+        The caller must be holding the cog's lock.
+        """
+        async with self._io_lock:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.compact_sync, data)
+
+    @property
+    def dirty(self) -> bool:
+        """Whether anything was journaled since the last snapshot."""
+        return bool(self._pending) or self._size > 0
+
+    def compact_sync(self, data: Optional[Dict[str, Any]]) -> None:
+        # Everything pending is already reflected in data, so it can be dropped.
+        self._pending.clear()
+        if data is None:
+            return
+        _commit_snapshot(self.snapshot_path, data)
+        self._snapshot_size = _file_size(self.snapshot_path)
+        self._size = 0
+
+    def cancel_flush(self) -> None:
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
+
+    def close(self, data: Optional[Dict[str, Any]]) -> None:
+        self.cancel_flush()
+        if self.dirty:
+            self.compact_sync(data)
+
+    def _append(self, payload: str) -> None:
+        with self.path.open(encoding="utf-8", mode="a") as fs:
+            fs.write(payload)
+            fs.flush()
+            os.fsync(fs.fileno())
+            self._size = fs.tell()
+
+
+def _release_frozen_node(cog_name: str, node: Dict[str, Any]) -> None:
+    frozen = _frozen_nodes.get(cog_name)
+    if not frozen:
+        return
+    entry = frozen.get(id(node))
+    # The node may have been copied and replaced since, in which case it's no longer tracked.
+    if entry is None or entry[0] is not node:
+        return
+    entry[1] -= 1
+    if entry[1] == 0:
+        del frozen[id(node)]
+        for child in entry[2]:
+            _release_frozen_node(cog_name, child)
+
+
+def _journal_path(snapshot_path: Path) -> Path:
+    return snapshot_path.with_name(snapshot_path.name + ".journal")
+
+
+def _compacted_path(snapshot_path: Path) -> Path:
+    return snapshot_path.with_name(snapshot_path.name + ".compacted")
+
+
+def _commit_snapshot(snapshot_path: Path, data: Dict[str, Any]) -> None:
+    """Replace the snapshot with data, and delete the journal which data already includes.
+
+    The journal must never be replayed over a snapshot which has newer values than it.
+    So the new snapshot is written next to the old one first, and only moved into place
+    once the journal is deleted; `_recover_snapshot` finishes or undoes this after a crash.
+    """
+    compacted_path = _compacted_path(snapshot_path)
+    _save_json(compacted_path, data)
+    with contextlib.suppress(FileNotFoundError):
+        _journal_path(snapshot_path).unlink()
+        _fsync_dir(snapshot_path.parent)
+    compacted_path.replace(snapshot_path)
+    _fsync_dir(snapshot_path.parent)
+
+
+def _recover_snapshot(snapshot_path: Path) -> None:
+    """Finish or undo a `_commit_snapshot` which was interrupted by a crash."""
+    compacted_path = _compacted_path(snapshot_path)
+    if not compacted_path.exists():
+        return
+    if _journal_path(snapshot_path).exists():
+        # The old snapshot and the journal are still the committed data.
+        compacted_path.unlink()
+    else:
+        compacted_path.replace(snapshot_path)
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def _replay_journal(path: Path, data: Dict[str, Any]) -> int:
+    """Apply the journal at the given path to data, returning the number of entries applied.
+
+    The journal only holds changes made after the snapshot was written (see
+    `_commit_snapshot`), so it's replayed over the snapshot in order. An incomplete
+    trailing line (from a crash during an append) is ignored.
+    """
+    try:
+        with path.open("rb") as fs:
+            lines = fs.read().split(b"\n")
+    except FileNotFoundError:
+        return 0
+
+    applied = 0
+    # The last item is either empty or a torn write.
+    for line in lines[:-1]:
+        try:
+            identifiers, *value = json.loads(line)
+        except (json.JSONDecodeError, ValueError):
+            log.warning("Skipping corrupt journal entry in %s", path)
+            continue
+        partial = data
+        try:
+            if value:
+                for i in identifiers[:-1]:
+                    partial = partial.setdefault(i, {})
+                partial[identifiers[-1]] = value[0]
+            else:
+                for i in identifiers[:-1]:
+                    partial = partial[i]
+                del partial[identifiers[-1]]
+        except (AttributeError, KeyError, TypeError):
+            # The entry was superseded by a later write to one of its parents.
+            continue
+        applied += 1
+    return applied
+
+
 def _save_json(path: Path, data: Dict[str, Any]) -> None:
     """
     This fsync stuff here is entirely necessary.
@@ -250,13 +677,16 @@ def _save_json(path: Path, data: Dict[str, Any]) -> None:
         os.fsync(fs.fileno())  # but that needs to happen prior to this line
 
     tmp_path.replace(path)
+    _fsync_dir(path.parent)
+
 
+def _fsync_dir(path: Path) -> None:
     try:
         flag = os.O_DIRECTORY  # pylint: disable=no-member
     except AttributeError:
         pass
     else:
-        fd = os.open(path.parent, flag)
+        fd = os.open(path, flag)
         try:
             os.fsync(fd)
         finally:
@@ -2,7 +2,7 @@ import getpass
 import json
 import sys
 from pathlib import Path
-from typing import Optional, Any, AsyncIterator, Tuple, Union, Callable, List
+from typing import Optional, Any, AsyncIterator, Tuple, Union, Callable, List, Sequence, Dict
 
 try:
     # pylint: disable=import-error
@@ -11,7 +11,7 @@ except ModuleNotFoundError:
     asyncpg = None
 
 from ... import data_manager, errors
-from ..base import BaseDriver, IdentifierData, ConfigCategory
+from ..base import BaseDriver, IdentifierData, ConfigCategory, freeze
 from ..log import log
 
 __all__ = ["PostgresDriver"]
@@ -19,6 +19,10 @@ __all__ = ["PostgresDriver"]
 _PKG_PATH = Path(__file__).parent
 DDL_SCRIPT_PATH = _PKG_PATH / "ddl.sql"
 DROP_DDL_SCRIPT_PATH = _PKG_PATH / "drop_ddl.sql"
+# How many entries `PostgresDriver.iter_entries` fetches at once.
+ITER_ENTRIES_BATCH_SIZE = 1000
+# Orders text primary keys which are IDs numerically, as a longer ID is a larger number.
+_PKEY_ORDER = 'length({t}pkey), {t}pkey COLLATE "C"'
 
 
 def encode_identifier_data(
@@ -36,6 +40,7 @@ def encode_identifier_data(
 
 
 class PostgresDriver(BaseDriver):
+    can_sort = True
     _pool: Optional["asyncpg.pool.Pool"] = None
 
     @classmethod
@@ -161,12 +166,32 @@ class PostgresDriver(BaseDriver):
     async def clear(self, identifier_data: IdentifierData):
         await self._execute("SELECT red_config.clear($1)", encode_identifier_data(identifier_data))
 
+    async def apply_batch(self, changes: Sequence[Tuple[IdentifierData, Tuple[Any, ...]]]) -> None:
+        async with self._pool.acquire() as conn, conn.transaction():
+            for identifier_data, value in changes:
+                if value:
+                    try:
+                        await self._execute(
+                            "SELECT red_config.set($1, $2::jsonb)",
+                            encode_identifier_data(identifier_data),
+                            json.dumps(value[0]),
+                            method=conn.execute,
+                        )
+                    except asyncpg.ErrorInAssignmentError:
+                        raise errors.CannotSetSubfield
+                else:
+                    await self._execute(
+                        "SELECT red_config.clear($1)",
+                        encode_identifier_data(identifier_data),
+                        method=conn.execute,
+                    )
+
     async def inc(
         self, identifier_data: IdentifierData, value: Union[int, float], default: Union[int, float]
     ) -> Union[int, float]:
         try:
-            return await self._execute(
-                f"SELECT red_config.inc($1, $2, $3)",
+            result = await self._execute(
+                "SELECT red_config.inc($1, $2, $3)",
                 encode_identifier_data(identifier_data),
                 value,
                 default,
@@ -174,11 +199,15 @@ class PostgresDriver(BaseDriver):
             )
         except asyncpg.WrongObjectTypeError as exc:
             raise errors.StoredTypeError(*exc.args)
+        # numeric comes back as a Decimal
+        if result == result.to_integral_value():
+            return int(result)
+        return float(result)
 
     async def toggle(self, identifier_data: IdentifierData, default: bool) -> bool:
         try:
             return await self._execute(
-                "SELECT red_config.inc($1, $2)",
+                "SELECT red_config.toggle($1, $2)",
                 encode_identifier_data(identifier_data),
                 default,
                 method=self._pool.fetchval,
@@ -186,6 +215,140 @@ class PostgresDriver(BaseDriver):
         except asyncpg.WrongObjectTypeError as exc:
             raise errors.StoredTypeError(*exc.args)
 
+    async def fetch_sorted(
+        self, identifier_data: IdentifierData, key: str, default: Any, *, limit: Optional[int]
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """Get the documents one level below the given (partial) primary key,
+        sorted by the number stored under ``key``, highest first.
+
+        Ties are ordered by primary key, numerically for IDs.
+        """
+        source, columns, args = self._sorted_source(identifier_data, key, default)
+        # ORDER BY can only use an output column's alias on its own, not in an expression,
+        # so the columns are selected in a CTE first
+        query = (
+            f"WITH t AS (SELECT {columns} FROM {source}) "
+            f"SELECT pkey, json_data FROM t ORDER BY v DESC, {_PKEY_ORDER.format(t='')}"
+        )
+        if limit is not None:
+            query += f" LIMIT ${len(args) + 1}"
+            args.append(limit)
+        try:
+            rows = await self._execute(query, *args, method=self._pool.fetch)
+        except (asyncpg.UndefinedTableError, asyncpg.InvalidSchemaNameError):
+            return []
+        return [(row["pkey"], json.loads(row["json_data"])) for row in rows]
+
+    async def fetch_rank(
+        self, identifier_data: IdentifierData, key: str, default: Any, pkey: str
+    ) -> Optional[int]:
+        """Get the 1-based position of a document in the order given by `fetch_sorted`.
+
+        Returns ``None`` when there is no such document.
+        """
+        source, columns, args = self._sorted_source(identifier_data, key, default)
+        n = len(args) + 1
+        query = (
+            f"WITH t AS (SELECT {columns} FROM {source}) "
+            "SELECT (SELECT count(*) FROM t"
+            f"  WHERE t.v > m.v OR (t.v = m.v AND ({_PKEY_ORDER.format(t='t.')})"
+            f" < ({_PKEY_ORDER.format(t='m.')}))) + 1 "
+            f"FROM t AS m WHERE m.pkey = ${n}::text"
+        )
+        try:
+            return await self._execute(query, *args, pkey, method=self._pool.fetchval)
+        except (asyncpg.UndefinedTableError, asyncpg.InvalidSchemaNameError):
+            return None
+
+    async def iter_entries(
+        self,
+        identifier_data: IdentifierData,
+        fields: Optional[Sequence[str]] = None,
+        *,
+        read_only: bool = False,
+    ) -> AsyncIterator[Tuple[Tuple[str, ...], Any]]:
+        # The entries are fetched in batches ordered by primary key, each starting after
+        # the last key of the previous one, so that no connection is held while the caller
+        # handles the entries (which often means writing to the same table).
+        num_pkeys = len(identifier_data.primary_key)
+        key_columns = [
+            f"primary_key_{i}" for i in range(num_pkeys + 1, identifier_data.primary_key_len + 1)
+        ]
+        pkey_type = "text" if identifier_data.is_custom else "bigint"
+        if fields is None:
+            source, args = self._source(identifier_data, 0)
+            data_column = "json_data"
+        else:
+            # Only send the requested top-level keys over the wire.
+            source, args = self._source(identifier_data, 1)
+            data_column = (
+                "(SELECT coalesce(jsonb_object_agg(key, value), '{}'::jsonb)"
+                "  FROM jsonb_each(json_data) WHERE key = ANY($1::text[]))"
+            )
+            args.insert(0, list(fields))
+        select = (
+            f"SELECT {', '.join(f'{column}::text' for column in key_columns)},"
+            f" {data_column} AS data FROM {source}"
+        )
+        order = f" ORDER BY {', '.join(key_columns)} LIMIT {ITER_ENTRIES_BATCH_SIZE}"
+        # the position of the first argument holding the previous batch's last key
+        n = len(args) + 1
+        after = "({}) > ({})".format(
+            ", ".join(key_columns),
+            ", ".join(f"${n + i}::text::{pkey_type}" for i in range(len(key_columns))),
+        )
+        first_query = select + order
+        next_query = select + (" AND " if num_pkeys else " WHERE ") + after + order
+
+        last_key: Optional[Tuple[str, ...]] = None
+        while True:
+            if last_key is None:
+                query, query_args = first_query, args
+            else:
+                query, query_args = next_query, [*args, *last_key]
+            try:
+                rows = await self._execute(query, *query_args, method=self._pool.fetch)
+            except (asyncpg.UndefinedTableError, asyncpg.InvalidSchemaNameError):
+                return
+            for row in rows:
+                entry = json.loads(row["data"])
+                if isinstance(entry, dict):
+                    yield tuple(row)[:-1], freeze(entry) if read_only else entry
+            if len(rows) < ITER_ENTRIES_BATCH_SIZE:
+                return
+            last_key = tuple(rows[-1])[:-1]
+
+    @staticmethod
+    def _source(identifier_data: IdentifierData, num_args: int) -> Tuple[str, List[Any]]:
+        # Build the FROM (and WHERE) clause selecting the rows below the given primary key,
+        # for a query which already has ``num_args`` arguments before those added here.
+        def quote(name: str) -> str:
+            return '"' + name.replace('"', '""') + '"'
+
+        schema = quote(f"{identifier_data.cog_name}.{identifier_data.uuid}")
+        table = quote(identifier_data.category)
+        num_pkeys = len(identifier_data.primary_key)
+        pkey_type = "text" if identifier_data.is_custom else "bigint"
+        where = " AND ".join(
+            f"primary_key_{i} = ${i + num_args}::text::{pkey_type}"
+            for i in range(1, num_pkeys + 1)
+        )
+        source = f"{schema}.{table}" + (f" WHERE {where}" if where else "")
+        return source, list(identifier_data.primary_key)
+
+    @classmethod
+    def _sorted_source(
+        cls, identifier_data: IdentifierData, key: str, default: Any
+    ) -> Tuple[str, str, List[Any]]:
+        # Build the FROM (and WHERE) clause and the selected columns for the sorting queries.
+        source, pkey_args = cls._source(identifier_data, 2)
+        num_pkeys = len(identifier_data.primary_key)
+        columns = (
+            f"primary_key_{num_pkeys + 1}::text AS pkey, json_data, "
+            "coalesce((json_data ->> $1::text)::numeric, $2::numeric) AS v"
+        )
+        return source, columns, [key, default, *pkey_args]
+
     @classmethod
     async def aiter_cogs(cls) -> AsyncIterator[Tuple[str, str]]:
         query = "SELECT cog_name, cog_id FROM red_config.red_cogs"
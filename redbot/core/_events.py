@@ -525,6 +525,7 @@ def init_events(bot, cli_flags):
             command_obj = bot.get_command(command_name)
             if command_obj is not None:
                 command_obj.enable_in(guild)
+        bot._evict_guild_from_caches(guild)
 
     @bot.event
     async def on_cog_add(cog: commands.Cog):
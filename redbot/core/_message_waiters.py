@@ -0,0 +1,125 @@
+import asyncio
+from typing import Callable, Dict, List, Optional
+
+import discord
+
+__all__ = ("MessageWaiters",)
+
+
+class _Waiter:
+    __slots__ = ("future", "check", "channel_id", "author_id")
+
+    def __init__(
+        self,
+        future: asyncio.Future,
+        check: Optional[Callable[[discord.Message], bool]],
+        channel_id: Optional[int],
+        author_id: Optional[int],
+    ):
+        self.future = future
+        self.check = check
+        self.channel_id = channel_id
+        self.author_id = author_id
+
+    def matches(self, message: discord.Message) -> bool:
+        if self.channel_id is not None and self.channel_id != message.channel.id:
+            return False
+        if self.author_id is not None and self.author_id != message.author.id:
+            return False
+        return self.check is None or self.check(message)
+
+
+class MessageWaiters:
+    """
+    The futures waiting for a message in a known channel or from a known author.
+
+    discord.py checks every ``wait_for("message")`` predicate against every message
+    the bot receives, which makes each message cost as much as there are pending
+    waits (e.g. one for each running trivia session or menu prompt).
+    Waiters stored here are instead indexed by their channel, or by their author
+    if the channel isn't known, so that a message is only checked against
+    the waiters which could possibly match it.
+    """
+
+    def __init__(self):
+        self._by_channel: Dict[int, List[_Waiter]] = {}
+        self._by_author: Dict[int, List[_Waiter]] = {}
+
+    def __len__(self) -> int:
+        return sum(map(len, self._by_channel.values())) + sum(map(len, self._by_author.values()))
+
+    def add(
+        self,
+        future: asyncio.Future,
+        *,
+        channel_id: Optional[int] = None,
+        author_id: Optional[int] = None,
+        check: Optional[Callable[[discord.Message], bool]] = None,
+    ) -> None:
+        """
+        Set ``future``'s result to the first message that matches.
+
+        The future's exception is set instead if ``check`` raises one.
+        At least one of ``channel_id`` and ``author_id`` has to be given.
+
+        Parameters
+        ----------
+        future : asyncio.Future
+            The future to resolve.
+        channel_id : Optional[int]
+            The ID of the channel the message has to be sent in.
+        author_id : Optional[int]
+            The ID of the user the message has to be sent by.
+        check : Optional[Callable[[discord.Message], bool]]
+            The predicate the message has to match.
+        """
+        if channel_id is None and author_id is None:
+            raise ValueError("At least one of channel_id and author_id has to be given.")
+        waiter = _Waiter(future, check, channel_id, author_id)
+        self._bucket_of(waiter).append(waiter)
+        # a waiter which timed out or got cancelled is removed right away,
+        # rather than when the next message in its channel comes in
+        future.add_done_callback(lambda _: self._remove(waiter))
+
+    def resolve(self, message: discord.Message) -> None:
+        """Resolve the waiters that ``message`` matches."""
+        for bucket in (
+            self._by_channel.get(message.channel.id),
+            self._by_author.get(message.author.id),
+        ):
+            if not bucket:
+                continue
+            # _remove() mutates the bucket, so iterate over a copy
+            for waiter in bucket.copy():
+                if waiter.future.done():
+                    self._remove(waiter)
+                    continue
+                try:
+                    matched = waiter.matches(message)
+                except Exception as exc:
+                    waiter.future.set_exception(exc)
+                    self._remove(waiter)
+                else:
+                    if matched:
+                        waiter.future.set_result(message)
+                        self._remove(waiter)
+
+    def _bucket_of(self, waiter: _Waiter) -> List[_Waiter]:
+        if waiter.channel_id is not None:
+            return self._by_channel.setdefault(waiter.channel_id, [])
+        return self._by_author.setdefault(waiter.author_id, [])
+
+    def _remove(self, waiter: _Waiter) -> None:
+        if waiter.channel_id is not None:
+            buckets, key = self._by_channel, waiter.channel_id
+        else:
+            buckets, key = self._by_author, waiter.author_id
+        bucket = buckets.get(key)
+        if bucket is None:
+            return
+        try:
+            bucket.remove(waiter)
+        except ValueError:
+            return
+        if not bucket:
+            del buckets[key]
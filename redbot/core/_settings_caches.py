@@ -1,15 +1,216 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional, Union, Set, Iterable, Tuple, overload
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Union,
+    Set,
+    Iterable,
+    Tuple,
+    TypeVar,
+    overload,
+)
 import asyncio
 from argparse import Namespace
-from collections import defaultdict
+from collections import OrderedDict
 
 import discord
 
-from .config import Config
+from ._drivers import IdentifierData
+from .config import Config, Value
 from .utils import AsyncIter
 
+_K = TypeVar("_K", bound=Hashable)
+_V = TypeVar("_V")
+
+#: The number of entries each settings cache holds before evicting the least recently used one.
+DEFAULT_CACHE_SIZE = 25_000
+
+_MISSING: Any = object()
+
+
+class CacheStats(NamedTuple):
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
+
+
+class BoundedCache(Generic[_K, _V]):
+    """
+    A mapping holding at most ``maxsize`` entries, which evicts
+    the least recently used entry when it's full.
+
+    Lookups through `get` are counted as hits or misses, see `stats`.
+    Everything else, including ``in`` checks, is left out of the counters.
+    """
+
+    __slots__ = ("_data", "maxsize", "hits", "misses")
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self._data: OrderedDict[_K, _V] = OrderedDict()
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: _K, default: Any = None) -> Any:
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def __getitem__(self, key: _K) -> _V:
+        value = self._data[key]
+        self._data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: _K, value: _V) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __iter__(self) -> Iterator[_K]:
+        return iter(self._data)
+
+    def values(self) -> Iterable[_V]:
+        return self._data.values()
+
+    def pop(self, key: _K, default: Any = None) -> Any:
+        return self._data.pop(key, default)
+
+    def discard_where(self, predicate: Callable[[_K], bool]) -> None:
+        """Remove every entry whose key matches ``predicate``."""
+        for key in [key for key in self._data if predicate(key)]:
+            del self._data[key]
+
+    def resize(self, maxsize: int) -> None:
+        """Change ``maxsize``, evicting the least recently used entries which no longer fit."""
+        self.maxsize = maxsize
+        while len(self._data) > maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(self.hits, self.misses, len(self._data), self.maxsize)
+
+
+def _guild_snowflakes(guild: discord.Guild) -> Set[int]:
+    """The IDs of a guild and of everything in it which settings may be keyed by."""
+    ret = {guild.id}
+    ret.update(c.id for c in guild.channels)
+    ret.update(t.id for t in guild.threads)
+    return ret
+
+
+class ConfigValueCache:
+    """
+    Caches reads of `Value` objects which are done on hot paths,
+    such as checks which run for every message or command.
+
+    Values are read with ``read_only=True``, so mutable values
+    are returned as read-only views which must not be modified.
+
+    Every write to a cached value has to go through `set` or `clear`,
+    or be followed by a call to `invalidate`, so that the cache
+    never serves stale data.
+
+    The bot's instance (``Red._value_cache``) caches these core settings,
+    so any new code writing to one of them has to go through it too:
+
+    - ``embeds``, in the global, guild, channel and user scopes
+    - ``fuzzy``, in the global and guild scopes
+    - ``use_bot_color``, ``admin_role`` and ``mod_role``, in the guild scope
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self._cache: BoundedCache[IdentifierData, Any] = BoundedCache(maxsize)
+        # Bumped on every invalidation, so that a read which was in flight
+        # while the value was written doesn't put the old data back in the cache.
+        self._generation = 0
+
+    async def get(self, value: Value) -> Any:
+        key = value.identifier_data
+        ret = self._cache.get(key, _MISSING)
+        if ret is _MISSING:
+            generation = self._generation
+            ret = await value(read_only=True)
+            if generation == self._generation:
+                self._cache[key] = ret
+        return ret
+
+    async def set(self, value: Value, new_value: Any) -> None:
+        await value.set(new_value)
+        self.invalidate(value)
+
+    async def clear(self, value: Value) -> None:
+        await value.clear()
+        self.invalidate(value)
+
+    def invalidate(self, value: Value) -> None:
+        self._generation += 1
+        self._cache.pop(value.identifier_data, None)
+
+    def evict_guild(self, guild: discord.Guild) -> None:
+        snowflakes = {str(i) for i in _guild_snowflakes(guild)}
+        self._cache.discard_where(lambda key: not snowflakes.isdisjoint(key.primary_key))
+
+    def cache_stats(self) -> Dict[str, CacheStats]:
+        return {"values": self._cache.stats()}
+
+
+class PrefixMatcher:
+    """
+    Finds the longest of a set of prefixes which a string starts with.
+
+    The prefixes are compiled into a trie, so that matching takes a single
+    scan over the start of the string, no matter how many prefixes there are.
+    """
+
+    __slots__ = ("prefixes", "_root")
+
+    def __init__(self, prefixes: Iterable[str]):
+        self.prefixes: Tuple[str, ...] = tuple(prefixes)
+        # Each node maps a character to the next node,
+        # and None to the prefix ending at this node, if any.
+        root: Dict[Optional[str], Any] = {}
+        for prefix in self.prefixes:
+            node = root
+            for char in prefix:
+                node = node.setdefault(char, {})
+            node[None] = prefix
+        self._root = root
+
+    def match(self, content: str) -> Optional[str]:
+        """Get the longest prefix ``content`` starts with, or `None` if there isn't one."""
+        node = self._root
+        ret = node.get(None)
+        for char in content:
+            node = node.get(char)
+            if node is None:
+                break
+            ret = node.get(None, ret)
+        return ret
+
 
 class PrefixManager:
     def __init__(self, config: Config, cli_flags: Namespace):
@@ -17,15 +218,17 @@ class PrefixManager:
         self._global_prefix_override: Optional[List[str]] = (
             sorted(cli_flags.prefix, reverse=True) or None
         )
-        self._cached: Dict[Optional[int], List[str]] = {}
+        self._cached: BoundedCache[Optional[int], List[str]] = BoundedCache()
+        self._matchers: BoundedCache[Optional[int], PrefixMatcher] = BoundedCache()
 
     async def get_prefixes(self, guild: Optional[discord.Guild] = None) -> List[str]:
         ret: List[str]
 
         gid: Optional[int] = guild.id if guild else None
 
-        if gid in self._cached:
-            ret = self._cached[gid].copy()
+        cached = self._cached.get(gid)
+        if cached is not None:
+            ret = cached.copy()
         else:
             if gid is not None:
                 ret = await self._config.guild_from_id(gid).prefix()
@@ -38,6 +241,21 @@ class PrefixManager:
 
         return ret
 
+    async def get_matcher(
+        self, guild: Optional[discord.Guild] = None, extra_prefixes: Tuple[str, ...] = ()
+    ) -> PrefixMatcher:
+        """
+        Get a matcher for the prefixes of a guild, along with ``extra_prefixes``,
+        such as the bot's mention prefixes.
+        """
+        gid: Optional[int] = guild.id if guild else None
+        matcher = self._matchers.get(gid)
+        if matcher is None or matcher.prefixes[: len(extra_prefixes)] != extra_prefixes:
+            prefixes = await self.get_prefixes(guild)
+            matcher = PrefixMatcher((*extra_prefixes, *prefixes))
+            self._matchers[gid] = matcher
+        return matcher
+
     async def set_prefixes(
         self, guild: Optional[discord.Guild] = None, prefixes: Optional[List[str]] = None
     ):
@@ -54,41 +272,47 @@ class PrefixManager:
             if not prefixes:
                 raise ValueError("You must have at least one prefix.")
             self._cached.clear()
+            self._matchers.clear()
             await self._config.prefix.set(prefixes)
         else:
             self._cached.pop(gid, None)
+            self._matchers.pop(gid, None)
             await self._config.guild_from_id(gid).prefix.set(prefixes)
 
+    def evict_guild(self, guild: discord.Guild) -> None:
+        self._cached.pop(guild.id, None)
+        self._matchers.pop(guild.id, None)
+
+    def cache_stats(self) -> Dict[str, CacheStats]:
+        return {"prefixes": self._cached.stats(), "prefix_matchers": self._matchers.stats()}
+
 
 class I18nManager:
     def __init__(self, config: Config):
         self._config: Config = config
-        self._guild_locale: Dict[Union[int, None], Union[str, None]] = {}
-        self._guild_regional_format: Dict[Union[int, None], Union[str, None]] = {}
+        # The global settings are kept out of the bounded caches,
+        # as every guild without its own setting falls back to them.
+        self._global_locale: Optional[str] = None
+        self._global_regional_format: Union[str, None, Any] = _MISSING
+        self._guild_locale: BoundedCache[int, Optional[str]] = BoundedCache()
+        self._guild_regional_format: BoundedCache[int, Optional[str]] = BoundedCache()
 
     async def get_locale(self, guild: Union[discord.Guild, None]) -> str:
         """Get the guild locale from the cache"""
         # Ensure global locale is in the cache
-        if None not in self._guild_locale:
-            global_locale = await self._config.locale()
-            self._guild_locale[None] = global_locale
+        if self._global_locale is None:
+            self._global_locale = await self._config.locale()
 
         if guild is None:  # Not a guild so cannot support guild locale
             # Return the bot's globally set locale if its None on a guild scope.
-            return self._guild_locale[None]
-        elif guild.id in self._guild_locale:  # Cached guild
-            if self._guild_locale[guild.id] is None:
-                return self._guild_locale[None]
-            else:
-                return self._guild_locale[guild.id]
-        else:  # Uncached guild
-            out = await self._config.guild(guild).locale()  # No locale set
-            if out is None:
-                self._guild_locale[guild.id] = None
-                return self._guild_locale[None]
-            else:
-                self._guild_locale[guild.id] = out
-                return out
+            return self._global_locale
+
+        out = self._guild_locale.get(guild.id, _MISSING)
+        if out is _MISSING:  # Uncached guild
+            out = await self._config.guild(guild).locale()
+            self._guild_locale[guild.id] = out
+        # No locale set
+        return self._global_locale if out is None else out
 
     @overload
     async def set_locale(self, guild: None, locale: str):
@@ -106,7 +330,7 @@ class I18nManager:
             if locale is None:
                 # this method should never be called like this
                 raise ValueError("Global locale can't be None!")
-            self._guild_locale[None] = locale
+            self._global_locale = locale
             await self._config.locale.set(locale)
             return
         self._guild_locale[guild.id] = locale
@@ -114,44 +338,47 @@ class I18nManager:
 
     async def get_regional_format(self, guild: Union[discord.Guild, None]) -> Optional[str]:
         """Get the regional format from the cache"""
-        # Ensure global locale is in the cache
-        if None not in self._guild_regional_format:
-            global_regional_format = await self._config.regional_format()
-            self._guild_regional_format[None] = global_regional_format
+        # Ensure global regional format is in the cache
+        if self._global_regional_format is _MISSING:
+            self._global_regional_format = await self._config.regional_format()
 
-        if guild is None:  # Not a guild so cannot support guild locale
-            return self._guild_regional_format[None]
-        elif guild.id in self._guild_regional_format:  # Cached guild
-            if self._guild_regional_format[guild.id] is None:
-                return self._guild_regional_format[None]
-            else:
-                return self._guild_regional_format[guild.id]
-        else:  # Uncached guild
-            out = await self._config.guild(guild).regional_format()  # No locale set
-            if out is None:
-                self._guild_regional_format[guild.id] = None
-                return self._guild_regional_format[None]
-            else:  # Not cached, got a custom regional format.
-                self._guild_regional_format[guild.id] = out
-                return out
+        if guild is None:  # Not a guild so cannot support guild regional format
+            return self._global_regional_format
+
+        out = self._guild_regional_format.get(guild.id, _MISSING)
+        if out is _MISSING:  # Uncached guild
+            out = await self._config.guild(guild).regional_format()
+            self._guild_regional_format[guild.id] = out
+        # No regional format set
+        return self._global_regional_format if out is None else out
 
     async def set_regional_format(
         self, guild: Union[discord.Guild, None], regional_format: Union[str, None]
     ) -> None:
         """Set the regional format in the config and cache"""
         if guild is None:
-            self._guild_regional_format[None] = regional_format
+            self._global_regional_format = regional_format
             await self._config.regional_format.set(regional_format)
             return
         self._guild_regional_format[guild.id] = regional_format
         await self._config.guild(guild).regional_format.set(regional_format)
 
+    def evict_guild(self, guild: discord.Guild) -> None:
+        self._guild_locale.pop(guild.id, None)
+        self._guild_regional_format.pop(guild.id, None)
+
+    def cache_stats(self) -> Dict[str, CacheStats]:
+        return {
+            "locales": self._guild_locale.stats(),
+            "regional_formats": self._guild_regional_format.stats(),
+        }
+
 
 class IgnoreManager:
     def __init__(self, config: Config):
         self._config: Config = config
-        self._cached_channels: Dict[int, bool] = {}
-        self._cached_guilds: Dict[int, bool] = {}
+        self._cached_channels: BoundedCache[int, bool] = BoundedCache()
+        self._cached_guilds: BoundedCache[int, bool] = BoundedCache()
 
     async def get_ignored_channel(
         self,
@@ -170,19 +397,17 @@ class IgnoreManager:
         cat_id: Optional[int] = (
             channel.category.id if check_category and channel.category else None
         )
-        if cid in self._cached_channels:
-            chan_ret = self._cached_channels[cid]
-        else:
+        chan_ret = self._cached_channels.get(cid)
+        if chan_ret is None:
             chan_ret = await self._config.channel_from_id(cid).ignored()
             self._cached_channels[cid] = chan_ret
-        if cat_id and cat_id in self._cached_channels:
-            cat_ret = self._cached_channels[cat_id]
-        else:
-            if cat_id:
+        if cat_id:
+            cat_ret = self._cached_channels.get(cat_id)
+            if cat_ret is None:
                 cat_ret = await self._config.channel_from_id(cat_id).ignored()
                 self._cached_channels[cat_id] = cat_ret
-            else:
-                cat_ret = False
+        else:
+            cat_ret = False
         ret = chan_ret or cat_ret
 
         return ret
@@ -211,9 +436,8 @@ class IgnoreManager:
 
         gid: int = guild.id
 
-        if gid in self._cached_guilds:
-            ret = self._cached_guilds[gid]
-        else:
+        ret = self._cached_guilds.get(gid)
+        if ret is None:
             ret = await self._config.guild_from_id(gid).ignored()
             self._cached_guilds[gid] = ret
 
@@ -227,12 +451,23 @@ class IgnoreManager:
         else:
             await self._config.guild_from_id(gid).ignored.clear()
 
+    def evict_guild(self, guild: discord.Guild) -> None:
+        self._cached_guilds.pop(guild.id, None)
+        for snowflake in _guild_snowflakes(guild):
+            self._cached_channels.pop(snowflake, None)
+
+    def cache_stats(self) -> Dict[str, CacheStats]:
+        return {
+            "ignored_channels": self._cached_channels.stats(),
+            "ignored_guilds": self._cached_guilds.stats(),
+        }
+
 
 class WhitelistBlacklistManager:
     def __init__(self, config: Config):
         self._config: Config = config
-        self._cached_whitelist: Dict[Optional[int], Set[int]] = {}
-        self._cached_blacklist: Dict[Optional[int], Set[int]] = {}
+        self._cached_whitelist: BoundedCache[Optional[int], Set[int]] = BoundedCache()
+        self._cached_blacklist: BoundedCache[Optional[int], Set[int]] = BoundedCache()
         # because of discord deletion
         # we now have sync and async access that may need to happen at the
         # same time.
@@ -241,14 +476,10 @@ class WhitelistBlacklistManager:
 
     async def discord_deleted_user(self, user_id: int):
         async with self._access_lock:
-            async for guild_id_or_none, ids in AsyncIter(
-                self._cached_whitelist.items(), steps=100
-            ):
+            async for ids in AsyncIter(list(self._cached_whitelist.values()), steps=100):
                 ids.discard(user_id)
 
-            async for guild_id_or_none, ids in AsyncIter(
-                self._cached_blacklist.items(), steps=100
-            ):
+            async for ids in AsyncIter(list(self._cached_blacklist.values()), steps=100):
                 ids.discard(user_id)
 
             for grp in (self._config.whitelist, self._config.blacklist):
@@ -273,8 +504,9 @@ class WhitelistBlacklistManager:
         async with self._access_lock:
             ret: Set[int]
             gid: Optional[int] = guild.id if guild else None
-            if gid in self._cached_whitelist:
-                ret = self._cached_whitelist[gid].copy()
+            cached = self._cached_whitelist.get(gid)
+            if cached is not None:
+                ret = cached.copy()
             else:
                 if gid is not None:
                     ret = set(await self._config.guild_from_id(gid).whitelist())
@@ -346,8 +578,9 @@ class WhitelistBlacklistManager:
         async with self._access_lock:
             ret: Set[int]
             gid: Optional[int] = guild.id if guild else None
-            if gid in self._cached_blacklist:
-                ret = self._cached_blacklist[gid].copy()
+            cached = self._cached_blacklist.get(gid)
+            if cached is not None:
+                ret = cached.copy()
             else:
                 if gid is not None:
                     ret = set(await self._config.guild_from_id(gid).blacklist())
@@ -411,11 +644,21 @@ class WhitelistBlacklistManager:
                     list(self._cached_blacklist[gid])
                 )
 
+    def evict_guild(self, guild: discord.Guild) -> None:
+        self._cached_whitelist.pop(guild.id, None)
+        self._cached_blacklist.pop(guild.id, None)
+
+    def cache_stats(self) -> Dict[str, CacheStats]:
+        return {
+            "whitelists": self._cached_whitelist.stats(),
+            "blacklists": self._cached_blacklist.stats(),
+        }
+
 
 class DisabledCogCache:
     def __init__(self, config: Config):
         self._config = config
-        self._disable_map: Dict[str, Dict[int, bool]] = defaultdict(dict)
+        self._disable_map: BoundedCache[Tuple[str, int], bool] = BoundedCache()
 
     async def cog_disabled_in_guild(self, cog_name: str, guild_id: int) -> bool:
         """
@@ -432,8 +675,9 @@ class DisabledCogCache:
         bool
         """
 
-        if guild_id in self._disable_map[cog_name]:
-            return self._disable_map[cog_name][guild_id]
+        cached = self._disable_map.get((cog_name, guild_id))
+        if cached is not None:
+            return cached
 
         gset = await self._config.custom("COG_DISABLE_SETTINGS", cog_name, guild_id).disabled()
         if gset is None:
@@ -441,7 +685,7 @@ class DisabledCogCache:
             if gset is None:
                 gset = False
 
-        self._disable_map[cog_name][guild_id] = gset
+        self._disable_map[(cog_name, guild_id)] = gset
         return gset
 
     async def default_disable(self, cog_name: str):
@@ -454,7 +698,7 @@ class DisabledCogCache:
             This should be the cog's qualified name, not necessarily the classname
         """
         await self._config.custom("COG_DISABLE_SETTINGS", cog_name, 0).disabled.set(True)
-        self._disable_map.pop(cog_name, None)
+        self._disable_map.discard_where(lambda key: key[0] == cog_name)
 
     async def default_enable(self, cog_name: str):
         """
@@ -466,7 +710,7 @@ class DisabledCogCache:
             This should be the cog's qualified name, not necessarily the classname
         """
         await self._config.custom("COG_DISABLE_SETTINGS", cog_name, 0).disabled.clear()
-        self._disable_map.pop(cog_name, None)
+        self._disable_map.discard_where(lambda key: key[0] == cog_name)
 
     async def disable_cog_in_guild(self, cog_name: str, guild_id: int) -> bool:
         """
@@ -488,7 +732,7 @@ class DisabledCogCache:
         if await self.cog_disabled_in_guild(cog_name, guild_id):
             return False
 
-        self._disable_map[cog_name][guild_id] = True
+        self._disable_map[(cog_name, guild_id)] = True
         await self._config.custom("COG_DISABLE_SETTINGS", cog_name, guild_id).disabled.set(True)
         return True
 
@@ -512,6 +756,12 @@ class DisabledCogCache:
         if not await self.cog_disabled_in_guild(cog_name, guild_id):
             return False
 
-        self._disable_map[cog_name][guild_id] = False
+        self._disable_map[(cog_name, guild_id)] = False
         await self._config.custom("COG_DISABLE_SETTINGS", cog_name, guild_id).disabled.set(False)
         return True
+
+    def evict_guild(self, guild: discord.Guild) -> None:
+        self._disable_map.discard_where(lambda key: key[1] == guild.id)
+
+    def cache_stats(self) -> Dict[str, CacheStats]:
+        return {"disabled_cogs": self._disable_map.stats()}
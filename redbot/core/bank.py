@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from bisect import bisect_left, insort
 from datetime import datetime, timezone
-from typing import Union, List, Optional, TYPE_CHECKING, Literal
+from itertools import islice
+from typing import Union, List, Optional, TYPE_CHECKING, Literal, Dict, Iterable, Iterator, Tuple
 from functools import wraps
 
 import discord
@@ -11,6 +13,7 @@ import discord
 from redbot.core.utils import AsyncIter
 from redbot.core.utils.chat_formatting import humanize_number
 from . import Config, errors, commands
+from .config import Group
 from .i18n import Translator
 
 from .errors import BankPruneError
@@ -82,9 +85,116 @@ _cache_is_global = None
 _cache = {"bank_name": None, "currency": None, "default_balance": None, "max_balance": None}
 
 
+class _BalanceIndex:
+    """Order-statistics index over the balances of one bank's accounts.
+
+    Accounts are sorted by balance, highest first, with ties ordered by user ID,
+    the same order drivers which sort the accounts themselves use.
+    The sorted keys are split into buckets, with a Fenwick tree of the bucket sizes,
+    so updates and rank lookups take logarithmic time.
+    """
+
+    _BUCKET_SIZE = 1000
+
+    def __init__(self, balances: Iterable[Tuple[int, int]]):
+        self._keys: Dict[int, Tuple[int, int]] = {}
+        for user_id, balance in balances:
+            self._keys[user_id] = (-balance, user_id)
+        keys = sorted(self._keys.values())
+        size = self._BUCKET_SIZE
+        self._buckets = [keys[i : i + size] for i in range(0, len(keys), size)]
+        self._maxes = [bucket[-1] for bucket in self._buckets]
+        self._build_tree()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self) -> Iterator[int]:
+        for bucket in self._buckets:
+            for key in bucket:
+                yield key[1]
+
+    def update(self, user_id: int, balance: int) -> None:
+        old = self._keys.get(user_id)
+        if old is not None:
+            if old[0] == -balance:
+                return
+            self._remove(old)
+        key = self._keys[user_id] = (-balance, user_id)
+        self._insert(key)
+
+    def discard(self, user_id: int) -> None:
+        key = self._keys.pop(user_id, None)
+        if key is not None:
+            self._remove(key)
+
+    def rank(self, user_id: int) -> Optional[int]:
+        """Get the 1-based leaderboard position of the user, if they have an account."""
+        key = self._keys.get(user_id)
+        if key is None:
+            return None
+        idx = bisect_left(self._maxes, key)
+        # Sum of the sizes of all buckets before this one.
+        pos, i = 0, idx
+        while i > 0:
+            pos += self._tree[i]
+            i -= i & -i
+        return pos + bisect_left(self._buckets[idx], key) + 1
+
+    def _build_tree(self) -> None:
+        tree = [0] * (len(self._buckets) + 1)
+        for i, bucket in enumerate(self._buckets, 1):
+            tree[i] += len(bucket)
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _tree_add(self, idx: int, delta: int) -> None:
+        i = idx + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def _insert(self, key: Tuple[int, int]) -> None:
+        if not self._buckets:
+            self._buckets.append([key])
+            self._maxes.append(key)
+            self._build_tree()
+            return
+        idx = min(bisect_left(self._maxes, key), len(self._buckets) - 1)
+        bucket = self._buckets[idx]
+        insort(bucket, key)
+        self._maxes[idx] = bucket[-1]
+        if len(bucket) > 2 * self._BUCKET_SIZE:
+            half = len(bucket) // 2
+            self._buckets[idx : idx + 1] = [bucket[:half], bucket[half:]]
+            self._maxes[idx : idx + 1] = [bucket[half - 1], bucket[-1]]
+            self._build_tree()
+        else:
+            self._tree_add(idx, 1)
+
+    def _remove(self, key: Tuple[int, int]) -> None:
+        idx = bisect_left(self._maxes, key)
+        bucket = self._buckets[idx]
+        del bucket[bisect_left(bucket, key)]
+        if bucket:
+            self._maxes[idx] = bucket[-1]
+            self._tree_add(idx, -1)
+        else:
+            del self._buckets[idx]
+            del self._maxes[idx]
+            self._build_tree()
+
+
+# Balance indexes of the global bank (under `None`) or of each guild's bank, built on first use.
+_balance_indexes: Dict[Optional[int], _BalanceIndex] = {}
+
+
 async def _init():
     global _config
     _config = Config.get_conf(None, 384734293238749, cog_name="Bank", force_registration=True)
+    _balance_indexes.clear()
     _config.register_global(**_DEFAULT_GLOBAL)
     _config.register_guild(**_DEFAULT_GUILD)
     _config.register_member(**_DEFAULT_MEMBER)
@@ -144,10 +254,11 @@ async def _process_data_deletion(
 
     async with _data_deletion_lock:
         await _config.user_from_id(user_id).clear()
-        all_members = await _config.all_members()
-        async for guild_id, member_dict in AsyncIter(all_members.items(), steps=100):
-            if user_id in member_dict:
+        async for guild_id, member_id, _ in _config.iter_members(fields=()):
+            if member_id == user_id:
                 await _config.member_from_ids(guild_id, user_id).clear()
+        for index in _balance_indexes.values():
+            index.discard(user_id)
 
 
 def is_owner_if_bank_global():
@@ -332,20 +443,92 @@ async def set_balance(member: Union[discord.Member, discord.User], amount: int)
         raise errors.BalanceTooHigh(
             user=member.display_name, max_balance=max_bal, currency_name=currency
         )
+    group = await _get_account_group(member)
+    async with group.balance.get_lock():
+        async with _config.batch():
+            await group.balance.set(amount)
+            await _init_account_info(group, member)
+        await _update_balance_index(member, amount)
+
+    return amount
+
+
+async def _get_account_group(member: Union[discord.Member, discord.User]) -> Group:
     if await is_global():
-        group = _config.user(member)
+        return _config.user(member)
     else:
-        group = _config.member(member)
-    await group.balance.set(amount)
+        return _config.member(member)
 
-    if await group.created_at() == 0:
-        time = _encoded_current_time()
-        await group.created_at.set(time)
 
-    if await group.name() == "":
-        await group.name.set(member.display_name)
+async def _update_balance_index(member: Union[discord.Member, discord.User], balance: int) -> None:
+    # This must be awaited straight after the balance is written, so updates can't be reordered.
+    # That holds since is_global() is cached by the time any balance is written.
+    index = _balance_indexes.get(None if await is_global() else member.guild.id)
+    if index is not None:
+        index.update(member.id, balance)
 
-    return amount
+
+async def _get_balance_index(guild: Optional[discord.Guild]) -> _BalanceIndex:
+    scope = None if guild is None else guild.id
+    index = _balance_indexes.get(scope)
+    if index is None:
+        if guild is None:
+            accounts = await _config.all_users(read_only=True)
+        else:
+            accounts = await _config.all_members(guild, read_only=True)
+        # Nothing can be written between taking the snapshot above and storing the index.
+        index = _balance_indexes[scope] = _BalanceIndex(
+            (user_id, account["balance"]) for user_id, account in accounts.items()
+        )
+    return index
+
+
+async def _init_account_info(group: Group, member: Union[discord.Member, discord.User]) -> None:
+    async with _config.batch():
+        if await group.created_at() == 0:
+            time = _encoded_current_time()
+            await group.created_at.set(time)
+
+        if await group.name() == "":
+            await group.name.set(member.display_name)
+
+
+async def _inc_balance(member: Union[discord.Member, discord.User], amount: int) -> int:
+    """Add the given (possibly negative) amount to an account balance.
+
+    The bounds are checked before anything is written, so a change which would take
+    the balance out of bounds leaves the account untouched. Checking them needs the
+    current balance, so this reads and then sets it rather than using `Value.inc`;
+    it's only atomic because every write to a balance goes through this module
+    under the balance's lock.
+    """
+    guild = getattr(member, "guild", None)
+    group = await _get_account_group(member)
+    default_bal = await get_default_balance(guild)
+    max_bal = await get_max_balance(guild)
+    async with group.balance.get_lock():
+        stored_balance = await group.balance(default=None)
+        balance = default_bal if stored_balance is None else stored_balance
+        if balance + amount < 0:
+            raise ValueError(
+                "Insufficient funds {} > {}".format(
+                    humanize_number(-amount, override_locale="en_US"),
+                    humanize_number(balance, override_locale="en_US"),
+                )
+            )
+        if balance + amount > max_bal:
+            currency = await get_currency_name(guild)
+            raise errors.BalanceTooHigh(
+                user=member.display_name, max_balance=max_bal, currency_name=currency
+            )
+        new_balance = balance + amount
+        async with _config.batch():
+            await group.balance.set(new_balance)
+            # an account with a stored balance has already been set up
+            if stored_balance is None:
+                await _init_account_info(group, member)
+        await _update_balance_index(member, new_balance)
+    return new_balance
 
 
 def _invalid_amount(amount: int) -> bool:
@@ -385,16 +568,7 @@ async def withdraw_credits(member: discord.Member, amount: int) -> int:
             )
         )
 
-    bal = await get_balance(member)
-    if amount > bal:
-        raise ValueError(
-            "Insufficient funds {} > {}".format(
-                humanize_number(amount, override_locale="en_US"),
-                humanize_number(bal, override_locale="en_US"),
-            )
-        )
-
-    return await set_balance(member, bal - amount)
+    return await _inc_balance(member, -amount)
 
 
 async def deposit_credits(member: discord.Member, amount: int) -> int:
@@ -418,6 +592,9 @@ async def deposit_credits(member: discord.Member, amount: int) -> int:
         If the deposit amount is invalid.
     TypeError
         If the deposit amount is not an `int`.
+    BalanceTooHigh
+        If the balance after the deposit would be greater than
+        ``bank._MAX_BALANCE``.
 
     """
     if not isinstance(amount, int):
@@ -429,8 +606,7 @@ async def deposit_credits(member: discord.Member, amount: int) -> int:
             )
         )
 
-    bal = await get_balance(member)
-    return await set_balance(member, amount + bal)
+    return await _inc_balance(member, amount)
 
 
 async def transfer_credits(
@@ -499,8 +675,13 @@ async def wipe_bank(guild: Optional[discord.Guild] = None) -> None:
     """
     if await is_global():
         await _config.clear_all_users()
+        _balance_indexes.clear()
     else:
         await _config.clear_all_members(guild)
+        if guild is None:
+            _balance_indexes.clear()
+        else:
+            _balance_indexes.pop(guild.id, None)
 
 
 async def bank_prune(bot: Red, guild: discord.Guild = None, user_id: int = None) -> None:
@@ -562,6 +743,7 @@ async def bank_prune(bot: Red, guild: discord.Guild = None, user_id: int = None)
             user_id = str(user_id)
             if user_id in bank_data:
                 del bank_data[user_id]
+    _balance_indexes.pop(None if global_bank else guild.id, None)
 
 
 async def get_leaderboard(positions: int = None, guild: discord.Guild = None) -> List[tuple]:
@@ -588,21 +770,47 @@ async def get_leaderboard(positions: int = None, guild: discord.Guild = None) ->
 
     """
     if await is_global():
-        raw_accounts = await _config.all_users()
-        if guild is not None:
-            tmp = raw_accounts.copy()
-            for acc in tmp:
-                if not guild.get_member(acc):
-                    del raw_accounts[acc]
+        group = _config._get_base_group(_config.USER)
+        index_guild = None
     else:
         if guild is None:
             raise TypeError("Expected a guild, got NoneType object instead!")
-        raw_accounts = await _config.all_members(guild)
-    sorted_acc = sorted(raw_accounts.items(), key=lambda x: x[1]["balance"], reverse=True)
+        group = _config._get_base_group(_config.MEMBER, str(guild.id))
+        index_guild = guild
+    # Only keep guild members when the bank is global but a guild was given.
+    member_filter = guild if index_guild is None else None
+
+    driver = _config._driver
+    if driver.can_sort:
+        # The backend can sort for us, without loading every account.
+        rows = await driver.fetch_sorted(
+            group.identifier_data,
+            "balance",
+            _DEFAULT_MEMBER["balance"],
+            limit=positions if member_filter is None else None,
+        )
+        leaderboard = [(int(pkey), {**_DEFAULT_MEMBER, **data}) for pkey, data in rows]
+        if member_filter is not None:
+            leaderboard = [acc for acc in leaderboard if member_filter.get_member(acc[0])]
+        return leaderboard[:positions]
+
+    index = await _get_balance_index(index_guild)
+    user_ids: Iterable[int] = index
+    if member_filter is not None:
+        user_ids = filter(member_filter.get_member, user_ids)
+    user_ids = list(islice(user_ids, positions))
     if positions is None:
-        return sorted_acc
-    else:
-        return sorted_acc[:positions]
+        if index_guild is None:
+            accounts = await _config.all_users(read_only=True)
+        else:
+            accounts = await _config.all_members(index_guild, read_only=True)
+        return [(user_id, dict(accounts[user_id])) for user_id in user_ids]
+    if index_guild is None:
+        return [(user_id, await _config.user_from_id(user_id).all()) for user_id in user_ids]
+    return [
+        (user_id, await _config.member_from_ids(index_guild.id, user_id).all())
+        for user_id in user_ids
+    ]
 
 
 async def get_leaderboard_position(
@@ -629,18 +837,20 @@ async def get_leaderboard_position(
     """
     if await is_global():
         guild = None
+        group = _config._get_base_group(_config.USER)
     else:
         guild = member.guild if hasattr(member, "guild") else None
-    try:
-        leaderboard = await get_leaderboard(None, guild)
-    except TypeError:
-        raise
-    else:
-        pos = discord.utils.find(lambda x: x[1][0] == member.id, enumerate(leaderboard, 1))
-        if pos is None:
-            return None
-        else:
-            return pos[0]
+        if guild is None:
+            raise TypeError("Expected a guild, got NoneType object instead!")
+        group = _config._get_base_group(_config.MEMBER, str(guild.id))
+
+    driver = _config._driver
+    if driver.can_sort:
+        return await driver.fetch_rank(
+            group.identifier_data, "balance", _DEFAULT_MEMBER["balance"], str(member.id)
+        )
+    index = await _get_balance_index(guild)
+    return index.rank(member.id)
 
 
 async def get_account(member: Union[discord.Member, discord.User]) -> Account:
@@ -729,6 +939,7 @@ async def set_global(global_: bool) -> bool:
 
     await _config.is_global.set(global_)
     _cache_is_global = global_
+    _balance_indexes.clear()
     return global_
 
 
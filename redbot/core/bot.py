@@ -24,8 +24,10 @@ from typing import (
     TypeVar,
     Callable,
     Awaitable,
+    Coroutine,
     Any,
     Literal,
+    Tuple,
     MutableMapping,
     Set,
     overload,
@@ -36,6 +38,7 @@ from types import MappingProxyType
 import discord
 from discord.ext import commands as dpy_commands
 from discord.ext.commands import when_mentioned_or
+from discord.ext.commands.view import StringView
 
 from . import Config, i18n, app_commands, commands, errors, _drivers, modlog, bank
 from ._cli import ExitCodes
@@ -46,12 +49,16 @@ from .dev_commands import Dev
 from ._events import init_events
 from ._global_checks import init_global_checks
 from ._settings_caches import (
+    BoundedCache,
+    CacheStats,
+    ConfigValueCache,
     PrefixManager,
     IgnoreManager,
     WhitelistBlacklistManager,
     DisabledCogCache,
     I18nManager,
 )
+from ._message_waiters import MessageWaiters
 from .utils.predicates import MessagePredicate
 from ._rpc import RPCMixin
 from .tree import RedTree
@@ -183,7 +190,6 @@ class Red(
         # GUILD_ID=0 for global setting
         self._config.init_custom(COMMAND_SCOPE, 2)
         self._config.register_custom(COMMAND_SCOPE, embeds=None)
-        # TODO: add cache for embed settings
 
         self._config.init_custom(SHARED_API_TOKENS, 2)
         self._config.register_custom(SHARED_API_TOKENS)
@@ -192,6 +198,12 @@ class Red(
         self._ignored_cache = IgnoreManager(self._config)
         self._whiteblacklist_cache = WhitelistBlacklistManager(self._config)
         self._i18n_cache = I18nManager(self._config)
+        self._value_cache = ConfigValueCache()
+        # message ID -> (content, prefix) of the messages
+        # which were dispatched in `message_without_command`
+        self._parsed_messages: BoundedCache[int, Tuple[str, Optional[str]]] = BoundedCache(
+            maxsize=1000
+        )
         self._bypass_cooldowns = False
 
         async def prefix_manager(bot, message) -> List[str]:
@@ -202,6 +214,7 @@ class Red(
 
         if "command_prefix" not in kwargs:
             kwargs["command_prefix"] = prefix_manager
+        self._default_prefix_manager = prefix_manager
 
         if "owner_id" in kwargs:
             raise RuntimeError("Red doesn't accept owner_id kwarg, use owner_ids instead.")
@@ -238,6 +251,7 @@ class Red(
         self._main_dir = bot_dir
         self._cog_mgr = CogManager()
         self._use_team_features = cli_flags.use_team_features
+        self._message_waiters = MessageWaiters()
         super().__init__(*args, help_command=None, tree_cls=RedTree, **kwargs)
         # Do not manually use the help formatter attribute here, see `send_help_for`,
         # for a documented API. The internals of this object are still subject to change.
@@ -970,6 +984,49 @@ class Red(
         """
         await self._prefix_cache.set_prefixes(guild=guild, prefixes=prefixes)
 
+    @property
+    def _settings_caches(self) -> Tuple[Any, ...]:
+        return (
+            self._prefix_cache,
+            self._disabled_cog_cache,
+            self._ignored_cache,
+            self._whiteblacklist_cache,
+            self._i18n_cache,
+            self._value_cache,
+        )
+
+    def _evict_guild_from_caches(self, guild: discord.Guild) -> None:
+        for cache in self._settings_caches:
+            cache.evict_guild(guild)
+
+    def get_settings_cache_stats(self) -> Dict[str, CacheStats]:
+        """
+        Get the hit and miss counters of the core settings caches,
+        along with their current and maximum sizes.
+
+        This is meant for monitoring how well the caches of settings read
+        on every message (such as prefixes, ignores and mod/admin roles) work.
+        The counters count lookups since the bot started.
+
+        Example
+        -------
+        ::
+
+            for name, stats in bot.get_settings_cache_stats().items():
+                print(f"{name}: {stats.hits} hits, {stats.misses} misses")
+
+        Returns
+        -------
+        Dict[str, CacheStats]
+            The stats of each cache, keyed by the cache's name. Each one is
+            a named tuple with the ``hits``, ``misses``, ``size`` and
+            ``maxsize`` fields.
+        """
+        ret = {}
+        for cache in self._settings_caches:
+            ret.update(cache.cache_stats())
+        return ret
+
     async def get_embed_color(self, location: discord.abc.Messageable) -> discord.Color:
         """
         Get the embed color for a location. This takes into account all related settings.
@@ -989,13 +1046,107 @@ class Red(
 
         if (
             guild
-            and await self._config.guild(guild).use_bot_color()
+            and await self._value_cache.get(self._config.guild(guild).use_bot_color)
             and not isinstance(location, discord.Member)
         ):
             return guild.me.color
 
         return self._color
 
+    def dispatch(self, event_name: str, /, *args, **kwargs) -> None:
+        if event_name == "message":
+            self._message_waiters.resolve(args[0])
+        super().dispatch(event_name, *args, **kwargs)
+
+    def wait_for(
+        self,
+        event: str,
+        /,
+        *,
+        check: Optional[Callable[..., bool]] = None,
+        timeout: Optional[float] = None,
+    ) -> Coroutine[Any, Any, Any]:
+        """
+        Wait for a WebSocket event to be dispatched.
+
+        This works the same as `discord.Client.wait_for`, except that
+        waiting for a ``"message"`` event with a `MessagePredicate` check
+        is done with `wait_for_message`, when the predicate is for a known
+        channel or author.
+        """
+        if event.lower() == "message" and isinstance(check, MessagePredicate):
+            if check._channel_id is not None or check._author_id is not None:
+                return self._wait_for_indexed_message(
+                    check._channel_id, check._author_id, check, timeout
+                )
+        return super().wait_for(event, check=check, timeout=timeout)
+
+    def wait_for_message(
+        self,
+        *,
+        channel: Optional[discord.abc.Snowflake] = None,
+        author: Optional[discord.abc.Snowflake] = None,
+        check: Optional[Callable[[discord.Message], bool]] = None,
+        timeout: Optional[float] = None,
+    ) -> Coroutine[Any, Any, discord.Message]:
+        """
+        Wait for a message to be sent.
+
+        Unlike ``wait_for("message", check=...)``, which checks
+        the predicate against every message the bot receives, this only
+        checks ``check`` against messages sent in ``channel`` and by
+        ``author``. Prefer this whenever the channel or author is known,
+        e.g. when waiting for a reply to a command.
+
+        Example
+        -------
+        ::
+
+            msg = await bot.wait_for_message(
+                channel=ctx.channel, author=ctx.author, timeout=30
+            )
+
+        Parameters
+        ----------
+        channel : Optional[discord.abc.Snowflake]
+            The channel the message has to be sent in.
+        author : Optional[discord.abc.Snowflake]
+            The user the message has to be sent by.
+        check : Optional[Callable[[discord.Message], bool]]
+            The predicate the message has to match.
+        timeout : Optional[float]
+            The number of seconds to wait before timing out and raising
+            `asyncio.TimeoutError`.
+
+        Raises
+        ------
+        asyncio.TimeoutError
+            If a timeout is provided and it was reached.
+
+        Returns
+        -------
+        discord.Message
+            The first message that matched.
+        """
+        channel_id = channel.id if channel is not None else None
+        author_id = author.id if author is not None else None
+        if channel_id is None and author_id is None:
+            return super().wait_for("message", check=check, timeout=timeout)
+        return self._wait_for_indexed_message(channel_id, author_id, check, timeout)
+
+    def _wait_for_indexed_message(
+        self,
+        channel_id: Optional[int],
+        author_id: Optional[int],
+        check: Optional[Callable[[discord.Message], bool]],
+        timeout: Optional[float],
+    ) -> Coroutine[Any, Any, discord.Message]:
+        # the waiter is registered right away, like in `discord.Client.wait_for`,
+        # so that no message sent before the returned coroutine is awaited is missed
+        future = asyncio.get_running_loop().create_future()
+        self._message_waiters.add(future, channel_id=channel_id, author_id=author_id, check=check)
+        return asyncio.wait_for(future, timeout)
+
     async def get_or_fetch_user(self, user_id: int) -> discord.User:
         """
         Retrieves a `discord.User` based on their ID.
@@ -1113,10 +1264,10 @@ class Red(
 
             if maybe_mod_role_id:
                 mod_roles.append(maybe_mod_role_id)
-                await self._config.guild(guild_obj).mod_role.set(mod_roles)
+                await self._value_cache.set(self._config.guild(guild_obj).mod_role, mod_roles)
             if maybe_admin_role_id:
                 admin_roles.append(maybe_admin_role_id)
-                await self._config.guild(guild_obj).admin_role.set(admin_roles)
+                await self._value_cache.set(self._config.guild(guild_obj).admin_role, admin_roles)
         log.info("Done updating guild configs to support multiple mod/admin roles")
 
     # end Config migrations
@@ -1342,7 +1493,7 @@ class Red(
             if command is None:
                 return None
             scope = self._config.custom(COMMAND_SCOPE, command.qualified_name, guild_id)
-            return await scope.embeds()
+            return await self._value_cache.get(scope.embeds)
 
         # using dpy_commands.Context to keep the Messageable contract in full
         if isinstance(channel, dpy_commands.Context):
@@ -1369,24 +1520,28 @@ class Red(
             if check_permissions and not channel.permissions_for(channel.guild.me).embed_links:
                 return False
 
-            channel_setting = await self._config.channel_from_id(channel_id).embeds()
+            channel_setting = await self._value_cache.get(
+                self._config.channel_from_id(channel_id).embeds
+            )
             if channel_setting is not None:
                 return channel_setting
 
             if (command_setting := await get_command_setting(channel.guild.id)) is not None:
                 return command_setting
 
-            if (guild_setting := await self._config.guild(channel.guild).embeds()) is not None:
+            guild_setting = await self._value_cache.get(self._config.guild(channel.guild).embeds)
+            if guild_setting is not None:
                 return guild_setting
         else:
             user = channel
-            if (user_setting := await self._config.user(user).embeds()) is not None:
+            user_setting = await self._value_cache.get(self._config.user(user).embeds)
+            if user_setting is not None:
                 return user_setting
 
         if (global_command_setting := await get_command_setting(0)) is not None:
             return global_command_setting
 
-        global_setting = await self._config.embeds()
+        global_setting = await self._value_cache.get(self._config.embeds)
         return global_setting
 
     async def use_buttons(self) -> bool:
@@ -1454,7 +1609,9 @@ class Red(
     async def is_admin(self, member: discord.Member) -> bool:
         """Checks if a member is an admin of their guild."""
         try:
-            for snowflake in await self._config.guild(member.guild).admin_role():
+            for snowflake in await self._value_cache.get(
+                self._config.guild(member.guild).admin_role
+            ):
                 if member.get_role(snowflake):
                     return True
         except AttributeError:  # someone passed a webhook to this
@@ -1464,10 +1621,14 @@ class Red(
     async def is_mod(self, member: discord.Member) -> bool:
         """Checks if a member is a mod or admin of their guild."""
         try:
-            for snowflake in await self._config.guild(member.guild).admin_role():
+            for snowflake in await self._value_cache.get(
+                self._config.guild(member.guild).admin_role
+            ):
                 if member.get_role(snowflake):
                     return True
-            for snowflake in await self._config.guild(member.guild).mod_role():
+            for snowflake in await self._value_cache.get(
+                self._config.guild(member.guild).mod_role
+            ):
                 if member.get_role(snowflake):
                     return True
         except AttributeError:  # someone passed a webhook to this
@@ -1479,7 +1640,7 @@ class Red(
         Gets the admin roles for a guild.
         """
         ret: List[discord.Role] = []
-        for snowflake in await self._config.guild(guild).admin_role():
+        for snowflake in await self._value_cache.get(self._config.guild(guild).admin_role):
             r = guild.get_role(snowflake)
             if r:
                 ret.append(r)
@@ -1490,7 +1651,7 @@ class Red(
         Gets the mod roles for a guild.
         """
         ret: List[discord.Role] = []
-        for snowflake in await self._config.guild(guild).mod_role():
+        for snowflake in await self._value_cache.get(self._config.guild(guild).mod_role):
             r = guild.get_role(snowflake)
             if r:
                 ret.append(r)
@@ -1500,13 +1661,13 @@ class Red(
         """
         Gets the admin role ids for a guild id.
         """
-        return await self._config.guild(discord.Object(id=guild_id)).admin_role()
+        return list(await self._value_cache.get(self._config.guild_from_id(guild_id).admin_role))
 
     async def get_mod_role_ids(self, guild_id: int) -> List[int]:
         """
         Gets the mod role ids for a guild id.
         """
-        return await self._config.guild(discord.Object(id=guild_id)).mod_role()
+        return list(await self._value_cache.get(self._config.guild_from_id(guild_id).mod_role))
 
     @overload
     async def get_shared_api_tokens(self, service_name: str = ...) -> Dict[str, str]:
@@ -1612,8 +1773,44 @@ class Red(
             self.dispatch("red_api_tokens_update", service, MappingProxyType({}))
 
     async def get_context(self, message, /, *, cls=commands.Context):
+        """
+        Same as base method, but matches the prefixes with the precompiled
+        matcher of the message's guild, and reuses the prefix match which
+        `process_commands` already did for messages dispatched in
+        ``message_without_command``.
+        """
+        if isinstance(message, discord.Message):
+            parsed = self._parsed_messages.get(message.id)
+            if parsed is not None and parsed[0] == message.content:
+                return self._context_with_prefix(message, parsed[1], cls=cls)
+            if (
+                self.command_prefix is self._default_prefix_manager
+                and self.user is not None
+                and message.author.id != self.user.id
+            ):
+                mention_prefixes = (
+                    (f"<@{self.user.id}> ", f"<@!{self.user.id}> ")
+                    if self._cli_flags.mentionable
+                    else ()
+                )
+                matcher = await self._prefix_cache.get_matcher(message.guild, mention_prefixes)
+                return self._context_with_prefix(message, matcher.match(message.content), cls=cls)
         return await super().get_context(message, cls=cls)
 
+    def _context_with_prefix(self, message, prefix: Optional[str], /, *, cls):
+        view = StringView(message.content)
+        ctx = cls(prefix=None, view=view, bot=self, message=message)
+        if prefix is None:
+            return ctx
+        view.skip_string(prefix)
+        if self.strip_after_prefix:
+            view.skip_ws()
+        invoker = view.get_word()
+        ctx.invoked_with = invoker
+        ctx.prefix = prefix
+        ctx.command = self.all_commands.get(invoker)
+        return ctx
+
     async def process_commands(self, message: discord.Message, /):
         """
         Same as base method, but dispatches an additional event for cogs
@@ -1655,6 +1852,8 @@ class Red(
             ctx = None
 
         if ctx is None or ctx.valid is False:
+            if ctx is not None:
+                self._parsed_messages[message.id] = (message.content, ctx.prefix)
             self.dispatch("message_without_command", message)
 
     @staticmethod
@@ -2213,6 +2412,7 @@ class Red(
             return
 
         await self._config.user_from_id(user_id).clear()
+        self._value_cache.invalidate(self._config.user_from_id(user_id).embeds)
         all_guilds = await self._config.all_guilds()
 
         async for guild_id, guild_data in AsyncIter(all_guilds.items(), steps=100):
@@ -1,5 +1,7 @@
 import asyncio
 import collections.abc
+import contextlib
+import contextvars
 import json
 import logging
 import pickle
@@ -7,9 +9,12 @@ import weakref
 from typing import (
     Any,
     AsyncContextManager,
+    AsyncIterator,
     Awaitable,
     Dict,
     Generator,
+    Iterable,
+    List,
     MutableMapping,
     Optional,
     Tuple,
@@ -20,7 +25,7 @@ from typing import (
 
 import discord
 
-from ._drivers import BaseDriver, ConfigCategory, IdentifierData, get_driver
+from ._drivers import BaseDriver, ConfigCategory, FrozenDict, IdentifierData, freeze, get_driver
 
 __all__ = (
     "ConfigCategory",
@@ -36,6 +41,10 @@ _T = TypeVar("_T")
 
 _config_cache = weakref.WeakValueDictionary()
 _retrieved = weakref.WeakSet()
+# Maps Config instances to the changes queued by their active `Config.batch`.
+_batches: contextvars.ContextVar[Dict["Config", "_Batch"]] = contextvars.ContextVar(
+    "_batches", default={}
+)
 
 
 class ConfigMeta(type):
@@ -89,28 +98,45 @@ class _ValueCtxManager(Awaitable[_T], AsyncContextManager[_T]):  # pylint: disab
     to ``__init__`` is set to ``True``.
     """
 
-    def __init__(self, value_obj: "Value", coro: Awaitable[Any], *, acquire_lock: bool):
+    def __init__(
+        self,
+        value_obj: "Value",
+        coro: Awaitable[Any],
+        *,
+        acquire_lock: bool,
+        read_only: bool = False,
+    ):
         self.value_obj = value_obj
         self.coro = coro
         self.raw_value = None
         self.__original_value = None
         self.__acquire_lock = acquire_lock
+        self.__read_only = read_only
         self.__lock = self.value_obj.get_lock()
 
     def __await__(self) -> Generator[Any, None, _T]:
         return self.coro.__await__()
 
     async def __aenter__(self) -> _T:
+        if self.__read_only:
+            self.coro.close()
+            raise TypeError("A read-only config value can't be used as a context manager.")
         if self.__acquire_lock is True:
             await self.__lock.acquire()
-        self.raw_value = await self
-        if not isinstance(self.raw_value, (list, dict)):
-            raise TypeError(
-                "Type of retrieved value must be mutable (i.e. "
-                "list or dict) in order to use a config value as "
-                "a context manager."
-            )
-        self.__original_value = pickle.loads(pickle.dumps(self.raw_value, -1))
+        try:
+            self.raw_value = await self
+            if not isinstance(self.raw_value, (list, dict)):
+                raise TypeError(
+                    "Type of retrieved value must be mutable (i.e. "
+                    "list or dict) in order to use a config value as "
+                    "a context manager."
+                )
+            self.__original_value = pickle.loads(pickle.dumps(self.raw_value, -1))
+        except BaseException:
+            # __aexit__ isn't called when __aenter__ raises
+            if self.__acquire_lock is True:
+                self.__lock.release()
+            raise
         return self.raw_value
 
     async def __aexit__(self, exc_type, exc, tb):
@@ -180,14 +206,20 @@ class Value:
         """
         return self._config._lock_cache.setdefault(self.identifier_data, asyncio.Lock())
 
-    async def _get(self, default=...):
+    async def _get(self, default=..., *, read_only: bool = False):
         try:
-            ret = await self._driver.get(self.identifier_data)
+            if read_only:
+                ret = await self._driver.get_frozen(self.identifier_data)
+            else:
+                ret = await self._driver.get(self.identifier_data)
         except KeyError:
-            return default if default is not ... else self.default
+            ret = default if default is not ... else self.default
+            return freeze(ret) if read_only else ret
         return ret
 
-    def __call__(self, default=..., *, acquire_lock: bool = True) -> _ValueCtxManager[Any]:
+    def __call__(
+        self, default=..., *, acquire_lock: bool = True, read_only: bool = False
+    ) -> _ValueCtxManager[Any]:
         """Get the literal value of this data element.
 
         Each `Value` object is created by the `Group.__getattr__` method. The
@@ -231,6 +263,13 @@ class Value:
             Set to ``False`` to disable the acquisition of the value's
             lock over the context manager body. Defaults to ``True``.
             Has no effect when not used as a context manager.
+        read_only : bool
+            Set to ``True`` to get a read-only view of the data instead
+            of a copy of it. Dicts and lists will be returned as
+            immutable `collections.abc.Mapping` and `collections.abc.Sequence`
+            views, which is much cheaper for large amounts of data. The
+            view will not reflect any later changes to the data.
+            Cannot be used with the context manager. Defaults to ``False``.
 
         Returns
         -------
@@ -240,7 +279,12 @@ class Value:
             with` syntax, on gets the value on entrance, and sets it on exit.
 
         """
-        return _ValueCtxManager(self, self._get(default), acquire_lock=acquire_lock)
+        return _ValueCtxManager(
+            self,
+            self._get(default, read_only=read_only),
+            acquire_lock=acquire_lock,
+            read_only=read_only,
+        )
 
     async def set(self, value):
         """Set the value of the data elements pointed to by `identifiers`.
@@ -263,13 +307,90 @@ class Value:
         """
         if isinstance(value, dict):
             value = _str_key_dict(value)
-        await self._driver.set(self.identifier_data, value=value)
+        await self._config._set(self.identifier_data, value)
 
     async def clear(self):
         """
         Clears the value from record for the data element pointed to by `identifiers`.
         """
-        await self._driver.clear(self.identifier_data)
+        await self._config._clear(self.identifier_data)
+
+    async def inc(self, delta: Union[int, float] = 1, *, default=...) -> Union[int, float]:
+        """Atomically increment this number by the given amount.
+
+        This avoids the race between getting and then setting the value,
+        and only needs a single operation on the storage backend.
+
+        Example
+        -------
+        ::
+
+            # Adds 5 to the guild specific value of "count" and returns the result
+            new_count = await config.guild(some_guild).count.inc(5)
+
+        Parameters
+        ----------
+        delta : Union[int, float]
+            The amount to increment the value by. May be negative.
+            Defaults to ``1``.
+
+        Other Parameters
+        ----------------
+        default : Union[int, float]
+            The value to increment if nothing has been stored yet.
+            Defaults to the registered default, or ``0`` if there is none.
+
+        Returns
+        -------
+        Union[int, float]
+            The new value.
+
+        Raises
+        ------
+        StoredTypeError
+            If the stored value is not a number.
+        RuntimeError
+            If called inside a `Config.batch`.
+
+        """
+        self._config._check_no_batch("inc")
+        if default is ...:
+            default = 0 if self.default is None else self.default
+        return await self._driver.inc(self.identifier_data, delta, default)
+
+    async def toggle(self, *, default=...) -> bool:
+        """Atomically toggle this boolean.
+
+        Example
+        -------
+        ::
+
+            # Flips the global value of "enabled" and returns the result
+            enabled = await config.enabled.toggle()
+
+        Other Parameters
+        ----------------
+        default : bool
+            The value to toggle if nothing has been stored yet.
+            Defaults to the registered default, or ``False`` if there is none.
+
+        Returns
+        -------
+        bool
+            The new value.
+
+        Raises
+        ------
+        StoredTypeError
+            If the stored value is not a boolean.
+        RuntimeError
+            If called inside a `Config.batch`.
+
+        """
+        self._config._check_no_batch("toggle")
+        if default is ...:
+            default = False if self.default is None else self.default
+        return await self._driver.toggle(self.identifier_data, default)
 
 
 class Group(Value):
@@ -309,7 +430,15 @@ class Group(Value):
     def defaults(self):
         return pickle.loads(pickle.dumps(self._defaults, -1))
 
-    async def _get(self, default: Dict[str, Any] = ...) -> Dict[str, Any]:
+    async def _get(
+        self, default: Dict[str, Any] = ..., *, read_only: bool = False
+    ) -> Dict[str, Any]:
+        if read_only:
+            default = default if default is not ... else self._defaults
+            raw = await super()._get(default, read_only=True)
+            if isinstance(raw, FrozenDict) and isinstance(default, dict):
+                return raw.with_defaults(default)
+            return raw
         default = default if default is not ... else self.defaults
         raw = await super()._get(default)
         if isinstance(raw, dict):
@@ -392,7 +521,7 @@ class Group(Value):
         """
         path = tuple(str(p) for p in nested_path)
         identifier_data = self.identifier_data.get_child(*path)
-        await self._driver.clear(identifier_data)
+        await self._config._clear(identifier_data)
 
     def is_group(self, item: Any) -> bool:
         """A helper method for `__getattr__`. Most developers will have no need
@@ -521,7 +650,9 @@ class Group(Value):
                 return self.nested_update(raw, default)
             return raw
 
-    def all(self, *, acquire_lock: bool = True) -> _ValueCtxManager[Dict[str, Any]]:
+    def all(
+        self, *, acquire_lock: bool = True, read_only: bool = False
+    ) -> _ValueCtxManager[Dict[str, Any]]:
         """Get a dictionary representation of this group's data.
 
         The return value of this method can also be used as an asynchronous
@@ -537,6 +668,9 @@ class Group(Value):
         acquire_lock : bool
             Same as the ``acquire_lock`` keyword parameter in
             `Value.__call__`.
+        read_only : bool
+            Same as the ``read_only`` keyword parameter in
+            `Value.__call__`.
 
         Returns
         -------
@@ -544,7 +678,7 @@ class Group(Value):
             All of this Group's attributes, resolved as raw data values.
 
         """
-        return self(acquire_lock=acquire_lock)
+        return self(acquire_lock=acquire_lock, read_only=read_only)
 
     def nested_update(
         self, current: collections.abc.Mapping, defaults: Dict[str, Any] = ...
@@ -596,7 +730,15 @@ class Group(Value):
         identifier_data = self.identifier_data.get_child(*path)
         if isinstance(value, dict):
             value = _str_key_dict(value)
-        await self._driver.set(identifier_data, value=value)
+        await self._config._set(identifier_data, value)
+
+
+class _Batch:
+    """The changes queued by a single `Config.batch` block."""
+
+    def __init__(self):
+        self.changes: List[Tuple[IdentifierData, Tuple[Any, ...]]] = []
+        self.closed = False
 
 
 class Config(metaclass=ConfigMeta):
@@ -1175,7 +1317,9 @@ class Config(metaclass=ConfigMeta):
             raise ValueError(f"Group identifier not initialized: {group_identifier}")
         return self._get_base_group(str(group_identifier), *map(str, identifiers))
 
-    async def _all_from_scope(self, scope: str) -> Dict[int, Dict[Any, Any]]:
+    async def _all_from_scope(
+        self, scope: str, *, read_only: bool = False
+    ) -> Dict[int, Dict[Any, Any]]:
         """Get a dict of all values from a particular scope of data.
 
         :code:`scope` must be one of the constants attributed to
@@ -1188,6 +1332,18 @@ class Config(metaclass=ConfigMeta):
         """
         group = self._get_base_group(scope)
         ret = {}
+
+        if read_only:
+            defaults = self._defaults.get(scope, {})
+            try:
+                view = await self._driver.get_frozen(group.identifier_data)
+            except KeyError:
+                pass
+            else:
+                for k, v in view.items_with_defaults(defaults, nested=False):
+                    ret[int(k)] = v
+            return ret
+
         defaults = self.defaults.get(scope, {})
 
         try:
@@ -1202,7 +1358,7 @@ class Config(metaclass=ConfigMeta):
 
         return ret
 
-    async def all_guilds(self) -> dict:
+    async def all_guilds(self, *, read_only: bool = False) -> dict:
         """Get all guild data as a dict.
 
         Note
@@ -1210,6 +1366,13 @@ class Config(metaclass=ConfigMeta):
         The return value of this method will include registered defaults for
         values which have not yet been set.
 
+        Other Parameters
+        ----------------
+        read_only : bool
+            Set to ``True`` to get read-only views of each guild's data
+            instead of copies. See the ``read_only`` keyword parameter in
+            `Value.__call__`.
+
         Returns
         -------
         dict
@@ -1217,9 +1380,9 @@ class Config(metaclass=ConfigMeta):
             :code:`GUILD_ID -> data`.
 
         """
-        return await self._all_from_scope(self.GUILD)
+        return await self._all_from_scope(self.GUILD, read_only=read_only)
 
-    async def all_channels(self) -> dict:
+    async def all_channels(self, *, read_only: bool = False) -> dict:
         """Get all channel data as a dict.
 
         Note
@@ -1227,6 +1390,13 @@ class Config(metaclass=ConfigMeta):
         The return value of this method will include registered defaults for
         values which have not yet been set.
 
+        Other Parameters
+        ----------------
+        read_only : bool
+            Set to ``True`` to get read-only views of each channel's data
+            instead of copies. See the ``read_only`` keyword parameter in
+            `Value.__call__`.
+
         Returns
         -------
         dict
@@ -1234,9 +1404,9 @@ class Config(metaclass=ConfigMeta):
             :code:`CHANNEL_ID -> data`.
 
         """
-        return await self._all_from_scope(self.CHANNEL)
+        return await self._all_from_scope(self.CHANNEL, read_only=read_only)
 
-    async def all_roles(self) -> dict:
+    async def all_roles(self, *, read_only: bool = False) -> dict:
         """Get all role data as a dict.
 
         Note
@@ -1244,6 +1414,13 @@ class Config(metaclass=ConfigMeta):
         The return value of this method will include registered defaults for
         values which have not yet been set.
 
+        Other Parameters
+        ----------------
+        read_only : bool
+            Set to ``True`` to get read-only views of each role's data
+            instead of copies. See the ``read_only`` keyword parameter in
+            `Value.__call__`.
+
         Returns
         -------
         dict
@@ -1251,9 +1428,9 @@ class Config(metaclass=ConfigMeta):
             :code:`ROLE_ID -> data`.
 
         """
-        return await self._all_from_scope(self.ROLE)
+        return await self._all_from_scope(self.ROLE, read_only=read_only)
 
-    async def all_users(self) -> dict:
+    async def all_users(self, *, read_only: bool = False) -> dict:
         """Get all user data as a dict.
 
         Note
@@ -1261,6 +1438,13 @@ class Config(metaclass=ConfigMeta):
         The return value of this method will include registered defaults for
         values which have not yet been set.
 
+        Other Parameters
+        ----------------
+        read_only : bool
+            Set to ``True`` to get read-only views of each user's data
+            instead of copies. See the ``read_only`` keyword parameter in
+            `Value.__call__`.
+
         Returns
         -------
         dict
@@ -1268,7 +1452,7 @@ class Config(metaclass=ConfigMeta):
             :code:`USER_ID -> data`.
 
         """
-        return await self._all_from_scope(self.USER)
+        return await self._all_from_scope(self.USER, read_only=read_only)
 
     def _all_members_from_guild(self, guild_data: dict) -> dict:
         ret = {}
@@ -1279,7 +1463,14 @@ class Config(metaclass=ConfigMeta):
             ret[int(member_id)] = new_member_data
         return ret
 
-    async def all_members(self, guild: discord.Guild = None) -> dict:
+    def _all_members_from_guild_view(self, guild_view: FrozenDict) -> dict:
+        defaults = self._defaults.get(self.MEMBER, {})
+        return {
+            int(member_id): member_view
+            for member_id, member_view in guild_view.items_with_defaults(defaults, nested=False)
+        }
+
+    async def all_members(self, guild: discord.Guild = None, *, read_only: bool = False) -> dict:
         """Get data for all members.
 
         If :code:`guild` is specified, only the data for the members of that
@@ -1298,6 +1489,13 @@ class Config(metaclass=ConfigMeta):
             The guild to get the member data from. Can be omitted if data
             from every member of all guilds is desired.
 
+        Other Parameters
+        ----------------
+        read_only : bool
+            Set to ``True`` to get read-only views of each member's data
+            instead of copies. See the ``read_only`` keyword parameter in
+            `Value.__call__`.
+
         Returns
         -------
         dict
@@ -1305,25 +1503,193 @@ class Config(metaclass=ConfigMeta):
 
         """
         ret = {}
+        if read_only:
+            get, from_guild = self._driver.get_frozen, self._all_members_from_guild_view
+        else:
+            get, from_guild = self._driver.get, self._all_members_from_guild
         if guild is None:
             group = self._get_base_group(self.MEMBER)
             try:
-                dict_ = await self._driver.get(group.identifier_data)
+                dict_ = await get(group.identifier_data)
             except KeyError:
                 pass
             else:
                 for guild_id, guild_data in dict_.items():
-                    ret[int(guild_id)] = self._all_members_from_guild(guild_data)
+                    ret[int(guild_id)] = from_guild(guild_data)
         else:
             group = self._get_base_group(self.MEMBER, str(guild.id))
             try:
-                guild_data = await self._driver.get(group.identifier_data)
+                guild_data = await get(group.identifier_data)
             except KeyError:
                 pass
             else:
-                ret = self._all_members_from_guild(guild_data)
+                ret = from_guild(guild_data)
         return ret
 
+    async def _iter_scope(
+        self,
+        scope: str,
+        *primary_keys: str,
+        fields: Optional[Iterable[str]],
+        read_only: bool,
+    ) -> AsyncIterator[Tuple[Tuple[int, ...], Any]]:
+        """Iterate over the entries of a particular scope of data, one at a time.
+
+        Yields the rest of each entry's primary key (casted to `int`) along
+        with its data. Registered defaults are only merged in for the keys
+        each entry is missing, and only the given ``fields`` are included.
+        """
+        group = self._get_base_group(scope, *primary_keys)
+        defaults = self._defaults.get(scope, {})
+        if fields is not None:
+            fields = tuple(fields)
+            defaults = {k: defaults[k] for k in fields if k in defaults}
+        async for pkeys, data in self._driver.iter_entries(
+            group.identifier_data, fields, read_only=read_only
+        ):
+            if read_only:
+                data = data.with_defaults(defaults, nested=False)
+            else:
+                for key, default in defaults.items():
+                    if key not in data:
+                        data[key] = pickle.loads(pickle.dumps(default, -1))
+            yield tuple(map(int, pkeys)), data
+
+    async def iter_guilds(
+        self, *, fields: Optional[Iterable[str]] = None, read_only: bool = False
+    ) -> AsyncIterator[Tuple[int, dict]]:
+        """Iterate over all guild data.
+
+        This is like `all_guilds`, but reads the data one guild at a time,
+        so it can be used to scan every guild in bounded memory.
+
+        Note
+        ----
+        Guilds' data will include registered defaults for values which
+        have not yet been set.
+
+        Other Parameters
+        ----------------
+        fields : Iterable[str], optional
+            When given, only these top-level keys are included in each
+            guild's data. Drivers which support it don't read anything else.
+        read_only : bool
+            Set to ``True`` to get read-only views of each guild's data
+            instead of copies. See the ``read_only`` keyword parameter in
+            `Value.__call__`.
+
+        Yields
+        ------
+        Tuple[int, dict]
+            Pairs of :code:`GUILD_ID, data`, in no particular order.
+
+        """
+        async for (guild_id,), data in self._iter_scope(
+            self.GUILD, fields=fields, read_only=read_only
+        ):
+            yield guild_id, data
+
+    async def iter_channels(
+        self, *, fields: Optional[Iterable[str]] = None, read_only: bool = False
+    ) -> AsyncIterator[Tuple[int, dict]]:
+        """Iterate over all channel data.
+
+        This is like `all_channels`, but reads the data one channel at a time.
+        See `iter_guilds` for details.
+
+        Yields
+        ------
+        Tuple[int, dict]
+            Pairs of :code:`CHANNEL_ID, data`, in no particular order.
+
+        """
+        async for (channel_id,), data in self._iter_scope(
+            self.CHANNEL, fields=fields, read_only=read_only
+        ):
+            yield channel_id, data
+
+    async def iter_roles(
+        self, *, fields: Optional[Iterable[str]] = None, read_only: bool = False
+    ) -> AsyncIterator[Tuple[int, dict]]:
+        """Iterate over all role data.
+
+        This is like `all_roles`, but reads the data one role at a time.
+        See `iter_guilds` for details.
+
+        Yields
+        ------
+        Tuple[int, dict]
+            Pairs of :code:`ROLE_ID, data`, in no particular order.
+
+        """
+        async for (role_id,), data in self._iter_scope(
+            self.ROLE, fields=fields, read_only=read_only
+        ):
+            yield role_id, data
+
+    async def iter_users(
+        self, *, fields: Optional[Iterable[str]] = None, read_only: bool = False
+    ) -> AsyncIterator[Tuple[int, dict]]:
+        """Iterate over all user data.
+
+        This is like `all_users`, but reads the data one user at a time.
+        See `iter_guilds` for details.
+
+        Example
+        -------
+        ::
+
+            async for user_id, data in conf.iter_users(fields=("balance",)):
+                total += data["balance"]
+
+        Yields
+        ------
+        Tuple[int, dict]
+            Pairs of :code:`USER_ID, data`, in no particular order.
+
+        """
+        async for (user_id,), data in self._iter_scope(
+            self.USER, fields=fields, read_only=read_only
+        ):
+            yield user_id, data
+
+    async def iter_members(
+        self,
+        guild: discord.Guild = None,
+        *,
+        fields: Optional[Iterable[str]] = None,
+        read_only: bool = False,
+    ) -> AsyncIterator[tuple]:
+        """Iterate over member data.
+
+        This is like `all_members`, but reads the data one member at a time.
+        See `iter_guilds` for details.
+
+        Parameters
+        ----------
+        guild : `discord.Guild`, optional
+            The guild to get the member data from. Can be omitted if data
+            from every member of all guilds is desired.
+
+        Yields
+        ------
+        tuple
+            If :code:`guild` is specified, pairs of :code:`MEMBER_ID, data`.
+            Otherwise, triples of :code:`GUILD_ID, MEMBER_ID, data`.
+            Either way, in no particular order.
+
+        """
+        if guild is None:
+            async for (guild_id, member_id), data in self._iter_scope(
+                self.MEMBER, fields=fields, read_only=read_only
+            ):
+                yield guild_id, member_id, data
+        else:
+            async for (member_id,), data in self._iter_scope(
+                self.MEMBER, str(guild.id), fields=fields, read_only=read_only
+            ):
+                yield member_id, data
+
     async def _clear_scope(self, *scopes: str):
         """Clear all data in a particular scope.
 
@@ -1428,6 +1794,77 @@ class Config(metaclass=ConfigMeta):
         """
         await self._clear_scope(str(group_identifier))
 
+    @contextlib.asynccontextmanager
+    async def batch(self) -> AsyncIterator[None]:
+        """Group several sets and clears into a single write to the backend.
+
+        Inside this context manager, calls to ``set()``, ``set_raw()``,
+        ``clear()`` and ``clear_raw()`` on anything from this Config are
+        queued rather than written. Once the block exits they are all
+        applied at once, in order, or not at all if the block raised.
+
+        Example
+        -------
+        ::
+
+            async with config.batch():
+                await config.member(member).balance.set(100)
+                await config.member(member).created_at.set(now)
+                await config.guild(member.guild).last_payout.set(now)
+
+        .. note::
+
+            Reads inside the block don't see the queued changes, and
+            nested ``batch()`` blocks join the outermost one.
+
+        Raises
+        ------
+        CannotSetSubfield
+            If one of the queued sets tried to set a sub-field of
+            something which isn't a dict. Nothing is written in that case.
+
+        """
+        batches = _batches.get()
+        if self in batches and not batches[self].closed:
+            yield
+            return
+
+        batch = _Batch()
+        token = _batches.set({**batches, self: batch})
+        try:
+            yield
+        finally:
+            _batches.reset(token)
+            # Tasks started inside the block still see it; they now write directly.
+            batch.closed = True
+        if batch.changes:
+            await self._driver.apply_batch(batch.changes)
+
+    def _get_batch(self) -> Optional[_Batch]:
+        batch = _batches.get().get(self)
+        if batch is None or batch.closed:
+            return None
+        return batch
+
+    def _check_no_batch(self, method: str) -> None:
+        if self._get_batch() is not None:
+            raise RuntimeError(f"{method}() can't be used inside a Config.batch() block.")
+
+    async def _set(self, identifier_data: IdentifierData, value: Any) -> None:
+        batch = self._get_batch()
+        if batch is None:
+            await self._driver.set(identifier_data, value=value)
+        else:
+            # Copy now, in case the caller changes the value before the batch is applied.
+            batch.changes.append((identifier_data, (pickle.loads(pickle.dumps(value, -1)),)))
+
+    async def _clear(self, identifier_data: IdentifierData) -> None:
+        batch = self._get_batch()
+        if batch is None:
+            await self._driver.clear(identifier_data)
+        else:
+            batch.changes.append((identifier_data, ()))
+
     def get_guilds_lock(self) -> asyncio.Lock:
         """Get a lock for all guild data.
 
@@ -1198,10 +1198,10 @@ class Core(commands.commands._RuleDropper, commands.Cog, CoreLogic):
         """
         current = await self.bot._config.embeds()
         if current:
-            await self.bot._config.embeds.set(False)
+            await self.bot._value_cache.set(self.bot._config.embeds, False)
             await ctx.send(_("Embeds are now disabled by default."))
         else:
-            await self.bot._config.embeds.clear()
+            await self.bot._value_cache.clear(self.bot._config.embeds)
             await ctx.send(_("Embeds are now enabled by default."))
 
     @embedset.command(name="server", aliases=["guild"])
@@ -1226,11 +1226,11 @@ class Core(commands.commands._RuleDropper, commands.Cog, CoreLogic):
         - `[enabled]` - Whether to use embeds on this server. Leave blank to reset to default.
         """
         if enabled is None:
-            await self.bot._config.guild(ctx.guild).embeds.clear()
+            await self.bot._value_cache.clear(self.bot._config.guild(ctx.guild).embeds)
             await ctx.send(_("Embeds will now fall back to the global setting."))
             return
 
-        await self.bot._config.guild(ctx.guild).embeds.set(enabled)
+        await self.bot._value_cache.set(self.bot._config.guild(ctx.guild).embeds, enabled)
         await ctx.send(
             _("Embeds are now enabled for this guild.")
             if enabled
@@ -1304,11 +1304,15 @@ class Core(commands.commands._RuleDropper, commands.Cog, CoreLogic):
         command_name = command.qualified_name
 
         if enabled is None:
-            await self.bot._config.custom("COMMAND", command_name, 0).embeds.clear()
+            await self.bot._value_cache.clear(
+                self.bot._config.custom("COMMAND", command_name, 0).embeds
+            )
             await ctx.send(_("Embeds will now fall back to the global setting."))
             return
 
-        await self.bot._config.custom("COMMAND", command_name, 0).embeds.set(enabled)
+        await self.bot._value_cache.set(
+            self.bot._config.custom("COMMAND", command_name, 0).embeds, enabled
+        )
         if enabled:
             await ctx.send(
                 _("Embeds are now enabled for {command_name} command.").format(
@@ -1349,11 +1353,15 @@ class Core(commands.commands._RuleDropper, commands.Cog, CoreLogic):
         command_name = command.qualified_name
 
         if enabled is None:
-            await self.bot._config.custom("COMMAND", command_name, ctx.guild.id).embeds.clear()
+            await self.bot._value_cache.clear(
+                self.bot._config.custom("COMMAND", command_name, ctx.guild.id).embeds
+            )
             await ctx.send(_("Embeds will now fall back to the server setting."))
             return
 
-        await self.bot._config.custom("COMMAND", command_name, ctx.guild.id).embeds.set(enabled)
+        await self.bot._value_cache.set(
+            self.bot._config.custom("COMMAND", command_name, ctx.guild.id).embeds, enabled
+        )
         if enabled:
             await ctx.send(
                 _("Embeds are now enabled for {command_name} command.").format(
@@ -1398,11 +1406,11 @@ class Core(commands.commands._RuleDropper, commands.Cog, CoreLogic):
             - `[enabled]` - Whether to use embeds in this channel. Leave blank to reset to default.
         """
         if enabled is None:
-            await self.bot._config.channel(channel).embeds.clear()
+            await self.bot._value_cache.clear(self.bot._config.channel(channel).embeds)
             await ctx.send(_("Embeds will now fall back to the global setting."))
             return
 
-        await self.bot._config.channel(channel).embeds.set(enabled)
+        await self.bot._value_cache.set(self.bot._config.channel(channel).embeds, enabled)
         await ctx.send(
             _("Embeds are now {} for this channel.").format(
                 _("enabled") if enabled else _("disabled")
@@ -1429,11 +1437,11 @@ class Core(commands.commands._RuleDropper, commands.Cog, CoreLogic):
         - `[enabled]` - Whether to use embeds in your DMs. Leave blank to reset to default.
         """
         if enabled is None:
-            await self.bot._config.user(ctx.author).embeds.clear()
+            await self.bot._value_cache.clear(self.bot._config.user(ctx.author).embeds)
             await ctx.send(_("Embeds will now fall back to the global setting."))
             return
 
-        await self.bot._config.user(ctx.author).embeds.set(enabled)
+        await self.bot._value_cache.set(self.bot._config.user(ctx.author).embeds, enabled)
         await ctx.send(
             _("Embeds are now enabled for you in DMs.")
             if enabled
@@ -3349,6 +3357,7 @@ class Core(commands.commands._RuleDropper, commands.Cog, CoreLogic):
             if role.id in roles:
                 return await ctx.send(_("This role is already an admin role."))
             roles.append(role.id)
+        ctx.bot._value_cache.invalidate(ctx.bot._config.guild(ctx.guild).admin_role)
         await ctx.send(_("That role is now considered an admin role."))
 
     @_set_roles.command(name="addmodrole")
@@ -3376,6 +3385,7 @@ class Core(commands.commands._RuleDropper, commands.Cog, CoreLogic):
             if role.id in roles:
                 return await ctx.send(_("This role is already a mod role."))
             roles.append(role.id)
+        ctx.bot._value_cache.invalidate(ctx.bot._config.guild(ctx.guild).mod_role)
         await ctx.send(_("That role is now considered a mod role."))
 
     @_set_roles.command(
@@ -3398,6 +3408,7 @@ class Core(commands.commands._RuleDropper, commands.Cog, CoreLogic):
             if role.id not in roles:
                 return await ctx.send(_("That role was not an admin role to begin with."))
             roles.remove(role.id)
+        ctx.bot._value_cache.invalidate(ctx.bot._config.guild(ctx.guild).admin_role)
         await ctx.send(_("That role is no longer considered an admin role."))
 
     @_set_roles.command(
@@ -3420,6 +3431,7 @@ class Core(commands.commands._RuleDropper, commands.Cog, CoreLogic):
             if role.id not in roles:
                 return await ctx.send(_("That role was not a mod role to begin with."))
             roles.remove(role.id)
+        ctx.bot._value_cache.invalidate(ctx.bot._config.guild(ctx.guild).mod_role)
         await ctx.send(_("That role is no longer considered a mod role."))
 
     # -- End Set Roles Commands -- ###
@@ -3996,7 +4008,9 @@ class Core(commands.commands._RuleDropper, commands.Cog, CoreLogic):
         - `[p]set usebotcolour`
         """
         current_setting = await ctx.bot._config.guild(ctx.guild).use_bot_color()
-        await ctx.bot._config.guild(ctx.guild).use_bot_color.set(not current_setting)
+        await ctx.bot._value_cache.set(
+            ctx.bot._config.guild(ctx.guild).use_bot_color, not current_setting
+        )
         await ctx.send(
             _("The bot {} use its configured color for embeds.").format(
                 _("will not") if not current_setting else _("will")
@@ -4020,7 +4034,7 @@ class Core(commands.commands._RuleDropper, commands.Cog, CoreLogic):
         - `[p]set serverfuzzy`
         """
         current_setting = await ctx.bot._config.guild(ctx.guild).fuzzy()
-        await ctx.bot._config.guild(ctx.guild).fuzzy.set(not current_setting)
+        await ctx.bot._value_cache.set(ctx.bot._config.guild(ctx.guild).fuzzy, not current_setting)
         await ctx.send(
             _("Fuzzy command search has been {} for this server.").format(
                 _("disabled") if current_setting else _("enabled")
@@ -4041,7 +4055,7 @@ class Core(commands.commands._RuleDropper, commands.Cog, CoreLogic):
         - `[p]set fuzzy`
         """
         current_setting = await ctx.bot._config.fuzzy()
-        await ctx.bot._config.fuzzy.set(not current_setting)
+        await ctx.bot._value_cache.set(ctx.bot._config.fuzzy, not current_setting)
         await ctx.send(
             _("Fuzzy command search has been {} in DMs.").format(
                 _("disabled") if current_setting else _("enabled")
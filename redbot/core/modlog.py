@@ -2,8 +2,22 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
 from datetime import datetime, timedelta, timezone
-from typing import List, Literal, Union, Optional, cast, TYPE_CHECKING
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    Literal,
+    Mapping,
+    Union,
+    Optional,
+    Tuple,
+    cast,
+    TYPE_CHECKING,
+)
 
 import discord
 
@@ -32,6 +46,7 @@ __all__ = (
     "get_latest_case",
     "get_all_cases",
     "get_cases_for_member",
+    "iter_cases",
     "create_case",
     "get_casetype",
     "get_all_casetypes",
@@ -54,6 +69,140 @@ _data_deletion_lock = asyncio.Lock()
 _ = Translator("ModLog", __file__)
 
 
+class _CaseIndex:
+    """Secondary indexes over the cases of a single guild.
+
+    Keeps the numbers of the guild's cases, sorted, along with the
+    numbers of the cases for each user, each action type and each
+    day (by creation time).
+    """
+
+    _BUCKET_SECONDS = 86400
+
+    def __init__(self, cases: Mapping[str, Mapping[str, Any]]):
+        self._entries: Dict[int, Tuple[Optional[int], str, int]] = {}
+        self.numbers: List[int] = []
+        self.by_user: Dict[Optional[int], List[int]] = defaultdict(list)
+        self.by_action: Dict[str, List[int]] = defaultdict(list)
+        self.by_bucket: Dict[int, List[int]] = defaultdict(list)
+        self._buckets: List[int] = []
+        for case_number, data in sorted((int(k), v) for k, v in cases.items()):
+            self.add(case_number, data)
+
+    def add(self, case_number: int, data: Mapping[str, Any]) -> None:
+        """Add the given case, replacing any earlier entry for its number."""
+        if case_number in self._entries:
+            self.remove(case_number)
+        entry = self._entries[case_number] = (
+            data.get("user"),
+            data["action_type"],
+            data["created_at"],
+        )
+        user_id, action_type, created_at = entry
+        bucket = created_at // self._BUCKET_SECONDS
+        if bucket not in self.by_bucket:
+            insort(self._buckets, bucket)
+        for numbers in (
+            self.numbers,
+            self.by_user[user_id],
+            self.by_action[action_type],
+            self.by_bucket[bucket],
+        ):
+            # Cases are nearly always added in order.
+            if not numbers or numbers[-1] < case_number:
+                numbers.append(case_number)
+            else:
+                insort(numbers, case_number)
+
+    def remove(self, case_number: int) -> None:
+        entry = self._entries.pop(case_number, None)
+        if entry is None:
+            return
+        user_id, action_type, created_at = entry
+        bucket = created_at // self._BUCKET_SECONDS
+        for mapping, key in (
+            (self.by_user, user_id),
+            (self.by_action, action_type),
+            (self.by_bucket, bucket),
+        ):
+            numbers = mapping[key]
+            del numbers[bisect_left(numbers, case_number)]
+            if not numbers:
+                del mapping[key]
+        del self.numbers[bisect_left(self.numbers, case_number)]
+        if bucket not in self.by_bucket:
+            del self._buckets[bisect_left(self._buckets, bucket)]
+
+    def query(
+        self,
+        *,
+        member_id: Optional[int] = None,
+        action_type: Optional[str] = None,
+        after: Optional[int] = None,
+        before: Optional[int] = None,
+    ) -> List[int]:
+        """Get the sorted numbers of the cases matching all of the given filters.
+
+        ``after`` and ``before`` are inclusive UNIX times.
+        """
+        candidates = []
+        if member_id is not None:
+            candidates.append(self.by_user.get(member_id, []))
+        if action_type is not None:
+            candidates.append(self.by_action.get(action_type, []))
+        if after is not None or before is not None:
+            first = (
+                0 if after is None else bisect_left(self._buckets, after // self._BUCKET_SECONDS)
+            )
+            last = (
+                len(self._buckets)
+                if before is None
+                else bisect_right(self._buckets, before // self._BUCKET_SECONDS)
+            )
+            in_range = []
+            for bucket in self._buckets[first:last]:
+                in_range.extend(self.by_bucket[bucket])
+            candidates.append(sorted(in_range))
+        if not candidates:
+            return self.numbers.copy()
+
+        # Walk the smallest list and check the rest of the filters on each entry.
+        numbers = min(candidates, key=len)
+        ret = []
+        for case_number in numbers:
+            user_id, case_action_type, created_at = self._entries[case_number]
+            if member_id is not None and user_id != member_id:
+                continue
+            if action_type is not None and case_action_type != action_type:
+                continue
+            if after is not None and created_at < after:
+                continue
+            if before is not None and created_at > before:
+                continue
+            ret.append(case_number)
+        return ret
+
+
+# Case indexes of the guilds whose cases were queried, by guild ID.
+_case_indexes: Dict[int, _CaseIndex] = {}
+
+
+async def _get_case_index(guild: discord.Guild) -> _CaseIndex:
+    index = _case_indexes.get(guild.id)
+    if index is None:
+        cases = await _config.custom(_CASES, str(guild.id)).all(read_only=True)
+        # Nothing can be written between taking the snapshot above and storing the index.
+        index = _case_indexes[guild.id] = _CaseIndex(cases)
+    return index
+
+
+def _update_case_index(guild_id: int, case_number: int, data: Mapping[str, Any]) -> None:
+    # This must be called straight after the case is written, so updates can't be reordered.
+    index = _case_indexes.get(guild_id)
+    if index is not None:
+        index.add(case_number, data)
+
+
 async def _process_data_deletion(
     *, requester: Literal["discord_deleted_user", "owner", "user", "user_strict"], user_id: int
 ):
@@ -82,6 +231,7 @@ async def _process_data_deletion(
                     case["moderator"] = 0xDE1
                 if (case.get("amended_by", 0) or 0) == user_id:
                     case["amended_by"] = 0xDE1
+        _case_indexes.clear()
 
 
 async def _init(bot: Red):
@@ -89,6 +239,7 @@ async def _init(bot: Red):
     global _bot_ref
     _bot_ref = bot
     _config = Config.get_conf(None, 1354799444, cog_name="ModLog")
+    _case_indexes.clear()
     _config.register_global(schema_version=1)
     _config.register_guild(mod_log=None, casetypes={}, latest_case_number=0)
     _config.init_custom(_CASETYPES, 1)
@@ -306,7 +457,9 @@ class Case:
         # in order to avoid making an API request to "edit" the message with changes.
         # In all other cases, edit() is correct method.
         self.message = message
-        await _config.custom(_CASES, str(self.guild.id), str(self.case_number)).set(self.to_json())
+        data = self.to_json()
+        await _config.custom(_CASES, str(self.guild.id), str(self.case_number)).set(data)
+        _update_case_index(self.guild.id, self.case_number, data)
 
     async def edit(self, data: dict):
         """
@@ -338,7 +491,9 @@ class Case:
         if isinstance(self.channel, discord.Thread):
             self.parent_channel_id = self.channel.parent_id
 
-        await _config.custom(_CASES, str(self.guild.id), str(self.case_number)).set(self.to_json())
+        data = self.to_json()
+        await _config.custom(_CASES, str(self.guild.id), str(self.case_number)).set(data)
+        _update_case_index(self.guild.id, self.case_number, data)
         self.bot.dispatch("modlog_case_edit", self)
         if not self.message:
             return
@@ -857,15 +1012,8 @@ async def get_all_cases(guild: discord.Guild, bot: Red) -> List[Case]:
         A list of all cases for the guild
 
     """
-    cases = await _config.custom(_CASES, str(guild.id)).all()
-    try:
-        mod_channel = await get_modlog_channel(guild)
-    except RuntimeError:
-        mod_channel = None
-    return [
-        await Case.from_json(mod_channel, bot, case_number, case_data, guild=guild)
-        for case_number, case_data in cases.items()
-    ]
+    index = await _get_case_index(guild)
+    return [case async for case in _iter_cases(guild, bot, index.numbers.copy())]
 
 
 async def get_cases_for_member(
@@ -900,8 +1048,6 @@ async def get_cases_for_member(
         Fetching the user failed.
     """
 
-    cases = await _config.custom(_CASES, str(guild.id)).all()
-
     if not (member_id or member):
         raise ValueError("Expected a member or a member id to be provided.") from None
 
@@ -911,18 +1057,100 @@ async def get_cases_for_member(
     if not member:
         member = bot.get_user(member_id) or member_id
 
-    try:
-        modlog_channel = await get_modlog_channel(guild)
-    except RuntimeError:
-        modlog_channel = None
+    index = await _get_case_index(guild)
+    case_numbers = index.query(member_id=member_id)
+    return [case async for case in _iter_cases(guild, bot, case_numbers, user=member)]
 
-    cases = [
-        await Case.from_json(modlog_channel, bot, case_number, case_data, user=member, guild=guild)
-        for case_number, case_data in cases.items()
-        if case_data["user"] == member_id
-    ]
 
-    return cases
+async def iter_cases(
+    guild: discord.Guild,
+    *,
+    member_id: Optional[int] = None,
+    action_type: Optional[str] = None,
+    after: Optional[datetime] = None,
+    before: Optional[datetime] = None,
+    newest_first: bool = True,
+    page_size: int = 25,
+) -> AsyncIterator[Case]:
+    """
+    Iterates over the cases in a guild, optionally only those matching some filters.
+
+    The matching cases are looked up in an index and loaded a page at a
+    time, once the iteration reaches them, so getting the first few cases
+    takes the same time no matter how many cases the guild has.
+
+    Example
+    -------
+    ::
+
+        async for case in modlog.iter_cases(guild, member_id=member.id):
+            if case.action_type == "ban":
+                break
+
+    Parameters
+    ----------
+    guild: `discord.Guild`
+        The guild to get the cases from.
+    member_id: Optional[int]
+        Only get cases about the user with this ID.
+    action_type: Optional[str]
+        Only get cases of this action type.
+    after: Optional[datetime]
+        Only get cases created at or after this time.
+    before: Optional[datetime]
+        Only get cases created at or before this time.
+    newest_first: bool
+        Whether to iterate from the latest case back.
+        Defaults to ``True``.
+    page_size: int
+        How many cases to load at once.
+        Defaults to ``25``.
+
+    Yields
+    ------
+    Case
+        The matching cases.
+
+    Raises
+    ------
+    ValueError
+        If ``page_size`` is not positive.
+    """
+    index = await _get_case_index(guild)
+    case_numbers = index.query(
+        member_id=member_id,
+        action_type=action_type,
+        after=None if after is None else int(after.timestamp()),
+        before=None if before is None else int(before.timestamp()),
+    )
+    if newest_first:
+        case_numbers.reverse()
+    async for case in _iter_cases(guild, _bot_ref, case_numbers, page_size=page_size):
+        yield case
+
+
+async def _iter_cases(
+    guild: discord.Guild, bot: Red, case_numbers: List[int], *, page_size: int = 25, **kwargs
+) -> AsyncIterator[Case]:
+    if page_size < 1:
+        raise ValueError("page_size must be a positive integer.")
+    try:
+        mod_channel = await get_modlog_channel(guild)
+    except RuntimeError:
+        mod_channel = None
+    for start in range(0, len(case_numbers), page_size):
+        page = case_numbers[start : start + page_size]
+        page_data = await asyncio.gather(
+            *(
+                _config.custom(_CASES, str(guild.id), str(case_number)).all(read_only=True)
+                for case_number in page
+            )
+        )
+        for case_number, data in zip(page, page_data):
+            if not data:
+                # The case was removed after the numbers were looked up.
+                continue
+            yield await Case.from_json(mod_channel, bot, case_number, data, guild=guild, **kwargs)
 
 
 async def create_case(
@@ -1018,7 +1246,9 @@ async def create_case(
             message=None,
             last_known_username=last_known_username,
         )
-        await _config.custom(_CASES, str(guild.id), str(next_case_number)).set(case.to_json())
+        data = case.to_json()
+        await _config.custom(_CASES, str(guild.id), str(next_case_number)).set(data)
+        _update_case_index(guild.id, next_case_number, data)
         await _config.guild(guild).latest_case_number.set(next_case_number)
 
     await set_contextual_locales_from_guild(bot, guild)
@@ -1265,6 +1495,7 @@ async def reset_cases(guild: discord.Guild) -> None:
 
     """
     await _config.custom(_CASES, str(guild.id)).clear()
+    _case_indexes.pop(guild.id, None)
     await _config.guild(guild).latest_case_number.clear()
 
 
@@ -118,9 +118,9 @@ async def fuzzy_command_search(
 
     """
     if ctx.guild is not None:
-        enabled = await ctx.bot._config.guild(ctx.guild).fuzzy()
+        enabled = await ctx.bot._value_cache.get(ctx.bot._config.guild(ctx.guild).fuzzy)
     else:
-        enabled = await ctx.bot._config.fuzzy()
+        enabled = await ctx.bot._value_cache.get(ctx.bot._config.fuzzy)
 
     if not enabled:
         return None
@@ -0,0 +1,185 @@
+import asyncio
+import contextlib
+import heapq
+import itertools
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+__all__ = ("Scheduler",)
+
+log = logging.getLogger("red.scheduler")
+
+# The wall clock can be changed while we sleep,
+# so we never sleep longer than this before checking it again.
+MAX_SLEEP = 300.0
+
+
+class _Entry:
+    __slots__ = ("when", "seq", "callback", "args")
+
+    def __init__(
+        self,
+        when: float,
+        seq: int,
+        callback: Callable[..., Awaitable[Any]],
+        args: Tuple[Any, ...],
+    ):
+        self.when = when
+        self.seq = seq
+        self.callback = callback
+        self.args = args
+
+
+class Scheduler:
+    """
+    Runs coroutine functions at given points in time.
+
+    All pending calls are kept in a heap keyed by their timestamp and are waited
+    on by a single task, which only wakes up when the earliest of them is due.
+    This makes the work done proportional to the number of calls which are due,
+    rather than to the number of calls that are pending.
+
+    Each call is scheduled under a key, which is what is used to replace
+    or cancel it. The scheduler itself isn't persisted; the owner is expected to
+    keep the expiry times in its Config and schedule them again on load.
+
+    Parameters
+    ----------
+    name : str
+        The name used for the scheduler's task and in its log messages.
+    """
+
+    def __init__(self, name: str = "scheduler"):
+        self.name = name
+        # (timestamp, sequence number, key); entries replaced or cancelled since
+        # they were pushed are left in the heap and skipped when they are popped
+        self._heap: List[Tuple[float, int, Hashable]] = []
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._counter = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def when(self, key: Hashable) -> Optional[float]:
+        """Get the timestamp the call under ``key`` is scheduled at, if there is one."""
+        entry = self._entries.get(key)
+        return entry.when if entry is not None else None
+
+    def schedule(
+        self, key: Hashable, when: float, callback: Callable[..., Awaitable[Any]], *args: Any
+    ) -> None:
+        """
+        Schedule ``callback(*args)`` to be run at the given timestamp.
+
+        This replaces any call which was already scheduled under ``key``.
+        Timestamps in the past are run as soon as possible.
+
+        Parameters
+        ----------
+        key : Hashable
+            The key to schedule the call under.
+        when : float
+            The POSIX timestamp to run the call at.
+        callback
+            The coroutine function to call.
+        *args
+            The arguments to call ``callback`` with.
+        """
+        seq = next(self._counter)
+        self._entries[key] = _Entry(when, seq, callback, args)
+        if not self._heap or when < self._heap[0][0]:
+            self._wake()
+        heapq.heappush(self._heap, (when, seq, key))
+        self._maybe_compact()
+
+    def cancel(self, key: Hashable) -> bool:
+        """
+        Cancel the call scheduled under ``key``.
+
+        Calls which have already started running aren't affected.
+
+        Returns
+        -------
+        bool
+            Whether there was a call scheduled under ``key``.
+        """
+        if self._entries.pop(key, None) is None:
+            return False
+        self._maybe_compact()
+        return True
+
+    def start(self) -> None:
+        """Start running the scheduled calls once they are due."""
+        if self._task is not None and not self._task.done():
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name=f"red.{self.name}")
+
+    def stop(self) -> None:
+        """
+        Stop the scheduler and cancel the calls that are currently running.
+
+        Calls which haven't started yet stay scheduled
+        and will run if the scheduler is started again.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for task in self._running:
+            task.cancel()
+        self._running.clear()
+
+    def _wake(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _maybe_compact(self) -> None:
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [(entry.when, entry.seq, key) for key, entry in self._entries.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_due(self, now: float) -> List[_Entry]:
+        due = []
+        heap = self._heap
+        while heap:
+            when, seq, key = heap[0]
+            entry = self._entries.get(key)
+            if entry is None or entry.seq != seq:
+                # replaced or cancelled
+                heapq.heappop(heap)
+                continue
+            if when > now:
+                break
+            heapq.heappop(heap)
+            del self._entries[key]
+            due.append(entry)
+        return due
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None
+        while True:
+            self._wakeup.clear()
+            now = time.time()
+            for entry in self._pop_due(now):
+                task = asyncio.create_task(entry.callback(*entry.args))
+                self._running.add(task)
+                task.add_done_callback(self._call_done)
+            # after _pop_due(), the top of the heap is a pending call, if there's any
+            timeout = min(self._heap[0][0] - now, MAX_SLEEP) if self._heap else MAX_SLEEP
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+
+    def _call_done(self, task: asyncio.Task) -> None:
+        self._running.discard(task)
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            log.error("A call scheduled by the %s failed.", self.name, exc_info=exc)
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Generator, Union
+from typing import Any, Callable, Generator, Iterable, List, Optional, TypeVar, Union
 
 import apsw
 
-__all__ = ["APSWConnectionWrapper"]
+__all__ = ["APSWConnectionWrapper", "ThreadedAPSWConnection"]
+
+_T = TypeVar("_T")
 
 
 # TODO (mikeshardmind): make this inherit typing_extensions.Protocol
@@ -58,4 +62,127 @@ class APSWConnectionWrapper(apsw.Connection, ContextManagerMixin):
         super().__init__(str(filename), *args, **kwargs)
 
 
-# TODO (mikeshardmind): asyncio friendly ThreadedAPSWConnection class
+class ThreadedAPSWConnection:
+    """
+    An asyncio friendly `APSWConnectionWrapper`.
+
+    The connection is opened, used and closed by a single long-lived worker thread,
+    so statements run one at a time and in the order they were submitted,
+    without ever blocking the event loop.
+
+    Example
+    -------
+    ::
+
+        db = ThreadedAPSWConnection(cog_data_path(self) / "cog.db")
+        await db.execute("CREATE TABLE IF NOT EXISTS t (k INTEGER PRIMARY KEY, v TEXT)")
+        row = await db.fetchone("SELECT v FROM t WHERE k = :k", {"k": 1})
+        await db.aclose()
+    """
+
+    def __init__(self, filename: Union[Path, str], *args, **kwargs):
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix="ThreadedAPSWConnection")
+        self._closed = False
+        self._connection: Optional[APSWConnectionWrapper] = None
+        self._open_error: Optional[Exception] = None
+        # The connection is opened by the first job the worker runs,
+        # so every statement submitted after this one sees it opened.
+        self._executor.submit(self._open, filename, args, kwargs)
+
+    def _open(self, filename: Union[Path, str], args: tuple, kwargs: dict) -> None:
+        try:
+            self._connection = APSWConnectionWrapper(filename, *args, **kwargs)
+        except Exception as exc:
+            self._open_error = exc
+
+    def _call(self, func: Callable[..., _T], args: tuple) -> _T:
+        if self._connection is None:
+            raise RuntimeError("The connection could not be opened.") from self._open_error
+        return func(self._connection, *args)
+
+    def _close_connection(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+
+    @property
+    def closed(self) -> bool:
+        """Whether `close` has been called."""
+        return self._closed
+
+    async def run(self, func: Callable[..., _T], *args: Any) -> _T:
+        """
+        Run ``func(connection, *args)`` on the worker thread and return its result.
+
+        Use this to run several statements back to back without
+        other queued statements being interleaved with them.
+        """
+        if self._closed:
+            raise RuntimeError("This connection has been closed.")
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, self._call, func, args
+        )
+
+    async def execute(self, sql: str, params: Optional[Any] = None) -> None:
+        """Execute a statement, discarding any rows it returns."""
+        await self.run(_execute, sql, params)
+
+    async def executemany(self, sql: str, seq_of_params: Iterable[Any]) -> None:
+        """Execute a statement once per set of parameters, in a single transaction."""
+        await self.run(_executemany, sql, list(seq_of_params))
+
+    async def fetchone(self, sql: str, params: Optional[Any] = None) -> Optional[tuple]:
+        """Execute a query and return its first row, or ``None`` if it returned no rows."""
+        return await self.run(_fetchone, sql, params)
+
+    async def fetchall(self, sql: str, params: Optional[Any] = None) -> List[tuple]:
+        """Execute a query and return all of its rows."""
+        return await self.run(_fetchall, sql, params)
+
+    def close(self) -> None:
+        """
+        Close the connection and stop the worker thread.
+
+        Statements which were already submitted are run before the connection is closed.
+        This blocks until they have finished, so use `aclose` on the event loop instead.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._executor.submit(self._close_connection)
+        self._executor.shutdown(wait=True)
+
+    async def aclose(self) -> None:
+        """
+        Close the connection and stop the worker thread, without blocking the event loop.
+
+        Statements which were already submitted are run before the connection is closed.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        future = self._executor.submit(self._close_connection)
+        self._executor.shutdown(wait=False)
+        await asyncio.wrap_future(future)
+
+
+def _execute(connection: APSWConnectionWrapper, sql: str, params: Optional[Any]) -> None:
+    with connection.with_cursor() as cursor:
+        for _row in cursor.execute(sql, params):
+            pass
+
+
+def _executemany(connection: APSWConnectionWrapper, sql: str, seq_of_params: List[Any]) -> None:
+    with connection.transaction() as cursor:
+        cursor.executemany(sql, seq_of_params)
+
+
+def _fetchone(
+    connection: APSWConnectionWrapper, sql: str, params: Optional[Any]
+) -> Optional[tuple]:
+    with connection.with_cursor() as cursor:
+        return cursor.execute(sql, params).fetchone()
+
+
+def _fetchall(connection: APSWConnectionWrapper, sql: str, params: Optional[Any]) -> List[tuple]:
+    with connection.with_cursor() as cursor:
+        return cursor.execute(sql, params).fetchall()
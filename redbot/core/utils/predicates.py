@@ -62,6 +62,11 @@ class MessagePredicate(Callable[[discord.Message], bool]):
     def __init__(self, predicate: Callable[["MessagePredicate", discord.Message], bool]) -> None:
         self._pred: Callable[["MessagePredicate", discord.Message], bool] = predicate
         self.result = None
+        # The channel and author every matching message has, if they are known.
+        # `Red.wait_for()` uses these to only check the predicate against
+        # messages sent in that channel or by that author.
+        self._channel_id: Optional[int] = None
+        self._author_id: Optional[int] = None
 
     def __call__(self, message: discord.Message) -> bool:
         return self._pred(self, message)
@@ -105,7 +110,7 @@ class MessagePredicate(Callable[[discord.Message], bool]):
             channel = channel or ctx.channel
             user = user or ctx.author
 
-        return cls(
+        pred = cls(
             lambda self, m: (user is None or user.id == m.author.id)
             and (
                 channel is None
@@ -116,6 +121,27 @@ class MessagePredicate(Callable[[discord.Message], bool]):
                 )
             )
         )
+        if user is not None:
+            pred._author_id = user.id
+        if channel is not None:
+            if not check_dm_channel:
+                pred._channel_id = channel.id
+            elif user is None or user.id == channel.id:
+                # only the recipient of the DM channel can match
+                pred._author_id = channel.id
+        return pred
+
+    @classmethod
+    def _in_context(
+        cls,
+        context: "MessagePredicate",
+        predicate: Callable[["MessagePredicate", discord.Message], bool],
+    ) -> "MessagePredicate":
+        # Create a predicate which only matches messages that ``context`` matches.
+        pred = cls(predicate)
+        pred._channel_id = context._channel_id
+        pred._author_id = context._author_id
+        return pred
 
     @classmethod
     def cancelled(
@@ -142,8 +168,9 @@ class MessagePredicate(Callable[[discord.Message], bool]):
 
         """
         same_context = cls.same_context(ctx, channel, user)
-        return cls(
-            lambda self, m: (same_context(m) and m.content.lower() == f"{ctx.prefix}cancel")
+        return cls._in_context(
+            same_context,
+            lambda self, m: (same_context(m) and m.content.lower() == f"{ctx.prefix}cancel"),
         )
 
     @classmethod
@@ -187,7 +214,7 @@ class MessagePredicate(Callable[[discord.Message], bool]):
                 return False
             return True
 
-        return cls(predicate)
+        return cls._in_context(same_context, predicate)
 
     @classmethod
     def valid_int(
@@ -227,7 +254,7 @@ class MessagePredicate(Callable[[discord.Message], bool]):
             else:
                 return True
 
-        return cls(predicate)
+        return cls._in_context(same_context, predicate)
 
     @classmethod
     def valid_float(
@@ -267,7 +294,7 @@ class MessagePredicate(Callable[[discord.Message], bool]):
             else:
                 return True
 
-        return cls(predicate)
+        return cls._in_context(same_context, predicate)
 
     @classmethod
     def positive(
@@ -311,7 +338,7 @@ class MessagePredicate(Callable[[discord.Message], bool]):
                 else:
                     return False
 
-        return cls(predicate)
+        return cls._in_context(same_context, predicate)
 
     @classmethod
     def valid_role(
@@ -357,7 +384,7 @@ class MessagePredicate(Callable[[discord.Message], bool]):
             self.result = role
             return True
 
-        return cls(predicate)
+        return cls._in_context(same_context, predicate)
 
     @classmethod
     def valid_member(
@@ -407,7 +434,7 @@ class MessagePredicate(Callable[[discord.Message], bool]):
             self.result = result
             return True
 
-        return cls(predicate)
+        return cls._in_context(same_context, predicate)
 
     @classmethod
     def valid_text_channel(
@@ -457,7 +484,7 @@ class MessagePredicate(Callable[[discord.Message], bool]):
             self.result = result
             return True
 
-        return cls(predicate)
+        return cls._in_context(same_context, predicate)
 
     @classmethod
     def has_role(
@@ -510,7 +537,7 @@ class MessagePredicate(Callable[[discord.Message], bool]):
             self.result = role
             return True
 
-        return cls(predicate)
+        return cls._in_context(same_context, predicate)
 
     @classmethod
     def equal_to(
@@ -540,7 +567,9 @@ class MessagePredicate(Callable[[discord.Message], bool]):
 
         """
         same_context = cls.same_context(ctx, channel, user)
-        return cls(lambda self, m: same_context(m) and m.content == value)
+        return cls._in_context(
+            same_context, lambda self, m: same_context(m) and m.content == value
+        )
 
     @classmethod
     def lower_equal_to(
@@ -570,7 +599,9 @@ class MessagePredicate(Callable[[discord.Message], bool]):
 
         """
         same_context = cls.same_context(ctx, channel, user)
-        return cls(lambda self, m: same_context(m) and m.content.lower() == value)
+        return cls._in_context(
+            same_context, lambda self, m: same_context(m) and m.content.lower() == value
+        )
 
     @classmethod
     def less(
@@ -601,7 +632,10 @@ class MessagePredicate(Callable[[discord.Message], bool]):
         """
         valid_int = cls.valid_int(ctx, channel, user)
         valid_float = cls.valid_float(ctx, channel, user)
-        return cls(lambda self, m: (valid_int(m) or valid_float(m)) and float(m.content) < value)
+        return cls._in_context(
+            valid_int,
+            lambda self, m: (valid_int(m) or valid_float(m)) and float(m.content) < value,
+        )
 
     @classmethod
     def greater(
@@ -632,7 +666,10 @@ class MessagePredicate(Callable[[discord.Message], bool]):
         """
         valid_int = cls.valid_int(ctx, channel, user)
         valid_float = cls.valid_float(ctx, channel, user)
-        return cls(lambda self, m: (valid_int(m) or valid_float(m)) and float(m.content) > value)
+        return cls._in_context(
+            valid_int,
+            lambda self, m: (valid_int(m) or valid_float(m)) and float(m.content) > value,
+        )
 
     @classmethod
     def length_less(
@@ -662,7 +699,9 @@ class MessagePredicate(Callable[[discord.Message], bool]):
 
         """
         same_context = cls.same_context(ctx, channel, user)
-        return cls(lambda self, m: same_context(m) and len(m.content) <= length)
+        return cls._in_context(
+            same_context, lambda self, m: same_context(m) and len(m.content) <= length
+        )
 
     @classmethod
     def length_greater(
@@ -692,7 +731,9 @@ class MessagePredicate(Callable[[discord.Message], bool]):
 
         """
         same_context = cls.same_context(ctx, channel, user)
-        return cls(lambda self, m: same_context(m) and len(m.content) >= length)
+        return cls._in_context(
+            same_context, lambda self, m: same_context(m) and len(m.content) >= length
+        )
 
     @classmethod
     def contained_in(
@@ -736,7 +777,7 @@ class MessagePredicate(Callable[[discord.Message], bool]):
             else:
                 return True
 
-        return cls(predicate)
+        return cls._in_context(same_context, predicate)
 
     @classmethod
     def lower_contained_in(
@@ -777,7 +818,7 @@ class MessagePredicate(Callable[[discord.Message], bool]):
             else:
                 return True
 
-        return cls(predicate)
+        return cls._in_context(same_context, predicate)
 
     @classmethod
     def regex(
@@ -827,7 +868,7 @@ class MessagePredicate(Callable[[discord.Message], bool]):
                 return True
             return False
 
-        return cls(predicate)
+        return cls._in_context(same_context, predicate)
 
     @staticmethod
     def _find_role(guild: discord.Guild, argument: str) -> Optional[discord.Role]:
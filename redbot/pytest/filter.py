@@ -0,0 +1,13 @@
+import pytest
+
+from redbot.cogs.filter import Filter
+from redbot.core import Config
+
+__all__ = ["filter_cog"]
+
+
+@pytest.fixture()
+def filter_cog(config, monkeypatch):
+    with monkeypatch.context() as m:
+        m.setattr(Config, "get_conf", lambda *args, **kwargs: config)
+        return Filter(None)
@@ -0,0 +1,107 @@
+import asyncio
+import contextlib
+import time
+
+import pytest
+
+from redbot.cogs.audio.apis import local_db
+from redbot.cogs.audio.apis.local_db import LocalCacheWrapper
+from redbot.core.utils.dbtools import ThreadedAPSWConnection
+
+
+class MockConfig:
+    async def cache_age(self):
+        return 365
+
+
+@pytest.fixture
+async def local_cache(tmp_path):
+    db = ThreadedAPSWConnection(tmp_path / "Audio.db")
+    cache = LocalCacheWrapper(None, MockConfig(), db, None)
+    await cache.lavalink.init()
+    yield cache
+    task = cache._flush_task
+    cache.stop_flushing()
+    if task is not None:
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+    await db.aclose()
+
+
+def _youtube_entry(track_info, track_url, when):
+    return {
+        "track_info": track_info,
+        "track_url": track_url,
+        "last_updated": when,
+        "last_fetched": when,
+    }
+
+
+async def test_local_cache_write_behind(local_cache):
+    now = int(time.time())
+    local_cache.queue_insert("youtube", [_youtube_entry("a", "new", now - 10)])
+    local_cache.queue_insert(
+        "youtube", [_youtube_entry("a", "new", now), _youtube_entry("b", "b", now)]
+    )
+    local_cache.queue_update("youtube", {"track": "b"})
+    local_cache.queue_update("youtube", {"track": "b"})
+    assert await local_cache.youtube.fetch_one({"track": "a"}) == (None, None)
+
+    await local_cache.flush()
+    assert local_cache._pending_count == 0
+    assert (await local_cache.youtube.fetch_one({"track": "a"}))[0] == "new"
+    rows = await local_cache.database.fetchall(
+        "SELECT track_info, last_fetched FROM youtube ORDER BY track_info"
+    )
+    assert [r[0] for r in rows] == ["a", "b"]
+    assert rows[1][1] >= now
+
+
+async def test_local_cache_keeps_queued_urls_of_one_query(local_cache):
+    now = int(time.time())
+    local_cache.queue_insert("youtube", [_youtube_entry("a", "url1", now)])
+    local_cache.queue_insert("youtube", [_youtube_entry("a", "url2", now)])
+    await local_cache.flush()
+    rows = await local_cache.database.fetchall(
+        "SELECT youtube_url FROM youtube WHERE track_info = 'a' ORDER BY youtube_url"
+    )
+    assert [r[0] for r in rows] == ["url1", "url2"]
+
+
+async def test_local_cache_flushes_on_size(local_cache, monkeypatch):
+    monkeypatch.setattr(local_db, "_FLUSH_SIZE", 3)
+    local_cache.start_flushing()
+    now = int(time.time())
+    local_cache.queue_insert("youtube", [_youtube_entry(str(i), "u", now) for i in range(2)])
+    assert not local_cache._flush_needed.is_set()
+    local_cache.queue_update("youtube", {"track": "0"})
+    for _ in range(100):
+        count = await local_cache.database.fetchone("SELECT count(*) FROM youtube")
+        if count == (2,):
+            break
+        await asyncio.sleep(0.01)
+    assert count == (2,)
+
+
+async def test_local_cache_fetch_random(local_cache):
+    now = int(time.time())
+    values = {"day": now - 7 * 86400, "maxage": now - 365 * 86400}
+    assert await local_cache.youtube.fetch_random(values) is None
+
+    stale = now - 30 * 86400
+    await local_cache.youtube.insert(
+        [_youtube_entry("2", "url2", now)]
+        + [
+            {**_youtube_entry(str(i), f"url{i}", now), "last_fetched": stale}
+            for i in range(10)
+            if i != 2
+        ]
+    )
+    # Whatever the random seek point, the only recently fetched track is found,
+    # wrapping around to the start of the table if needed.
+    for fraction in (0.0, 0.5, 0.99):
+        row = await local_cache.database.fetchone(
+            local_cache.youtube.statement.get_random, {**values, "fraction": fraction}
+        )
+        assert row[0] == "url2"
+    assert await local_cache.youtube.fetch_random(values) == "url2"
@@ -1,4 +1,6 @@
 import pytest
+
+from redbot.core import commands
 from redbot.pytest.alias import *
 
 
@@ -73,3 +75,20 @@ async def test_delete_global_alias(alias, ctx):
 
     alias_obj = await alias._aliases.get_alias(None, "test_global")
     assert alias_obj is None
+
+
+async def test_translate_alias_message_with_strip_after_prefix(alias, ctx, red):
+    await create_test_guild_alias(alias, ctx)
+    alias_obj = await alias._aliases.get_alias(ctx.guild, "test")
+    message = type("", (), {})()
+    message.content = "!  test arg other"
+    message._state = None
+
+    red.strip_after_prefix = True
+    alias_ctx = red._context_with_prefix(message, "!", cls=commands.Context)
+    assert alias_ctx.invoked_with == "test"
+
+    translated_message = alias.translate_alias_message(
+        message, alias_ctx.prefix, alias_obj, alias_ctx.view.index
+    )
+    assert translated_message.content == "!ping arg other"
@@ -73,3 +73,108 @@ async def test_nonint_transaction_amount(bank, member_factory):
         await bank.withdraw_credits(mbr1, 1.0)
     with pytest.raises(TypeError):
         await bank.transfer_credits(mbr1, mbr2, 1.0)
+
+
+async def test_bank_deposit_withdraw(bank, member_factory):
+    mbr = member_factory.get()
+    await bank.set_balance(mbr, 100)
+    assert await bank.deposit_credits(mbr, 50) == 150
+    assert await bank.withdraw_credits(mbr, 150) == 0
+    with pytest.raises(ValueError):
+        await bank.withdraw_credits(mbr, 1)
+    assert await bank.get_balance(mbr) == 0
+
+
+async def test_bank_deposit_over_max(bank, member_factory):
+    mbr = member_factory.get()
+    await bank.set_max_balance(1000, mbr.guild)
+    await bank.set_balance(mbr, 900)
+    with pytest.raises(bank.errors.BalanceTooHigh):
+        await bank.deposit_credits(mbr, 200)
+    assert await bank.get_balance(mbr) == 900
+
+
+async def test_bank_failed_withdraw_leaves_no_account(bank, member_factory):
+    guild = member_factory.get().guild
+    mbr1, mbr2 = (member_factory.get()._replace(guild=guild) for _ in range(2))
+    await bank.set_balance(mbr1, 100)
+    with pytest.raises(ValueError):
+        await bank.withdraw_credits(mbr2, 1000)
+    assert mbr2.id not in await bank._config.all_members(guild)
+    assert [user_id for user_id, acc in await bank.get_leaderboard(guild=guild)] == [mbr1.id]
+    assert await bank.get_leaderboard_position(mbr2) is None
+
+
+async def test_bank_deposit_sets_up_new_accounts_only(bank, member_factory, monkeypatch):
+    mbr = member_factory.get()
+    init_calls = []
+    init_account_info = bank._init_account_info
+
+    async def spy(group, member):
+        init_calls.append(member.id)
+        await init_account_info(group, member)
+
+    monkeypatch.setattr(bank, "_init_account_info", spy)
+    default_bal = await bank.get_default_balance(mbr.guild)
+    assert await bank.deposit_credits(mbr, 10) == default_bal + 10
+    assert await bank.deposit_credits(mbr, 5) == default_bal + 15
+    assert init_calls == [mbr.id]
+    account = await bank.get_account(mbr)
+    assert account.name == mbr.display_name
+    assert account.created_at.timestamp() > 0
+
+
+async def test_bank_leaderboard(bank, member_factory):
+    guild = member_factory.get().guild
+    mbr1, mbr2, mbr3 = (
+        member_factory.get()._replace(id=member_id, guild=guild) for member_id in (1, 2, 3)
+    )
+    await bank.set_balance(mbr1, 100)
+    await bank.set_balance(mbr2, 300)
+    await bank.set_balance(mbr3, 100)
+
+    leaderboard = await bank.get_leaderboard(guild=guild)
+    assert [user_id for user_id, acc in leaderboard] == [mbr2.id, mbr1.id, mbr3.id]
+    assert leaderboard[0][1]["balance"] == 300
+    assert await bank.get_leaderboard_position(mbr3) == 3
+
+    await bank.deposit_credits(mbr3, 250)
+    await bank.withdraw_credits(mbr2, 300)
+    top = await bank.get_leaderboard(positions=2, guild=guild)
+    assert [(user_id, acc["balance"]) for user_id, acc in top] == [(mbr3.id, 350), (mbr1.id, 100)]
+    assert await bank.get_leaderboard_position(mbr2) == 3
+    assert await bank.get_leaderboard_position(member_factory.get()._replace(guild=guild)) is None
+
+
+async def test_bank_leaderboard_ties(bank, member_factory):
+    guild = member_factory.get().guild
+    # IDs of different lengths, so text order would differ from numeric order
+    members = [
+        member_factory.get()._replace(id=member_id, guild=guild) for member_id in (25, 100, 9)
+    ]
+    for member in members:
+        await bank.set_balance(member, 50)
+
+    leaderboard = await bank.get_leaderboard(guild=guild)
+    assert [user_id for user_id, acc in leaderboard] == [9, 25, 100]
+    assert [await bank.get_leaderboard_position(member) for member in members] == [2, 3, 1]
+
+
+async def test_balance_index(bank, monkeypatch):
+    import random
+
+    monkeypatch.setattr(bank._BalanceIndex, "_BUCKET_SIZE", 4)
+    balances = {user_id: random.randint(0, 50) for user_id in range(40)}
+    index = bank._BalanceIndex(balances.items())
+    for _ in range(500):
+        user_id = random.randint(0, 60)
+        if random.random() < 0.2:
+            index.discard(user_id)
+            balances.pop(user_id, None)
+        else:
+            index.update(user_id, random.randint(0, 50))
+            balances[user_id] = -index._keys[user_id][0]
+
+    expected = sorted(balances, key=lambda u: (-balances[u], u))
+    assert list(index) == expected
+    assert [index.rank(user_id) for user_id in expected] == list(range(1, len(expected) + 1))
@@ -0,0 +1,121 @@
+import asyncio
+import random
+import re
+
+import pytest
+
+from redbot.cogs.filter import matcher as matcher_module
+from redbot.cogs.filter.matcher import WordMatcher
+from redbot.pytest.filter import *
+
+
+@pytest.fixture(params=["regex", "trie"])
+def use_trie(request, monkeypatch):
+    if request.param == "trie":
+        monkeypatch.setattr(matcher_module, "_REGEX_MAX_WORDS", 0)
+
+
+@pytest.mark.usefixtures("use_trie")
+def test_word_matcher():
+    matcher = WordMatcher(["bad", "bad word", "c++", "Ünï"])
+    assert matcher.find_all("This is BAD.") == {"BAD"}
+    assert matcher.find_all("a bad word here") == {"bad word"}
+    assert matcher.find_all("badword baddie abad") == set()
+    assert matcher.find_all("ünï and ÜNÏ") == {"ünï", "ÜNÏ"}
+    # like \bc\+\+\b, this needs a word character right after the word
+    assert matcher.find_all("c++ is") == set()
+    assert matcher.find_all("c++x") == {"c++"}
+    assert not WordMatcher([])
+    assert WordMatcher([]).find_all("bad") == set()
+
+
+@pytest.mark.usefixtures("use_trie")
+def test_word_matcher_matches_regex():
+    rng = random.Random(0)
+    alphabet = "abAB _-.!"
+    for _ in range(300):
+        words = {
+            "".join(rng.choices(alphabet, k=rng.randint(1, 4))) for _ in range(rng.randint(1, 8))
+        }
+        # Trying the longest alternatives first makes the regex take
+        # the longest word at each position, as the matcher does.
+        pattern = re.compile(
+            "|".join(
+                rf"\b{re.escape(w)}\b" for w in sorted(words, key=lambda w: len(w), reverse=True)
+            ),
+            flags=re.I,
+        )
+        matcher = WordMatcher(words)
+        for _ in range(10):
+            text = "".join(rng.choices(alphabet, k=rng.randint(0, 30)))
+            assert matcher.find_all(text) == set(pattern.findall(text)), (words, text)
+
+
+async def test_filter_hit_counter(filter_cog, member_factory):
+    member = member_factory.get()
+    member_config = filter_cog.config.member(member)
+    await member_config.set({"filter_count": 2, "next_reset_time": 1100})
+
+    # carries on from the saved count while the timeframe lasts
+    assert await filter_cog._count_filter_hit(member, 1000, 60) == 3
+    assert await filter_cog._count_filter_hit(member, 1050, 60) == 4
+    # nothing is written until the counters are saved
+    assert await member_config.filter_count() == 2
+    # then a new timeframe starts with the next filtered message
+    assert await filter_cog._count_filter_hit(member, 1200, 60) == 1
+
+    await filter_cog._save_member_counters()
+    assert await member_config.all() == {"filter_count": 1, "next_reset_time": 1260}
+    # the timeframe is over, so the counter is dropped from memory once saved
+    assert not filter_cog._member_counters
+
+
+async def test_filter_hit_counter_concurrent_first_hits(filter_cog, member_factory, monkeypatch):
+    member = member_factory.get()
+    await filter_cog.config.member(member).set({"filter_count": 2, "next_reset_time": 1100})
+    get_member_group = filter_cog.config.member
+
+    def slow_member_group(member):
+        group = get_member_group(member)
+        load = group.all
+
+        async def slow_load(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return await load(*args, **kwargs)
+
+        group.all = slow_load
+        return group
+
+    monkeypatch.setattr(filter_cog.config, "member", slow_member_group)
+    counts = await asyncio.gather(
+        *(filter_cog._count_filter_hit(member, 1000, 60) for _ in range(3))
+    )
+    assert sorted(counts) == [3, 4, 5]
+
+
+async def test_filter_hit_counter_save_is_retried(filter_cog, member_factory, monkeypatch):
+    member = member_factory.get()
+    await filter_cog._count_filter_hit(member, 1000, 60)
+
+    with monkeypatch.context() as m:
+
+        def fail(*args):
+            raise RuntimeError
+
+        m.setattr(filter_cog.config, "member_from_ids", fail)
+        with pytest.raises(RuntimeError):
+            await filter_cog._save_member_counters()
+
+    await filter_cog._save_member_counters()
+    assert await filter_cog.config.member(member).filter_count() == 1
+
+
+async def test_filter_forgets_removed_guilds(filter_cog, guild_factory):
+    guild, other_guild = guild_factory.get(), guild_factory.get()
+    await filter_cog._get_guild_settings(guild)
+    await filter_cog._get_guild_settings(other_guild)
+    await filter_cog._get_matcher(guild)
+
+    await filter_cog.on_guild_remove(guild)
+    assert filter_cog._guild_settings.keys() == {other_guild.id}
+    assert not filter_cog.pattern_cache
@@ -39,3 +39,66 @@ async def test_modlog_case_create(mod, ctx, monkeypatch, member_factory, empty_u
 async def test_modlog_set_modlog_channel(mod, ctx):
     await mod.set_modlog_channel(ctx.guild, ctx.channel)
     assert await mod.get_modlog_channel(ctx.guild) == ctx.channel.id
+
+
+async def test_modlog_iter_cases(mod, ctx, monkeypatch, member_factory, empty_user):
+    from datetime import datetime, timedelta, timezone
+
+    await test_modlog_register_casetype(mod)
+    await mod.register_casetype(name="kick", default_setting=True, image="", case_str="Kick")
+    mock_connection = namedtuple("Connection", "user get_user")
+    monkeypatch.setattr(ctx.bot, "_connection", mock_connection(empty_user, lambda id: None))
+
+    guild = namedtuple("Guild", "id get_channel_or_thread")(ctx.guild.id, lambda id: None)
+    usr1, usr2 = member_factory.get(), member_factory.get()
+    now = datetime.now(timezone.utc)
+    for days_ago, action_type, usr in (
+        (3, "ban", usr1),
+        (2, "kick", usr2),
+        (1, "kick", usr1),
+        (0, "ban", usr2),
+    ):
+        created_at = now - timedelta(days=days_ago)
+        await mod.create_case(ctx.bot, guild, created_at, action_type, usr, ctx.author)
+
+    async def numbers(**kwargs):
+        return [case.case_number async for case in mod.iter_cases(guild, **kwargs)]
+
+    assert await numbers() == [4, 3, 2, 1]
+    assert await numbers(page_size=3, newest_first=False) == [1, 2, 3, 4]
+    assert await numbers(member_id=usr1.id, newest_first=False) == [1, 3]
+    assert await numbers(action_type="kick") == [3, 2]
+    assert await numbers(after=now - timedelta(days=2, hours=1)) == [4, 3, 2]
+    assert await numbers(action_type="ban", before=now - timedelta(hours=1)) == [1]
+
+    cases = await mod.get_cases_for_member(guild, ctx.bot, member_id=usr2.id)
+    assert [case.case_number for case in cases] == [2, 4]
+    await cases[0].edit({"user": usr1.id})
+    assert await numbers(member_id=usr1.id) == [3, 2, 1]
+    assert len(await mod.get_all_cases(guild, ctx.bot)) == 4
+
+    await mod.reset_cases(guild)
+    assert await numbers() == []
+
+
+def test_repeat_tracker():
+    from redbot.cogs.mod.utils import RepeatTracker
+
+    tracker = RepeatTracker(3, max_authors=2, ttl=60)
+    assert not tracker.add(1, "spam", now=0)
+    assert not tracker.add(1, "spam", now=1)
+    assert not tracker.add(2, "hello", now=2)
+    assert tracker.add(1, "spam", now=3)
+    # stays a repeat for as long as the author keeps going
+    assert tracker.add(1, "spam", now=4)
+    assert not tracker.add(1, "eggs", now=5)
+
+    # the least recently active author is dropped first
+    tracker.add(3, "hi", now=6)
+    assert len(tracker) == 2
+    assert not tracker.add(2, "hello", now=7)
+
+    # and authors are forgotten once they've been quiet for the TTL
+    tracker.add(1, "eggs", now=8)
+    assert not tracker.add(1, "eggs", now=100)
+    assert len(tracker) == 1
@@ -0,0 +1,113 @@
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from redbot.cogs.streams import http_client
+from redbot.cogs.streams.http_client import StreamsHTTPClient
+from redbot.cogs.streams.streamtypes import TwitchRateLimit, get_twitch_streams_data
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.status = 200
+        self.headers = {"Ratelimit-Remaining": "799", "Ratelimit-Reset": "0"}
+        self._data = data
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def json(self, encoding=None):
+        return self._data
+
+
+class FakeSession:
+    def __init__(self, live_user_ids):
+        self.live_user_ids = live_user_ids
+        self.requests = []
+
+    def get(self, url, *, headers, params, timeout):
+        user_ids = [value for key, value in params if key == "user_id"]
+        self.requests.append(user_ids)
+        data = [{"user_id": user_id} for user_id in user_ids if user_id in self.live_user_ids]
+        return FakeResponse({"data": data})
+
+
+async def test_get_twitch_streams_data_batches_requests():
+    user_ids = [str(i) for i in range(250)]
+    session = FakeSession({"5", "150", "249"})
+    rate_limit = TwitchRateLimit()
+
+    responses = await get_twitch_streams_data(
+        session, user_ids + ["5"], client_id="id", bearer=None, rate_limit=rate_limit
+    )
+
+    assert [len(batch) for batch in session.requests] == [100, 100, 50]
+    assert responses.keys() == set(user_ids)
+    assert responses["150"] == (200, {"data": [{"user_id": "150"}]})
+    assert responses["151"] == (200, {"data": []})
+    assert rate_limit.remaining == 799
+
+
+async def test_http_client_revalidates_cached_responses(monkeypatch):
+    requests = []
+
+    async def handler(request):
+        requests.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        return web.Response(text="feed", headers={"ETag": '"v1"'})
+
+    app = web.Application()
+    app.router.add_get("/feed", handler)
+    client = StreamsHTTPClient()
+    async with TestServer(app) as server:
+        url = str(server.make_url("/feed"))
+        try:
+            assert await client.get(url, cache=True) == (200, "feed")
+            # still fresh, so no request is made
+            assert await client.get(url, cache=True) == (200, "feed")
+            assert requests == [None]
+
+            monkeypatch.setattr(http_client, "RESPONSE_CACHE_TTL", 0)
+            assert await client.get(url, cache=True) == (200, "feed")
+            assert requests == [None, '"v1"']
+            # uncached requests are always made in full
+            assert await client.get(url) == (200, "feed")
+            assert requests == [None, '"v1"', None]
+        finally:
+            await client.close()
+
+
+async def test_http_client_revalidates_across_refresh_cycle(monkeypatch):
+    monkeypatch.setattr(http_client, "RESPONSE_CACHE_TTL", 0)
+    statuses = []
+
+    async def handler(request):
+        etag = '"{}"'.format(request.match_info["name"])
+        if request.headers.get("If-None-Match") == etag:
+            statuses.append(304)
+            return web.Response(status=304)
+        statuses.append(200)
+        return web.Response(text=request.match_info["name"], headers={"ETag": etag})
+
+    app = web.Application()
+    app.router.add_get("/feeds/{name}", handler)
+    client = StreamsHTTPClient()
+    # more streams than the cache's minimum size, requested in the same order every refresh
+    num_streams = http_client.RESPONSE_CACHE_SIZE + 50
+    client.fit_cache_to(num_streams)
+    async with TestServer(app) as server:
+        urls = [str(server.make_url(f"/feeds/{i}")) for i in range(num_streams)]
+        try:
+            for url in urls:
+                await client.get(url, cache=True)
+            assert statuses == [200] * num_streams
+
+            statuses.clear()
+            for i, url in enumerate(urls):
+                assert await client.get(url, cache=True) == (200, str(i))
+            assert statuses == [304] * num_streams
+        finally:
+            await client.close()
@@ -76,3 +76,68 @@ def test_trivia_schema_error_messages(data: Any, error_msg: str):
         TRIVIA_LIST_SCHEMA.validate(data)
 
     assert format_schema_error(exc.value) == error_msg
+
+
+def test_trivia_list_store(tmp_path):
+    from redbot.cogs.trivia import get_list
+    from redbot.cogs.trivia.list_store import TriviaListStore
+
+    custom_dir = tmp_path / "custom"
+    core_dir = tmp_path / "core"
+    custom_dir.mkdir()
+    core_dir.mkdir()
+    (core_dir / "shared.yaml").write_text("Core question?:\n- core\n")
+    (core_dir / "core.yaml").write_text("Question?:\n- answer\n")
+    (custom_dir / "shared.yaml").write_text("Custom question?:\n- custom\n")
+    loaded = []
+
+    def loader(path):
+        loaded.append(path.name)
+        return get_list(path)
+
+    def make_store():
+        return TriviaListStore((custom_dir, core_dir), tmp_path / "index.pickle", loader)
+
+    store = make_store()
+    store.load()
+    assert sorted(loaded) == ["core.yaml", "shared.yaml"]
+    assert store.paths().keys() == {"core", "shared"}
+    assert store.get("shared") == {"Custom question?": ["custom"]}
+    with pytest.raises(FileNotFoundError):
+        store.get("missing")
+
+    # a new store is loaded from the compiled index, without parsing anything
+    loaded.clear()
+    store = make_store()
+    store.load()
+    store.get("core")["Question?"] = "modified"
+    assert store.get("core") == {"Question?": ["answer"]}
+    assert loaded == []
+
+    (core_dir / "core.yaml").write_text("Other question?:\n- other answer\n")
+    (custom_dir / "new.yaml").write_text("New question?:\n- new\n")
+    store.invalidate()
+    assert store.get("core") == {"Other question?": ["other answer"]}
+    assert store.get("new") == {"New question?": ["new"]}
+    assert loaded == ["core.yaml", "new.yaml"]
+
+
+@pytest.mark.parametrize(
+    "guess,expected",
+    (
+        ("Paris", True),
+        ("i think it's PARIS !", True),
+        ("parisian", False),
+        ("the big apple", True),
+        ("is it the BIG APPLEs?", True),
+        ("big apple", False),
+        ("it’s a trap", True),
+        ("it's a trap", True),
+        ("nope", False),
+    ),
+)
+def test_answer_matcher(guess: str, expected: bool):
+    from redbot.cogs.trivia.matcher import AnswerMatcher
+
+    matcher = AnswerMatcher(["Paris", "The Big Apple", "it's a trap"])
+    assert matcher.matches(guess) is expected
@@ -1,7 +1,9 @@
 import inspect
 import datetime
+from unittest.mock import MagicMock, patch
 from dateutil.relativedelta import relativedelta
 
+import discord
 import pytest
 from discord.ext import commands as dpy_commands
 
@@ -69,3 +71,19 @@ def test_converter_relativedelta():
     assert converter.parse_relativedelta("1 year 10 days 3 seconds") == relativedelta(
         years=1, days=10, seconds=3
     )
+
+
+async def test_get_context_reuses_prefix_match(red):
+    red._connection.user = MagicMock(id=2)
+    message = MagicMock(spec=discord.Message, id=1, content="!foo bar")
+    red._parsed_messages[message.id] = (message.content, "!")
+    with patch.object(red._prefix_cache, "get_prefixes", side_effect=AssertionError):
+        ctx = await red.get_context(message)
+    assert (ctx.prefix, ctx.invoked_with, ctx.command) == ("!", "foo", None)
+    assert ctx.view.read_rest() == " bar"
+
+    # a message whose content changed since gets parsed again
+    message.content = "??foo"
+    with patch.object(red._prefix_cache, "get_prefixes", return_value=["?", "??"]):
+        ctx = await red.get_context(message)
+    assert (ctx.prefix, ctx.invoked_with) == ("??", "foo")
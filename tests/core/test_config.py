@@ -1,4 +1,5 @@
 import asyncio
+import json
 from unittest.mock import patch
 import pytest
 from collections import Counter
@@ -685,3 +686,312 @@ async def test_config_custom_clear_identifiers_that_do_not_exist(config, pkeys,
         # Clear needed to be able to differ between missing config data and missing scope data
         await scope.clear_raw(*to_set)
     await group.clear_raw(*raw_args)
+
+
+async def test_json_driver_journal_defers_snapshot_writes(tmp_path):
+    from redbot.core._drivers import JsonDriver, IdentifierData
+
+    driver = JsonDriver("PyTestJournal", "0", data_path_override=tmp_path, journal=True)
+    ident = IdentifierData("PyTestJournal", "0", "GLOBAL", (), ("foo",), 0)
+    await driver.set(ident, {})
+    await driver.set(ident.add_identifier("bar"), 1)
+    await driver._journal.flush()
+
+    snapshot = tmp_path / "settings.json"
+    assert json.loads(snapshot.read_text()) == {}
+    assert len((tmp_path / "settings.json.journal").read_text().splitlines()) == 2
+
+    await JsonDriver.teardown()
+    assert json.loads(snapshot.read_text()) == {"0": {"GLOBAL": {"foo": {"bar": 1}}}}
+    assert not (tmp_path / "settings.json.journal").exists()
+
+
+async def test_json_driver_journal_recovery(tmp_path):
+    from redbot.core._drivers import JsonDriver
+
+    snapshot = tmp_path / "settings.json"
+    snapshot.write_text(json.dumps({"0": {"GLOBAL": {"a": 1, "c": {"d": 2}}}}))
+    (tmp_path / "settings.json.journal").write_text(
+        '[["0", "GLOBAL", "b"], 2]\n'
+        '[["0", "GLOBAL", "a"]]\n'
+        '[["0", "GLOBAL", "c", "d"], 3]\n'
+        '[["0", "GLOBAL", "c"], 4]\n'
+        '[["0", "GLOBAL", "e"], 5'
+    )
+
+    driver = JsonDriver("PyTestJournalRecovery", "0", data_path_override=tmp_path)
+    expected = {"0": {"GLOBAL": {"b": 2, "c": 4}}}
+    assert driver.data == expected
+    assert json.loads(snapshot.read_text()) == expected
+    assert not (tmp_path / "settings.json.journal").exists()
+
+
+async def test_json_driver_journal_interrupted_compaction(tmp_path):
+    from redbot.core._drivers import JsonDriver
+
+    snapshot = tmp_path / "settings.json"
+    compacted = tmp_path / "settings.json.compacted"
+    journal = tmp_path / "settings.json.journal"
+
+    # crashed before the journal was deleted: the new snapshot isn't committed yet
+    snapshot.write_text(json.dumps({"0": {"GLOBAL": {"a": 1}}}))
+    journal.write_text('[["0", "GLOBAL", "a"], 2]\n')
+    compacted.write_text(json.dumps({"0": {"GLOBAL": {"a": 3}}}))
+    driver = JsonDriver("PyTestJournalUncommitted", "0", data_path_override=tmp_path)
+    assert driver.data == {"0": {"GLOBAL": {"a": 2}}}
+    assert json.loads(snapshot.read_text()) == driver.data
+    assert not compacted.exists() and not journal.exists()
+
+
+async def test_json_driver_journal_committed_compaction(tmp_path):
+    from redbot.core._drivers import JsonDriver
+
+    snapshot = tmp_path / "settings.json"
+    compacted = tmp_path / "settings.json.compacted"
+
+    # crashed after the journal was deleted: the new snapshot is committed
+    snapshot.write_text(json.dumps({"0": {"GLOBAL": {"a": 1}}}))
+    compacted.write_text(json.dumps({"0": {"GLOBAL": {"a": 3}}}))
+    driver = JsonDriver("PyTestJournalCommitted", "0", data_path_override=tmp_path)
+    assert driver.data == {"0": {"GLOBAL": {"a": 3}}}
+    assert json.loads(snapshot.read_text()) == driver.data
+    assert not compacted.exists()
+
+
+async def test_json_driver_journal_logs_flush_errors(tmp_path, monkeypatch, caplog):
+    from redbot.core._drivers import JsonDriver, IdentifierData
+    from redbot.core._drivers import json as json_driver
+
+    monkeypatch.setattr(json_driver, "JOURNAL_FLUSH_INTERVAL", 0)
+    driver = JsonDriver("PyTestJournalErrors", "0", data_path_override=tmp_path, journal=True)
+    journal = driver._journal
+
+    def fail(payload):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(journal, "_append", fail)
+    await driver.set(IdentifierData("PyTestJournalErrors", "0", "GLOBAL", (), ("a",), 0), 1)
+    await asyncio.sleep(0.01)
+    assert "Failed to write out the journal for PyTestJournalErrors." in caplog.text
+    # the entry is kept for the next flush
+    monkeypatch.undo()
+    await journal.flush()
+    assert (tmp_path / "settings.json.journal").read_text() == '[["0", "GLOBAL", "a"], 1]\n'
+    journal.close(driver.data)
+
+
+async def test_config_read_only_matches_copies(config, empty_guild, empty_member):
+    config.register_guild(foo={"bar": 1, "baz": [1, 2]}, qux=False)
+    config.register_member(balance=0)
+    await config.guild(empty_guild).foo.bar.set(2)
+    await config.member(empty_member).balance.set(5)
+
+    assert (
+        await config.guild(empty_guild).all(read_only=True)
+        == await config.guild(empty_guild).all()
+    )
+    assert await config.all_guilds(read_only=True) == await config.all_guilds()
+    assert await config.all_members(read_only=True) == await config.all_members()
+    assert await config.all_members(empty_guild, read_only=True) == await config.all_members(
+        empty_guild
+    )
+    assert await config.guild(empty_guild).foo.baz(read_only=True) == [1, 2]
+
+
+async def test_config_read_only_is_snapshot(config, empty_guild):
+    config.register_guild(foo={"bar": 1}, baz=[])
+    await config.guild(empty_guild).foo.bar.set(2)
+
+    view = await config.guild(empty_guild).all(read_only=True)
+    all_view = await config.all_guilds(read_only=True)
+    with pytest.raises(TypeError):
+        view["foo"]["bar"] = 3
+
+    await config.guild(empty_guild).baz.set([1])
+    # Dicts shared between the snapshot and the new data must be copied on later writes too.
+    await config.guild(empty_guild).foo.bar.set(3)
+    assert view == {"foo": {"bar": 2}, "baz": []}
+    assert all_view[empty_guild.id]["foo"]["bar"] == 2
+    assert await config.guild(empty_guild).foo.bar() == 3
+
+
+async def test_config_read_only_ctxmgr(config):
+    config.register_global(foo={})
+    with pytest.raises(TypeError):
+        async with config.foo(read_only=True):
+            pass
+    assert not config.foo.get_lock().locked()
+    # the lock is still usable
+    async with config.foo() as foo:
+        foo["bar"] = 1
+    assert await config.foo() == {"bar": 1}
+
+
+async def test_config_ctxmgr_releases_lock_on_immutable_value(config):
+    config.register_global(foo=1)
+    with pytest.raises(TypeError):
+        async with config.foo():
+            pass
+    assert not config.foo.get_lock().locked()
+
+
+async def test_config_iter_scopes(config, member_factory, user_factory):
+    config.register_member(balance=0, name="", items=[])
+    config.register_user(balance=0, name="")
+    members = [member_factory.get() for _ in range(5)]
+    for i, member in enumerate(members):
+        await config.member(member).balance.set(i)
+    user = user_factory.get()
+    await config.user(user).name.set("user")
+
+    all_members = await config.all_members()
+    assert {
+        (guild_id, member_id): data async for guild_id, member_id, data in config.iter_members()
+    } == {
+        (guild_id, member_id): data
+        for guild_id, guild_data in all_members.items()
+        for member_id, data in guild_data.items()
+    }
+    guild = members[0].guild
+    assert {k: v async for k, v in config.iter_members(guild)} == await config.all_members(guild)
+    assert {k: v async for k, v in config.iter_users(read_only=True)} == await config.all_users()
+
+    projected = {k: v async for k, v in config.iter_users(fields=("balance", "missing"))}
+    assert projected == {user.id: {"balance": 0}}
+    projected = [
+        data async for _, _, data in config.iter_members(fields=("items",), read_only=True)
+    ]
+    assert projected == [{"items": []}] * 5
+    with pytest.raises(TypeError):
+        projected[0]["items"] = [1]
+
+    # Copies are independent of stored data and of defaults.
+    async for _, _, data in config.iter_members():
+        data["items"].append(1)
+    assert all(d["items"] == [] for d in (await config.all_members(guild)).values())
+
+
+async def test_config_iter_scopes_is_snapshot(config, member_factory):
+    config.register_member(balance=0)
+    members = [member_factory.get() for _ in range(3)]
+    for member in members:
+        await config.member(member).balance.set(1)
+
+    seen = []
+    async for guild_id, member_id, data in config.iter_members(fields=("balance",)):
+        seen.append(data["balance"])
+        # Writes made while iterating don't affect the entries left to read.
+        for member in members:
+            await config.member(member).balance.set(2)
+            await config.member(member_factory.get()).balance.set(3)
+    assert seen == [1, 1, 1]
+
+
+async def test_base_driver_iter_entries(config, member_factory):
+    # The generic implementation used by drivers which don't stream entries.
+    from redbot.core._drivers import BaseDriver
+
+    config.register_member(balance=0)
+    member = member_factory.get()
+    await config.member(member).balance.set(5)
+    await config.member(member).name.set("x")
+    identifier_data = config._get_base_group(config.MEMBER).identifier_data
+
+    entries = [
+        x async for x in BaseDriver.iter_entries(config._driver, identifier_data, ("balance",))
+    ]
+    assert entries == [((str(member.guild.id), str(member.id)), {"balance": 5})]
+    entries = [
+        x async for x in BaseDriver.iter_entries(config._driver, identifier_data, read_only=True)
+    ]
+    assert entries == [((str(member.guild.id), str(member.id)), {"balance": 5, "name": "x"})]
+
+
+async def test_value_inc(config, empty_guild):
+    config.register_guild(count=5)
+    assert await config.guild(empty_guild).count.inc() == 6
+    assert await config.guild(empty_guild).count.inc(-10) == -4
+    assert await config.guild(empty_guild).count() == -4
+    assert await config.unregistered.inc(2.5) == 2.5
+    assert await config.other.inc(default=10) == 11
+
+
+async def test_value_inc_non_number(config):
+    from redbot.core.errors import StoredTypeError
+
+    config.register_global(foo="bar", enabled=True)
+    with pytest.raises(StoredTypeError):
+        await config.foo.inc()
+    with pytest.raises(StoredTypeError):
+        await config.enabled.inc()
+
+
+async def test_value_toggle(config):
+    from redbot.core.errors import StoredTypeError
+
+    config.register_global(enabled=True, number=0)
+    assert await config.enabled.toggle() is False
+    assert await config.enabled() is False
+    assert await config.enabled.toggle() is True
+    assert await config.unregistered.toggle() is True
+    with pytest.raises(StoredTypeError):
+        await config.number.toggle()
+
+
+async def test_config_batch(config, empty_guild, monkeypatch):
+    config.register_global(foo=0, bar=0)
+    config.register_guild(baz=None)
+    await config.bar.set(5)
+
+    saves = []
+    apply_batch = config._driver.apply_batch
+
+    async def counting_apply_batch(changes):
+        saves.append(len(changes))
+        await apply_batch(changes)
+
+    monkeypatch.setattr(config._driver, "apply_batch", counting_apply_batch)
+
+    async with config.batch():
+        await config.foo.set(1)
+        await config.bar.clear()
+        async with config.batch():
+            await config.guild(empty_guild).baz.set({"a": 1})
+        assert await config.foo() == 0
+        with pytest.raises(RuntimeError):
+            await config.foo.inc()
+
+    assert saves == [3]
+    assert await config.foo() == 1
+    assert await config.bar() == 0
+    assert await config.guild(empty_guild).baz() == {"a": 1}
+
+
+async def test_config_batch_discarded_on_error(config):
+    config.register_global(foo=0)
+
+    with pytest.raises(ZeroDivisionError):
+        async with config.batch():
+            await config.foo.set(1)
+            1 / 0
+
+    assert await config.foo() == 0
+    await config.foo.set(2)
+    assert await config.foo() == 2
+
+
+async def test_config_batch_all_or_nothing(config):
+    from redbot.core.errors import CannotSetSubfield
+
+    config.register_global(foo=0, bar=0)
+    await config.foo.set(1)
+
+    with pytest.raises(CannotSetSubfield):
+        async with config.batch():
+            await config.bar.set(2)
+            await config.set_raw("new", "nested", value=3)
+            await config.set_raw("foo", "nested", value=4)
+
+    assert await config.foo() == 1
+    assert await config.bar() == 0
+    assert await config.get_raw("new", default=None) is None
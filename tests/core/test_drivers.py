@@ -0,0 +1,89 @@
+import json
+from unittest import mock
+
+import pytest
+
+from redbot.core._drivers import IdentifierData
+from redbot.core._drivers.postgres import PostgresDriver
+
+
+@pytest.fixture()
+def postgres_pool(monkeypatch):
+    pool = mock.Mock()
+    pool.fetch = mock.AsyncMock(return_value=[])
+    pool.fetchval = mock.AsyncMock(return_value=None)
+    monkeypatch.setattr(PostgresDriver, "_pool", pool)
+    return pool
+
+
+class _Record(tuple):
+    # Indexed by position, or by "data" for the last column, like asyncpg's records.
+    def __getitem__(self, key):
+        return super().__getitem__(-1 if key == "data" else key)
+
+
+def _members_of(guild_id: str) -> IdentifierData:
+    return IdentifierData("Bank", "384734293238749", "MEMBER", (guild_id,), (), 2)
+
+
+async def test_postgres_fetch_sorted_orders_by_cte_columns(postgres_pool):
+    postgres_pool.fetch.return_value = [
+        {"pkey": "9", "json_data": json.dumps({"balance": 10})},
+        {"pkey": "25", "json_data": json.dumps({"balance": 10})},
+    ]
+    driver = PostgresDriver("Bank", "384734293238749")
+
+    rows = await driver.fetch_sorted(_members_of("1"), "balance", 0, limit=2)
+
+    assert rows == [("9", {"balance": 10}), ("25", {"balance": 10})]
+    query, *args = postgres_pool.fetch.call_args.args
+    # ORDER BY can't use an output column's alias inside an expression,
+    # so the sort keys have to be real columns of the CTE
+    assert query.startswith("WITH t AS (SELECT primary_key_2::text AS pkey, json_data, ")
+    assert query.endswith(
+        ') SELECT pkey, json_data FROM t ORDER BY v DESC, length(pkey), pkey COLLATE "C" LIMIT $4'
+    )
+    assert args == ["balance", 0, "1", 2]
+
+
+async def test_postgres_fetch_rank_orders_by_cte_columns(postgres_pool):
+    postgres_pool.fetchval.return_value = 2
+    driver = PostgresDriver("Bank", "384734293238749")
+
+    assert await driver.fetch_rank(_members_of("1"), "balance", 0, "25") == 2
+
+    query, *args = postgres_pool.fetchval.call_args.args
+    assert query.startswith("WITH t AS (SELECT primary_key_2::text AS pkey, json_data, ")
+    assert '(length(t.pkey), t.pkey COLLATE "C") < (length(m.pkey), m.pkey COLLATE "C")' in query
+    assert query.endswith("FROM t AS m WHERE m.pkey = $4::text")
+    assert args == ["balance", 0, "1", "25"]
+
+
+async def test_postgres_iter_entries_fetches_in_batches(postgres_pool, monkeypatch):
+    from redbot.core._drivers.postgres import postgres
+
+    monkeypatch.setattr(postgres, "ITER_ENTRIES_BATCH_SIZE", 2)
+    postgres_pool.fetch.side_effect = [
+        [_Record(("5", '{"a": 1}')), _Record(("7", "[]"))],
+        [_Record(("8", '{"a": 2}'))],
+    ]
+    driver = PostgresDriver("Bank", "384734293238749")
+
+    entries = [entry async for entry in driver.iter_entries(_members_of("1"), ("a",))]
+
+    # the entry which isn't a dict is skipped
+    assert entries == [(("5",), {"a": 1}), (("8",), {"a": 2})]
+    (first_query, *first_args), (next_query, *next_args) = (
+        call.args for call in postgres_pool.fetch.call_args_list
+    )
+    # each batch is fetched with its own query, so no connection is held between them
+    postgres_pool.acquire.assert_not_called()
+    assert first_query.endswith(
+        "WHERE primary_key_1 = $2::text::bigint ORDER BY primary_key_2 LIMIT 2"
+    )
+    assert first_args == [["a"], "1"]
+    assert next_query.endswith(
+        "WHERE primary_key_1 = $2::text::bigint AND (primary_key_2) > ($3::text::bigint)"
+        " ORDER BY primary_key_2 LIMIT 2"
+    )
+    assert next_args == [["a"], "1", "7"]
@@ -0,0 +1,67 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from redbot.core.utils.predicates import MessagePredicate
+
+
+def _message(channel_id, author_id, content=""):
+    return SimpleNamespace(
+        channel=SimpleNamespace(id=channel_id),
+        author=SimpleNamespace(id=author_id),
+        content=content,
+    )
+
+
+def _ctx(channel_id, author_id):
+    return SimpleNamespace(
+        channel=SimpleNamespace(id=channel_id), author=SimpleNamespace(id=author_id)
+    )
+
+
+async def test_wait_for_message_only_checks_its_channel(red):
+    checked = []
+
+    def check(m):
+        checked.append(m)
+        return m.content == "yes"
+
+    waiter = asyncio.ensure_future(red.wait_for_message(channel=_ctx(1, 0).channel, check=check))
+    red._message_waiters.resolve(_message(2, 10, "yes"))
+    red._message_waiters.resolve(_message(1, 10, "no"))
+    expected = _message(1, 11, "yes")
+    red._message_waiters.resolve(expected)
+    assert await waiter is expected
+    assert [m.channel.id for m in checked] == [1, 1]
+    assert len(red._message_waiters) == 0
+
+
+async def test_wait_for_routes_message_predicates(red):
+    pred = MessagePredicate.yes_or_no(_ctx(1, 10))
+    assert (pred._channel_id, pred._author_id) == (1, 10)
+    waiter = asyncio.ensure_future(red.wait_for("message", check=pred))
+    assert len(red._message_waiters) == 1
+    red._message_waiters.resolve(_message(1, 11, "yes"))
+    red._message_waiters.resolve(_message(1, 10, "n"))
+    await waiter
+    assert pred.result is False
+
+
+async def test_timed_out_waiters_are_removed(red):
+    with pytest.raises(asyncio.TimeoutError):
+        await red.wait_for_message(author=SimpleNamespace(id=10), timeout=0.01)
+    await asyncio.sleep(0)
+    assert len(red._message_waiters) == 0
+
+
+async def test_check_errors_are_raised_to_the_waiter(red):
+    def check(m):
+        raise ValueError
+
+    waiter = asyncio.ensure_future(
+        red.wait_for_message(channel=SimpleNamespace(id=1), check=check)
+    )
+    red._message_waiters.resolve(_message(1, 10))
+    with pytest.raises(ValueError):
+        await waiter
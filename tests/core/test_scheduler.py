@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+from redbot.core.utils._scheduler import Scheduler
+
+
+async def test_scheduler_runs_calls_in_order():
+    scheduler = Scheduler()
+    calls = []
+
+    async def record(name):
+        calls.append(name)
+
+    now = time.time()
+    scheduler.schedule("c", now + 0.15, record, "c")
+    scheduler.schedule("a", now + 0.05, record, "a")
+    scheduler.schedule("past", now - 10, record, "past")
+    scheduler.start()
+    try:
+        # scheduled after the scheduler started sleeping, but due earlier
+        scheduler.schedule("b", now + 0.1, record, "b")
+        await asyncio.sleep(0.3)
+    finally:
+        scheduler.stop()
+    assert calls == ["past", "a", "b", "c"]
+    assert len(scheduler) == 0
+
+
+async def test_scheduler_replace_and_cancel():
+    scheduler = Scheduler()
+    calls = []
+
+    async def record(name):
+        calls.append(name)
+
+    now = time.time()
+    scheduler.schedule("a", now + 0.05, record, "old")
+    scheduler.schedule("a", now + 0.1, record, "new")
+    scheduler.schedule("b", now + 0.05, record, "b")
+    assert scheduler.when("a") == now + 0.1
+    assert scheduler.cancel("b")
+    assert not scheduler.cancel("b")
+    assert "b" not in scheduler
+    scheduler.start()
+    try:
+        await asyncio.sleep(0.2)
+    finally:
+        scheduler.stop()
+    assert calls == ["new"]
+
+
+async def test_scheduler_survives_failing_calls():
+    scheduler = Scheduler()
+    calls = []
+
+    async def fail():
+        raise RuntimeError
+
+    async def reschedule(count):
+        calls.append(count)
+        if count < 3:
+            scheduler.schedule("key", time.time(), reschedule, count + 1)
+
+    scheduler.schedule("fail", time.time(), fail)
+    scheduler.schedule("key", time.time(), reschedule, 1)
+    scheduler.start()
+    try:
+        await asyncio.sleep(0.1)
+    finally:
+        scheduler.stop()
+    assert calls == [1, 2, 3]
@@ -0,0 +1,82 @@
+import asyncio
+from types import SimpleNamespace
+
+from redbot.core._settings_caches import (
+    BoundedCache,
+    CacheStats,
+    ConfigValueCache,
+    PrefixMatcher,
+)
+
+
+def test_bounded_cache_evicts_least_recently_used():
+    cache = BoundedCache(maxsize=2)
+    cache[1] = "a"
+    cache[2] = "b"
+    assert cache.get(1) == "a"
+    cache[3] = "c"
+    assert 2 not in cache
+    assert cache.get(2) is None
+    assert cache.get(1) == "a"
+    assert cache.get(3) == "c"
+    assert cache.stats() == CacheStats(hits=3, misses=1, size=2, maxsize=2)
+
+    cache.discard_where(lambda key: key > 1)
+    assert list(cache) == [1]
+
+
+async def test_config_value_cache(config):
+    config.register_global(enabled=False)
+    config.register_guild(enabled=False, roles=[])
+    config.register_channel(enabled=False)
+    guild = SimpleNamespace(id=1234, channels=[SimpleNamespace(id=5678)], threads=[])
+    cache = ConfigValueCache()
+
+    assert await cache.get(config.guild(guild).enabled) is False
+    assert await cache.get(config.guild(guild).enabled) is False
+    assert cache.cache_stats()["values"][:2] == (1, 1)
+
+    # writes go through the cache...
+    await cache.set(config.guild(guild).enabled, True)
+    assert await cache.get(config.guild(guild).enabled) is True
+    await cache.clear(config.guild(guild).enabled)
+    assert await cache.get(config.guild(guild).enabled) is False
+
+    # ...or invalidate it
+    async with config.guild(guild).roles() as roles:
+        roles.append(1)
+    cache.invalidate(config.guild(guild).roles)
+    assert await cache.get(config.guild(guild).roles) == [1]
+
+    await cache.get(config.channel_from_id(5678).enabled)
+    await cache.get(config.enabled)
+    assert cache.cache_stats()["values"].size == 4
+    cache.evict_guild(guild)
+    assert cache.cache_stats()["values"].size == 1
+
+
+async def test_config_value_cache_ignores_stale_reads(config):
+    config.register_global(enabled=False)
+    cache = ConfigValueCache()
+
+    read = asyncio.create_task(cache.get(config.enabled))
+    await cache.set(config.enabled, True)
+    await read
+    assert await cache.get(config.enabled) is True
+
+
+def test_prefix_matcher():
+    matcher = PrefixMatcher(["<@1> ", "!", "!!", "red "])
+    assert matcher.match("!ping") == "!"
+    assert matcher.match("!!ping") == "!!"
+    assert matcher.match("<@1> ping") == "<@1> "
+    assert matcher.match("<@1>ping") is None
+    assert matcher.match("re") is None
+    assert matcher.match("") is None
+    assert PrefixMatcher([]).match("!ping") is None
+
+
+def test_red_settings_cache_stats(red):
+    stats = red.get_settings_cache_stats()
+    assert {"prefixes", "ignored_channels", "disabled_cogs", "values"} <= stats.keys()
+    assert all(isinstance(cache_stats, CacheStats) for cache_stats in stats.values())
@@ -2,6 +2,7 @@ import asyncio
 import pytest
 import operator
 import random
+import time
 from redbot.core.utils import (
     bounded_gather,
     bounded_gather_iter,
@@ -9,6 +10,7 @@ from redbot.core.utils import (
     common_filters,
 )
 from redbot.core.utils.chat_formatting import pagify
+from redbot.core.utils.dbtools import ThreadedAPSWConnection
 from typing import List
 
 
@@ -258,3 +260,52 @@ def test_pagify_length_hint():
         assert operator.length_hint(it) == remaining
 
     assert operator.length_hint(it) == 0
+
+
+async def test_threaded_apsw_connection(tmp_path):
+    db = ThreadedAPSWConnection(tmp_path / "test.db")
+    try:
+        await db.execute("CREATE TABLE t (k INTEGER PRIMARY KEY, v TEXT)")
+        await db.executemany(
+            "INSERT INTO t (k, v) VALUES (:k, :v)", ({"k": i, "v": str(i)} for i in range(10))
+        )
+        assert await db.fetchone("SELECT v FROM t WHERE k = ?", (3,)) == ("3",)
+        assert await db.fetchone("SELECT v FROM t WHERE k = ?", (42,)) is None
+        rows = await asyncio.gather(*(db.fetchall("SELECT k FROM t ORDER BY k") for _ in range(5)))
+        assert all(r == [(i,) for i in range(10)] for r in rows)
+
+        with pytest.raises(Exception):
+            await db.executemany("INSERT INTO t (k, v) VALUES (?, ?)", [(10, "a"), (1, "b")])
+        assert await db.fetchone("SELECT count(*) FROM t") == (10,)
+    finally:
+        await db.aclose()
+    assert db.closed
+    with pytest.raises(RuntimeError):
+        await db.fetchone("SELECT 1")
+
+
+async def test_threaded_apsw_connection_aclose_does_not_block(tmp_path):
+    db = ThreadedAPSWConnection(tmp_path / "test.db")
+    slow = asyncio.ensure_future(db.run(lambda connection: time.sleep(0.2)))
+    await asyncio.sleep(0)
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    ticker = asyncio.ensure_future(tick())
+    await db.aclose()
+    ticker.cancel()
+    await slow
+    # the loop kept running while the queued statement finished
+    assert ticks > 5
+
+
+async def test_threaded_apsw_connection_open_error(tmp_path):
+    db = ThreadedAPSWConnection(tmp_path / "missing" / "test.db")
+    with pytest.raises(RuntimeError):
+        await db.fetchone("SELECT 1")
+    await db.aclose()
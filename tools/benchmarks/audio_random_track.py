@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Micro-benchmark for picking a random track from Audio's local cache.
+
+Fills a synthetic lavalink table and compares the old random pick (fetch the
+candidate rows, then ``random.choice`` in Python) with the rowid seek used by
+``LAVALINK_QUERY_LAST_FETCHED_RANDOM``, which reads a single row.
+
+Usage::
+
+    python tools/benchmarks/audio_random_track.py [row_count]
+"""
+import json
+import random
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+
+from redbot.cogs.audio.sql_statements import (
+    LAVALINK_CREATE_INDEX,
+    LAVALINK_CREATE_TABLE,
+    LAVALINK_QUERY_LAST_FETCHED_RANDOM,
+)
+from redbot.core.utils.dbtools import APSWConnectionWrapper
+
+# The statement used before the rowid seek, with and without its LIMIT,
+# the latter being what a random pick over the whole cache costs this way.
+OLD_QUERY = """
+SELECT data, last_updated
+FROM lavalink
+WHERE
+    last_fetched > :day
+    AND last_updated > :maxage
+"""
+PICKS = 1000
+
+
+def main(row_count: int) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = APSWConnectionWrapper(Path(tmpdir) / "Audio.db")
+        cursor = db.cursor()
+        cursor.execute(LAVALINK_CREATE_TABLE)
+        cursor.execute(LAVALINK_CREATE_INDEX)
+        now = int(time.time())
+        data = json.dumps({"loadType": "TRACK_LOADED", "tracks": [{"track": "x" * 200}]})
+        with db.transaction() as transaction:
+            transaction.executemany(
+                "INSERT INTO lavalink (query, data, last_updated, last_fetched)"
+                " VALUES (?, ?, ?, ?)",
+                (
+                    (f"ytsearch:track {i}", data, now, now - (i % 14) * 86400)
+                    for i in range(row_count)
+                ),
+            )
+        values = {"day": now - 7 * 86400, "maxage": now - 365 * 86400}
+
+        def old(limit: str):
+            def pick():
+                rows = cursor.execute(OLD_QUERY + limit, values).fetchall()
+                return random.choice(rows) if rows else None
+
+            return pick
+
+        def new():
+            return cursor.execute(
+                LAVALINK_QUERY_LAST_FETCHED_RANDOM, {**values, "fraction": random.random()}
+            ).fetchone()
+
+        for name, func in (
+            ("fetchall + random.choice (LIMIT 100)", old("LIMIT 100")),
+            ("fetchall + random.choice (no LIMIT)", old("")),
+            ("rowid seek", new),
+        ):
+            number = 1 if "no LIMIT" in name else 100
+            times = timeit.repeat(func, number=number, repeat=5)
+            print(f"{name}: {min(times) / number * 1000:.3f} ms per pick")
+
+        # How much of the cache each approach can actually reach.
+        for name, sql in (
+            ("LIMIT 100", OLD_QUERY.replace("data,", "rowid,") + "LIMIT 100"),
+            ("rowid seek", LAVALINK_QUERY_LAST_FETCHED_RANDOM.replace("data,", "rowid,")),
+        ):
+            seen = set()
+            for _ in range(PICKS):
+                if sql.endswith("LIMIT 100"):
+                    seen.add(random.choice(cursor.execute(sql, values).fetchall())[0])
+                else:
+                    seen.add(
+                        cursor.execute(sql, {**values, "fraction": random.random()}).fetchone()[0]
+                    )
+            print(f"{name}: {len(seen)} distinct tracks in {PICKS} picks")
+        db.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500_000)
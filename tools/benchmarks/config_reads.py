@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Micro-benchmark for reading large scopes from Config with the JSON driver.
+
+Compares copying reads (the default) with ``read_only=True`` reads on a
+single guild with 100k members, which is roughly what
+``bank.get_leaderboard()`` does on a large server with a local bank.
+
+Usage::
+
+    python tools/benchmarks/config_reads.py [member_count]
+"""
+import asyncio
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+from redbot.core import Config
+from redbot.core._drivers import JsonDriver
+
+GUILD_ID = 133049272517001216
+
+
+async def main(member_count: int) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        driver = JsonDriver("Benchmark", "0", data_path_override=Path(tmpdir))
+        config = Config(cog_name="Benchmark", unique_identifier="0", driver=driver)
+        config.register_member(name="", balance=0, created_at=0)
+        driver.data["0"] = {
+            "MEMBER": {
+                str(GUILD_ID): {
+                    str(member_id): {"name": f"user{member_id}", "balance": member_id}
+                    for member_id in range(member_count)
+                }
+            }
+        }
+        guild = type("Guild", (), {"id": GUILD_ID})()
+
+        async def copying():
+            accounts = await config.all_members(guild)
+            return max(accounts.items(), key=lambda x: x[1]["balance"])
+
+        async def read_only():
+            accounts = await config.all_members(guild, read_only=True)
+            return max(accounts.items(), key=lambda x: x[1]["balance"])
+
+        assert (await copying())[0] == (await read_only())[0]
+        for name, func in (("copy", copying), ("read_only", read_only)):
+            # Config reads don't actually suspend with the JSON driver, so drive the coroutine
+            # by hand to keep event loop overhead out of the measurement.
+            def run():
+                coro = func()
+                try:
+                    coro.send(None)
+                except StopIteration:
+                    pass
+                else:
+                    raise RuntimeError("Config read unexpectedly suspended")
+
+            times = timeit.repeat(run, number=1, repeat=5)
+            print(f"all_members({member_count} members), {name}: {min(times) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000))
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Memory benchmark for the Mod cog's repeated message tracking.
+
+Simulates a guild in which a large number of distinct authors each send a
+couple of messages, and compares the memory held by the previous tracking
+structure (a ``defaultdict`` of per-author deques holding the full messages,
+which never forgot an author) with ``RepeatTracker``.
+
+Usage::
+
+    python tools/benchmarks/mod_repeat_tracking.py [author_count]
+"""
+import sys
+import time
+import tracemalloc
+from collections import defaultdict, deque
+
+from redbot.cogs.mod.utils import RepeatTracker
+
+REPEATS = 3
+MESSAGES_PER_AUTHOR = 2
+
+
+def messages(author_count: int):
+    for author_id in range(author_count):
+        for i in range(MESSAGES_PER_AUTHOR):
+            # new strings, as every message received is
+            yield author_id, f"message number {i} from the author with the ID {author_id}"
+
+
+def old(author_count: int):
+    cache = defaultdict(lambda: deque(maxlen=REPEATS))
+    for author_id, content in messages(author_count):
+        cache[author_id].append(content)
+        msgs = cache[author_id]
+        _repeated = len(msgs) == msgs.maxlen and len(set(msgs)) == 1
+    return cache
+
+
+def new(author_count: int):
+    tracker = RepeatTracker(REPEATS)
+    for author_id, content in messages(author_count):
+        tracker.add(author_id, content)
+    return tracker
+
+
+def main(author_count: int) -> None:
+    for name, func in (("defaultdict of deques", old), ("RepeatTracker", new)):
+        start = time.perf_counter()
+        func(author_count)
+        elapsed = time.perf_counter() - start
+
+        # measured separately, as tracing allocations slows everything down
+        tracemalloc.start()
+        structure = func(author_count)
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"{name}: {current / 2**20:,.1f} MiB held ({peak / 2**20:,.1f} MiB peak)"
+            f" for {len(structure):,} tracked authors, {elapsed:.2f} s"
+        )
+        del structure
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
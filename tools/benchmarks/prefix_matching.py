@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Micro-benchmark for resolving the prefix of a message.
+
+Compares the prefix matching which discord.py's ``get_context`` does with the
+list of prefixes (a ``startswith`` check against all of them, followed by
+``StringView.skip_string`` on each in order) with the precompiled
+``PrefixMatcher`` used by ``Red.get_context``, for guilds with 1, 10 and 100
+prefixes, along with the bot's mention prefixes.
+
+Usage::
+
+    python tools/benchmarks/prefix_matching.py
+"""
+import random
+import string
+import timeit
+
+import discord
+from discord.ext.commands.view import StringView
+
+from redbot.core._settings_caches import PrefixMatcher
+
+MENTIONS = ["<@123456789012345678> ", "<@!123456789012345678> "]
+NUMBER = 100_000
+
+
+def dpy_match(prefixes, content):
+    view = StringView(content)
+    if content.startswith(tuple(prefixes)):
+        return discord.utils.find(view.skip_string, prefixes)
+    return None
+
+
+def main() -> None:
+    rng = random.Random(0)
+    for count in (1, 10, 100):
+        prefixes = {"!"}
+        while len(prefixes) < count:
+            prefixes.add(
+                "".join(rng.choices(string.ascii_lowercase + "!?.$", k=rng.randint(1, 6)))
+            )
+        # the order PrefixManager and when_mentioned_or produce
+        prefix_list = MENTIONS + sorted(prefixes, reverse=True)
+        matcher = PrefixMatcher(prefix_list)
+        longest = max(prefixes, key=len)
+        for name, content in (
+            ("chat message", "hey, did anyone see the game last night?"),
+            ("'!' command", "!ping"),
+            (f"{longest!r} command", f"{longest}ping"),
+        ):
+            assert dpy_match(prefix_list, content) == matcher.match(content)
+            old = min(
+                timeit.repeat(lambda: dpy_match(prefix_list, content), number=NUMBER, repeat=5)
+            )
+            new = min(timeit.repeat(lambda: matcher.match(content), number=NUMBER, repeat=5))
+            print(
+                f"{count:>3} prefixes, {name}: startswith + find {old / NUMBER * 1e9:,.0f} ns,"
+                f" PrefixMatcher {new / NUMBER * 1e9:,.0f} ns"
+            )
+
+
+if __name__ == "__main__":
+    main()
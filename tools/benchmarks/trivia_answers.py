@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Micro-benchmark for checking trivia guesses against a question's answers.
+
+Compares the loop over the answers which ``TriviaSession.check_answer`` ran
+for each message with the ``AnswerMatcher`` it compiles for each question now,
+using the answers of the bundled trivia lists and guesses of typical lengths.
+
+Usage::
+
+    python tools/benchmarks/trivia_answers.py [answer_count]
+"""
+import random
+import sys
+import timeit
+
+from redbot.cogs.trivia import get_core_lists, get_list
+from redbot.cogs.trivia.matcher import AnswerMatcher
+from redbot.cogs.trivia.session import _parse_answers
+from redbot.core.utils.common_filters import normalize_smartquotes
+
+
+def old_check(answers, content):
+    # ``answers`` are lowercased once per question, like check_answer() did
+    guess = normalize_smartquotes(content.lower())
+    for answer in answers:
+        if " " in answer and answer in guess:
+            return True
+        elif any(word == answer for word in guess.split(" ")):
+            return True
+    return False
+
+
+def main(answer_count: int) -> None:
+    rng = random.Random(0)
+    all_answers = []
+    for path in get_core_lists():
+        for key, answers in get_list(path).items():
+            if key not in ("AUTHOR", "CONFIG", "DESCRIPTION", "$schema"):
+                all_answers.extend(_parse_answers(answers))
+    vocabulary = [word for answer in all_answers for word in answer.split()]
+
+    answers = rng.sample(all_answers, answer_count)
+    matcher = AnswerMatcher(answers)
+    answers = tuple(answer.lower() for answer in answers)
+    for words in (1, 5, 30):
+        guesses = [" ".join(rng.choices(vocabulary, k=words)) for _ in range(100)]
+        guesses.append(f"i think it's {answers[-1]}")
+        for guess in guesses:
+            assert old_check(answers, guess) == matcher.matches(guess)
+
+        number = 20
+        old = min(
+            timeit.repeat(
+                lambda: [old_check(answers, guess) for guess in guesses], number=number, repeat=3
+            )
+        )
+        new = min(
+            timeit.repeat(
+                lambda: [matcher.matches(guess) for guess in guesses], number=number, repeat=3
+            )
+        )
+        per_guess = number * len(guesses)
+        print(
+            f"{words:>2} word guesses, {answer_count} answers: old predicate"
+            f" {old / per_guess * 1e6:,.2f} us, AnswerMatcher {new / per_guess * 1e6:,.2f} us"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 4)